@@ -0,0 +1,130 @@
+"""
+Shared Playwright browser for the browser-based sources (LinkedIn, Indeed).
+One Chromium stays up for the life of the app; scrapers lease a page from a
+bounded set of reusable browser contexts instead of launching their own browser.
+Contexts are recycled after BROWSER_CONTEXT_MAX_PAGES pages or after a scrape
+fails, and the browser is relaunched if it disconnects.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Optional
+
+from backend.core.config import settings
+
+
+class _PooledContext:
+    def __init__(self, browser: Any, context: Any):
+        self.browser = browser
+        self.context = context
+        self.pages_served = 0
+
+
+class BrowserPool:
+    def __init__(self, size: int, max_pages_per_context: int):
+        self.size = max(1, size)
+        self.max_pages_per_context = max_pages_per_context
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._idle: List[_PooledContext] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+        self.launches = 0
+        self.recycled = 0
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """Lease a fresh page in a warm browser context; waits while all contexts are in use"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size)
+        async with self._semaphore:
+            pooled = await self._acquire_context()
+            page = None
+            healthy = False
+            try:
+                page = await pooled.context.new_page()
+                yield page
+                healthy = True
+            finally:
+                if page is not None:
+                    try:
+                        await page.close()
+                    except Exception:
+                        healthy = False
+                pooled.pages_served += 1
+                if (
+                    healthy
+                    and pooled.pages_served < self.max_pages_per_context
+                    and pooled.browser is self._browser
+                    and self._browser.is_connected()
+                ):
+                    self._idle.append(pooled)
+                else:
+                    await self._discard(pooled)
+
+    async def start(self):
+        """Launch the browser ahead of the first scrape"""
+        await self._ensure_browser()
+
+    async def close(self):
+        """Close every context, the browser and Playwright (called at shutdown)"""
+        idle, self._idle = self._idle, []
+        for pooled in idle:
+            await self._discard(pooled)
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                print(f"Error closing browser: {e}")
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def get_stats(self):
+        return {
+            "size": self.size,
+            "idle_contexts": len(self._idle),
+            "browser_connected": bool(self._browser and self._browser.is_connected()),
+            "launches": self.launches,
+            "recycled_contexts": self.recycled,
+        }
+
+    async def _acquire_context(self) -> _PooledContext:
+        browser = await self._ensure_browser()
+        while self._idle:
+            pooled = self._idle.pop()
+            if pooled.browser is browser:
+                return pooled
+            await self._discard(pooled)
+        context = await browser.new_context(
+            user_agent=settings.BROWSER_USER_AGENT or None,
+            viewport={"width": 1280, "height": 800},
+        )
+        return _PooledContext(browser, context)
+
+    async def _ensure_browser(self) -> Any:
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._browser is not None:
+                    print("Browser disconnected, relaunching.")
+                self._browser = await self._launch_browser()
+                self.launches += 1
+            return self._browser
+
+    async def _launch_browser(self) -> Any:
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch(headless=True)
+
+    async def _discard(self, pooled: _PooledContext):
+        self.recycled += 1
+        try:
+            await pooled.context.close()
+        except Exception:
+            pass
+
+
+browser_pool = BrowserPool(settings.BROWSER_POOL_SIZE, settings.BROWSER_CONTEXT_MAX_PAGES)
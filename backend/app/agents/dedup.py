@@ -0,0 +1,118 @@
+"""
+Early deduplication against the user's stored jobs.
+At scan start the user's fingerprints are loaded into a Bloom filter; right after
+normalization every job is checked against it, positives are confirmed with one exact
+Mongo query per batch, and known jobs are dropped before they cost any matcher or
+outreach LLM calls. The reviewer still deduplicates on insert (concurrent scans).
+"""
+import asyncio
+import hashlib
+import math
+from typing import Dict, List, Optional, Set
+
+from backend.app.agents.graph import AgentState
+from backend.app.db.models import Job
+from backend.app.db.mongo import db
+from backend.app.db.repositories.job_repository import JobRepository
+from backend.core.config import settings
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one blake2b digest)"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class KnownJobFilter:
+    """
+    Drops jobs one user already has. Without Mongo (or with SCAN_EARLY_DEDUP_ENABLED
+    off) every job passes; if loading the fingerprints fails, each batch is checked
+    exactly instead.
+    """
+
+    def __init__(self, user_id: str, repo: Optional[JobRepository] = None):
+        self.user_id = user_id
+        self.repo = repo
+        self.stats: Dict[str, int] = {"known": 0, "false_positives": 0, "within_run": 0}
+        self._bloom: Optional[BloomFilter] = None
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self._passed: Set[str] = set()
+
+    @classmethod
+    def for_user(cls, user_id: str) -> "KnownJobFilter":
+        if not settings.SCAN_EARLY_DEDUP_ENABLED or not user_id or db.client is None:
+            return cls(user_id)
+        return cls(user_id, JobRepository(db.get_db()))
+
+    async def load(self):
+        """Load the user's fingerprints once; later calls wait for the first to finish"""
+        async with self._lock:
+            if self._loaded or self.repo is None:
+                return
+            self._loaded = True
+            try:
+                count = await self.repo.count_jobs({"user_id": self.user_id})
+                bloom = BloomFilter(count, settings.SCAN_DEDUP_BLOOM_ERROR_RATE)
+                async for fingerprint in self.repo.iter_fingerprints(self.user_id):
+                    bloom.add(fingerprint)
+                self._bloom = bloom
+            except Exception as e:
+                print(f"Could not load stored fingerprints, checking each batch exactly: {e}")
+
+    async def drop_known(self, jobs: List[Job]) -> List[Job]:
+        """Jobs that are neither stored for the user nor already passed earlier in this scan"""
+        fresh: List[Job] = []
+        for job in jobs:
+            fingerprint = job.metadata.fingerprint
+            if fingerprint in self._passed:
+                self.stats["within_run"] += 1
+                continue
+            self._passed.add(fingerprint)
+            fresh.append(job)
+        if self.repo is None or not fresh:
+            return fresh
+
+        await self.load()
+        if self._bloom is None:
+            candidates = [job.metadata.fingerprint for job in fresh]
+        else:
+            candidates = [job.metadata.fingerprint for job in fresh if job.metadata.fingerprint in self._bloom]
+        if not candidates:
+            return fresh
+
+        try:
+            known = await self.repo.find_existing_fingerprints(candidates, self.user_id)
+        except Exception as e:
+            print(f"Early dedup lookup failed, leaving it to the reviewer: {e}")
+            return fresh
+        self.stats["known"] += len(known)
+        if self._bloom is not None:
+            self.stats["false_positives"] += len(candidates) - len(known)
+        return [job for job in fresh if job.metadata.fingerprint not in known]
+
+
+async def dedup_node(state: AgentState):
+    """Drop normalized jobs the user already has (sequential node path)"""
+    normalized_jobs = state.get("normalized_jobs", [])
+    known_jobs = KnownJobFilter.for_user(state.get("user_id", ""))
+    new_jobs = await known_jobs.drop_known(normalized_jobs)
+    print(f"Early dedup dropped {len(normalized_jobs) - len(new_jobs)} known jobs.")
+    return {"normalized_jobs": new_jobs}
@@ -0,0 +1,114 @@
+"""
+App-scoped aiohttp session shared by the HTTP-based job sources.
+Keeps connections alive across scans instead of opening a new session per call,
+caches DNS lookups, caps connections per host and asks for compressed responses.
+HTML listing pages are fetched with conditional GETs: unchanged pages come back
+as 304 and their previously parsed result is reused.
+"""
+import asyncio
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import aiohttp
+
+from backend.core.config import settings
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared session, creating it on first use (or after close)"""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_MAX_CONNECTIONS,
+            limit_per_host=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_SECONDS,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=settings.HTTP_TIMEOUT_SECONDS),
+            headers={"Accept-Encoding": "gzip, deflate"},
+        )
+        _session_loop = loop
+    return _session
+
+
+async def close_http_session():
+    """Close the shared session (called at app shutdown)"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+class ConditionalGetStore:
+    """
+    ETag / Last-Modified validators and the parsed result for each URL (LRU bounded).
+    Only responses that carry a validator are stored.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.not_modified = 0
+        self.fetched = 0
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        entry = self._entries.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get_parsed(self, url: str) -> Any:
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        self._entries.move_to_end(url)
+        return entry["parsed"]
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str], parsed: Any):
+        if not etag and not last_modified:
+            self._entries.pop(url, None)
+            return
+        self._entries[url] = {"etag": etag, "last_modified": last_modified, "parsed": parsed}
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+conditional_store = ConditionalGetStore(settings.HTTP_CONDITIONAL_CACHE_MAX_URLS)
+
+
+async def fetch_parsed(url: str, parse: Callable[[str], Any]) -> Any:
+    """
+    GET url and return parse(body). When the server answers 304 Not Modified the
+    parsed result from the previous fetch is returned without downloading or parsing.
+    Raises RuntimeError for any other non-200 status.
+    """
+    session = await get_http_session()
+    async with session.get(url, headers=conditional_store.request_headers(url)) as response:
+        if response.status == 304:
+            parsed = conditional_store.get_parsed(url)
+            if parsed is not None:
+                conditional_store.not_modified += 1
+                return parsed
+            raise RuntimeError(f"Unexpected 304 for {url}")
+        if response.status != 200:
+            raise RuntimeError(f"status {response.status}")
+        body = await response.text()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+    conditional_store.fetched += 1
+    # HTML parsing is CPU bound; keep it off the event loop
+    parsed = await asyncio.to_thread(parse, body)
+    conditional_store.store(url, etag, last_modified, parsed)
+    return parsed
@@ -0,0 +1,159 @@
+"""
+Two-tier response cache for LLM calls.
+An in-memory LRU sits in front of a Mongo-backed persistent tier, and concurrent
+identical requests are coalesced so only one of them reaches the provider.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from backend.app.db.mongo import db
+from backend.app.db.repositories.llm_cache_repository import LLMCacheRepository
+
+
+def make_cache_key(model: str, system_message: str, prompt: str, response_format: Optional[Dict[str, Any]] = None) -> str:
+    """Hash the parameters that determine an LLM response."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "system": system_message,
+            "prompt": prompt,
+            "response_format": response_format,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: int = 7 * 24 * 3600,
+        persist: bool = True,
+        persistent_max_entries: int = 50000,
+        prune_every: int = 100,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist = persist
+        self.persistent_max_entries = persistent_max_entries
+        self.prune_every = prune_every
+
+        self._memory: OrderedDict = OrderedDict()  # key -> (expires_at, response)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._writes_since_prune = 0
+        self._stats = {
+            "hits": 0,
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current memory tier size."""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "memory_size": len(self._memory),
+            "inflight": len(self._inflight),
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Drop the in-memory tier (the persistent tier is left untouched)."""
+        self._memory.clear()
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[str]]) -> str:
+        """
+        Return the cached response for key, or run compute() once and cache its result.
+        Callers arriving while the same key is being computed await the same result.
+        """
+        value = self._memory_get(key)
+        if value is not None:
+            self._stats["hits"] += 1
+            self._stats["memory_hits"] += 1
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._persistent_get(key)
+            if value is not None:
+                self._stats["hits"] += 1
+                self._stats["persistent_hits"] += 1
+                self._memory_set(key, value)
+            else:
+                self._stats["misses"] += 1
+                value = await compute()
+                if value:
+                    self._memory_set(key, value)
+                    await self._persistent_set(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark as retrieved so an un-awaited future does not log a warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_set(self, key: str, value: str):
+        self._memory[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _get_repository(self) -> Optional[LLMCacheRepository]:
+        if not self.persist or db.client is None:
+            return None
+        return LLMCacheRepository(db.get_db())
+
+    async def _persistent_get(self, key: str) -> Optional[str]:
+        repo = self._get_repository()
+        if repo is None:
+            return None
+        try:
+            return await repo.get_response(key)
+        except Exception as e:
+            print(f"LLM cache read failed: {e}")
+            return None
+
+    async def _persistent_set(self, key: str, value: str):
+        repo = self._get_repository()
+        if repo is None:
+            return
+        try:
+            await repo.set_response(key, value, self.ttl_seconds)
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= self.prune_every:
+                self._writes_since_prune = 0
+                await repo.prune(self.persistent_max_entries)
+        except Exception as e:
+            print(f"LLM cache write failed: {e}")
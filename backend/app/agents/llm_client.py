@@ -1,17 +1,34 @@
 import os
 import asyncio
+from typing import Any, Dict, List, Optional
 from groq import AsyncGroq
 from backend.core.config import settings
+from backend.app.agents.llm_cache import LLMResponseCache, make_cache_key
+from backend.app.agents.rate_limiter import rate_governor, estimate_tokens, parse_reset_duration
 
 class LLMClient:
     def __init__(self):
-        self.client = AsyncGroq(api_key=settings.GROQ_API_KEY)
+        # Rate limiting is handled by the shared governor, not the SDK retry loop
+        self.client = AsyncGroq(api_key=settings.GROQ_API_KEY, max_retries=0)
         self.model = "llama-3.3-70b-versatile"  # Default model
+        self.cache = LLMResponseCache(
+            max_entries=settings.LLM_CACHE_MEMORY_MAX_ENTRIES,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+            persist=settings.LLM_CACHE_PERSIST,
+            persistent_max_entries=settings.LLM_CACHE_PERSISTENT_MAX_ENTRIES,
+        )
+
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+        return parse_reset_duration(headers.get("retry-after"))
 
     async def _retry_on_rate_limit(self, func, *args, **kwargs):
         max_retries = 5
         base_delay = 2
-        
+
         for attempt in range(max_retries):
             try:
                 return await func(*args, **kwargs)
@@ -21,52 +38,79 @@ class LLMClient:
                     if attempt == max_retries - 1:
                         print(f"Max retries reached for rate limit: {e}")
                         raise e
-                    
-                    delay = base_delay * (2 ** attempt)
+
+                    delay = self._retry_after(e) or base_delay * (2 ** attempt)
                     print(f"Rate limit hit. Retrying in {delay}s...")
-                    await asyncio.sleep(delay)
+                    # Hold back every queued caller, not just this one
+                    rate_governor.penalize(delay)
                 else:
                     raise e
 
-    async def generate(self, prompt: str, system_message: str = "You are a helpful assistant.") -> str:
+    async def _send(self, kwargs: Dict[str, Any], estimated_tokens: int):
+        await rate_governor.acquire(estimated_tokens)
+        raw_response = await self.client.chat.completions.with_raw_response.create(**kwargs)
+        rate_governor.update_from_headers(raw_response.headers)
+        chat_completion = raw_response.parse()
+        usage = getattr(chat_completion, "usage", None)
+        rate_governor.record_usage(estimated_tokens, getattr(usage, "total_tokens", None))
+        return chat_completion
+
+    async def _create_completion(self, messages: List[Dict[str, str]], response_format: Optional[Dict[str, Any]] = None) -> str:
+        kwargs: Dict[str, Any] = {"messages": messages, "model": self.model}
+        if response_format:
+            kwargs["response_format"] = response_format
+        estimated_tokens = sum(estimate_tokens(m["content"]) for m in messages) + settings.LLM_OUTPUT_TOKENS_ESTIMATE
+        chat_completion = await self._retry_on_rate_limit(self._send, kwargs, estimated_tokens)
+        return chat_completion.choices[0].message.content
+
+    async def _complete(
+        self,
+        prompt: str,
+        system_message: str,
+        response_format: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True,
+    ) -> str:
+        messages = [
+            {
+                "role": "system",
+                "content": system_message,
+            },
+            {
+                "role": "user",
+                "content": prompt,
+            },
+        ]
+        if not (use_cache and settings.LLM_CACHE_ENABLED):
+            return await self._create_completion(messages, response_format)
+
+        key = make_cache_key(self.model, system_message, prompt, response_format)
+        return await self.cache.get_or_compute(
+            key, lambda: self._create_completion(messages, response_format)
+        )
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the response cache"""
+        return self.cache.get_stats()
+
+    def rate_limit_stats(self) -> Dict[str, Any]:
+        """Queueing counters and remaining budget of the shared rate governor"""
+        return rate_governor.get_stats()
+
+    async def generate(self, prompt: str, system_message: str = "You are a helpful assistant.", use_cache: bool = True) -> str:
         try:
-            chat_completion = await self._retry_on_rate_limit(
-                self.client.chat.completions.create,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_message,
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    },
-                ],
-                model=self.model,
-            )
-            return chat_completion.choices[0].message.content
+            return await self._complete(prompt, system_message, use_cache=use_cache)
         except Exception as e:
             print(f"Error calling Groq: {e}")
             return ""
 
-    async def generate_json(self, prompt: str, system_message: str = "You are a helpful assistant.") -> str:
+    async def generate_json(self, prompt: str, system_message: str = "You are a helpful assistant.", use_cache: bool = True) -> str:
         try:
-            chat_completion = await self._retry_on_rate_limit(
-                self.client.chat.completions.create,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_message + "\nReturn ONLY valid JSON.",
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    },
-                ],
-                model=self.model,
+            return await self._complete(
+                prompt,
+                system_message + "\nReturn ONLY valid JSON.",
                 response_format={"type": "json_object"},
+                use_cache=use_cache,
             )
-            return chat_completion.choices[0].message.content
         except Exception as e:
             print(f"Error calling Groq (JSON): {e}")
             return "{}"
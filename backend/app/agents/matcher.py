@@ -1,67 +1,158 @@
 import json
-import os
 import asyncio
+from typing import Any, Dict, List, Optional
 from backend.app.agents.graph import AgentState
 from backend.app.agents.llm_client import llm_client
+from backend.app.agents.prompt_registry import render_matcher, render_matcher_batch
+from backend.app.agents.prefilter import prefilter_jobs
 from backend.app.db.models import Job, JobStatus
 from backend.app.utils.timeline import log_step
+from backend.core.config import settings
 
-async def match_job(job: Job, user_profile: dict, system_prompt_template: str) -> Job:
+JOB_MATCH_FIELDS = {"title", "company", "description", "remote", "location", "skills_extracted", "tags"}
+
+def _profile_with_keywords(user_profile: dict) -> dict:
     # Include keywords in user profile for matching
     profile_with_keywords = user_profile.copy()
     if "keywords" not in profile_with_keywords or not profile_with_keywords.get("keywords"):
         # If no keywords in profile, use skills as keywords
         profile_with_keywords["keywords"] = user_profile.get("skills", [])
-    
-    system_prompt = system_prompt_template.format(
-        user_profile=json.dumps(profile_with_keywords, indent=2),
-        job_details=job.model_dump_json(include={"title", "company", "description", "remote", "location", "skills_extracted", "tags"})
+    return profile_with_keywords
+
+def _parse_match(data: Any) -> Optional[Dict[str, Any]]:
+    """Validate one match result, returning None if it is malformed."""
+    if not isinstance(data, dict):
+        return None
+    try:
+        score = float(data.get("match_score"))
+    except (TypeError, ValueError):
+        return None
+    if not 0.0 <= score <= 1.0:
+        return None
+    missing_skills = data.get("missing_skills") or []
+    if not isinstance(missing_skills, list):
+        return None
+    return {
+        "match_score": score,
+        "match_reasoning": data.get("match_reasoning") or "",
+        "missing_skills": missing_skills,
+    }
+
+def _apply_match(job: Job, match: Dict[str, Any]) -> Job:
+    job.match_score = match["match_score"]
+    job.match_reasoning = match["match_reasoning"]
+    job.missing_skills = match["missing_skills"]
+
+    if job.match_score >= 0.7: # Default threshold if not set in run_meta
+        job.status = JobStatus.MATCHED
+    else:
+        job.status = JobStatus.NEW  # Changed from REJECTED to NEW
+
+    print(f"Job: {job.title}, Score: {job.match_score:.2f}, Missing: {len(job.missing_skills)} skills")
+    return job
+
+async def match_job(job: Job, user_profile: dict) -> Job:
+    system_prompt = render_matcher(
+        user_profile=json.dumps(_profile_with_keywords(user_profile), indent=2),
+        job_details=job.model_dump_json(include=JOB_MATCH_FIELDS)
     )
-    
+
     response = await llm_client.generate_json(
         prompt="Evaluate this job match.",
         system_message=system_prompt
     )
-    
+
     try:
-        data = json.loads(response)
-        job.match_score = data.get("match_score", 0.0)
-        job.match_reasoning = data.get("match_reasoning", "")
-        job.missing_skills = data.get("missing_skills", [])
-        
-        if job.match_score >= 0.7: # Default threshold if not set in run_meta
-            job.status = JobStatus.MATCHED
-        else:
-            job.status = JobStatus.NEW  # Changed from REJECTED to NEW
-            
-        print(f"Job: {job.title}, Score: {job.match_score:.2f}, Missing: {len(job.missing_skills)} skills")
-        return job
+        match = _parse_match(json.loads(response))
+        if match is None:
+            raise ValueError("malformed match result")
+        return _apply_match(job, match)
     except Exception as e:
         print(f"Error matching job {job.id}: {e}")
         return job
 
+async def match_job_batch(jobs: List[Job], user_profile: dict) -> List[Job]:
+    """
+    Score several jobs in one LLM request.
+    Items missing from or malformed in the response are retried one job at a time.
+    """
+    batch_ids = {f"j{idx}": job for idx, job in enumerate(jobs)}
+    jobs_payload = [
+        {"job_id": batch_id, **job.model_dump(mode="json", include=JOB_MATCH_FIELDS)}
+        for batch_id, job in batch_ids.items()
+    ]
+    system_prompt = render_matcher_batch(
+        user_profile=json.dumps(_profile_with_keywords(user_profile), indent=2),
+        jobs=json.dumps(jobs_payload)
+    )
+
+    response = await llm_client.generate_json(
+        prompt=f"Evaluate these {len(jobs)} job matches.",
+        system_message=system_prompt
+    )
+
+    matched = set()
+    try:
+        items = json.loads(response).get("matches", [])
+    except Exception as e:
+        print(f"Error parsing batch match response: {e}")
+        items = []
+
+    for item in items if isinstance(items, list) else []:
+        batch_id = item.get("job_id") if isinstance(item, dict) else None
+        match = _parse_match(item)
+        if batch_id in batch_ids and batch_id not in matched and match is not None:
+            _apply_match(batch_ids[batch_id], match)
+            matched.add(batch_id)
+
+    retry = [job for batch_id, job in batch_ids.items() if batch_id not in matched]
+    if retry:
+        print(f"Retrying {len(retry)} of {len(jobs)} jobs from batch individually.")
+        await asyncio.gather(*[match_job(job, user_profile) for job in retry])
+
+    return jobs
+
+async def match_jobs(jobs: List[Job], user_profile: dict) -> List[Job]:
+    """Score jobs with the LLM, MATCHER_BATCH_SIZE jobs per request."""
+    batch_size = max(1, settings.MATCHER_BATCH_SIZE)
+    if batch_size > 1:
+        tasks = [
+            match_job_batch(jobs[i:i+batch_size], user_profile)
+            for i in range(0, len(jobs), batch_size)
+        ]
+        return [job for batch in await asyncio.gather(*tasks) for job in batch]
+
+    tasks = [match_job(job, user_profile) for job in jobs]
+    return await asyncio.gather(*tasks)
+
+def filter_matches(scored_jobs: List[Job], threshold: float) -> List[Job]:
+    return [job for job in scored_jobs if job.match_score is not None and job.match_score >= threshold]
+
 async def matcher_node(state: AgentState):
     print("--- Matching Agent ---")
     user_id = state.get("user_id", "unknown")
     run_id = state.get("run_id")
     normalized_jobs = state.get("normalized_jobs", [])
-    
+
     await log_step(user_id, f"Matcher: Scoring {len(normalized_jobs)} jobs...", run_id=run_id)
     user_profile = state.get("user_profile", {})
     run_meta = state.get("run_meta", {})
     threshold = run_meta.get("match_threshold", 0.7)
-    
-    # Load prompt
-    prompt_path = os.path.join(os.path.dirname(__file__), "prompts", "matcher.txt")
-    with open(prompt_path, "r") as f:
-        system_prompt_template = f.read()
-        
-    tasks = [match_job(job, user_profile, system_prompt_template) for job in normalized_jobs]
-    scored_jobs = await asyncio.gather(*tasks)
-    
+
+    if settings.PREFILTER_ENABLED and normalized_jobs:
+        candidates, dropped = prefilter_jobs(
+            normalized_jobs, user_profile, settings.PREFILTER_MIN_SCORE, settings.PREFILTER_TOP_K
+        )
+        print(f"Pre-filter kept {len(candidates)} of {len(normalized_jobs)} jobs for LLM scoring.")
+        await log_step(user_id, f"Matcher: Pre-filter kept {len(candidates)} of {len(normalized_jobs)} jobs", run_id=run_id)
+    else:
+        candidates = normalized_jobs
+
+    scored_jobs = await match_jobs(candidates, user_profile)
+
     # Filter matched jobs
-    matched_jobs = [job for job in scored_jobs if job.match_score >= threshold]
-    
+    matched_jobs = filter_matches(scored_jobs, threshold)
+
     print(f"Matched {len(matched_jobs)} out of {len(normalized_jobs)} jobs.")
-    
+
     return {"matched_jobs": matched_jobs}
@@ -41,7 +41,7 @@ def normalize_title(title: str) -> str:
 # ---------------------------------------------------------------------------
 # Salary Parsing
 # ---------------------------------------------------------------------------
-SALARY_REGEX = re.compile(r"(?P<currency>[$€£])?\s*(?P<min>\d+[kK]?)\s*(?:[-–to]+\s*(?P<max>\d+[kK]?))?\s*(?P<interval>per\s+\w+)?", re.IGNORECASE)
+SALARY_REGEX = re.compile(r"(?P<currency>[$€£])?\s*(?P<min>\d+[kK]?)\s*(?:[-–to]+\s*[$€£]?\s*(?P<max>\d+[kK]?))?\s*(?P<interval>(?:per|an?)\s+\w+)?", re.IGNORECASE)
 
 def parse_salary(salary_str: str) -> Dict[str, Any]:
     """Parse a salary string into a structured dict.
@@ -169,6 +169,17 @@ def generate_fingerprint(title: str, company: str, source_id: str, location: str
     raw = f"{title}|{company}|{source_id}|{location}".encode('utf-8')
     return hashlib.sha256(raw).hexdigest()
 
+# Raw fields that identify a posting as the scrapers return it (no query-dependent text)
+RAW_IDENTITY_FIELDS = ("id", "listing_url", "url", "apply_url", "title", "company", "location")
+
+def generate_raw_key(raw_job: Dict[str, Any], source: str) -> str:
+    """Hash a scraped record before normalization.
+    The same posting scraped for different users gets the same key, so its entry
+    in the job corpus can be found without normalizing it again.
+    """
+    parts = [source] + [str(raw_job.get(field) or "") for field in RAW_IDENTITY_FIELDS]
+    return hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()
+
 def is_valid_job(job: Dict[str, Any]) -> Tuple[bool, str]:
     """Validate required fields according to the unified schema.
     Returns (is_valid, reason).
@@ -180,6 +191,139 @@ def is_valid_job(job: Dict[str, Any]) -> Tuple[bool, str]:
         return False, 'missing_title'
     return True, ''
 
+# ---------------------------------------------------------------------------
+# Structured Source Mapping (LLM-free fast path)
+# ---------------------------------------------------------------------------
+# Normalized field -> raw field, for sources whose scrapers already return clean records
+SOURCE_FIELD_MAPS = {
+    "google_jobs": {
+        "source_id": "id",
+        "title": "title",
+        "company": "company",
+        "company_logo": "company_logo",
+        "location": "location",
+        "description": "description",
+        "listing_url": "listing_url",
+        "apply_url": "apply_url",
+        "salary": "salary",
+        "posted_at": "posted_at",
+        "employment_type": "employment_type",
+    },
+    "linkedin": {
+        "source_id": "id",
+        "title": "title",
+        "company": "company",
+        "company_logo": "company_logo",
+        "location": "location",
+        "description": "description",
+        "listing_url": "listing_url",
+        "apply_url": "apply_url",
+    },
+    "indeed": {
+        "source_id": "id",
+        "title": "title",
+        "company": "company",
+        "location": "location",
+        "description": "description",
+        "listing_url": "listing_url",
+        "apply_url": "apply_url",
+        "salary": "salary",
+    },
+}
+
+# Placeholder values scrapers emit when an element is missing
+PLACEHOLDER_VALUES = {"", "unknown", "n/a", "none", "null"}
+
+# Display names for TECH_KEYWORDS when used as extracted skills
+TECH_SKILL_NAMES = {
+    "python": "Python",
+    "javascript": "JavaScript",
+    "react": "React",
+    "fastapi": "FastAPI",
+    "aws": "AWS",
+    "docker": "Docker",
+    "kubernetes": "Kubernetes",
+    "sql": "SQL",
+    "mongodb": "MongoDB",
+    "typescript": "TypeScript",
+    "java": "Java",
+    "c++": "C++",
+    "go": "Go",
+    "ruby": "Ruby",
+}
+
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP"}
+
+EMPLOYMENT_TYPES = {
+    "full-time": "full-time",
+    "full time": "full-time",
+    "fulltime": "full-time",
+    "part-time": "part-time",
+    "part time": "part-time",
+    "contract": "contract",
+    "contractor": "contract",
+    "temporary": "contract",
+    "intern": "intern",
+    "internship": "intern",
+}
+
+def _clean(value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+        if value.lower() in PLACEHOLDER_VALUES:
+            return None
+    return value or None
+
+def normalize_employment_type(value: str) -> str:
+    """Map free-form schedule types ("Full-time", "Contractor") to the schema values."""
+    if not value:
+        return None
+    return EMPLOYMENT_TYPES.get(value.strip().lower())
+
+def map_structured_job(raw_job: Dict[str, Any], source: str) -> Dict[str, Any]:
+    """Build a normalized job dict from a structured source record without an LLM.
+    Returns None when the source has no mapping or a required field cannot be derived,
+    in which case the caller should fall back to LLM normalization.
+    """
+    field_map = SOURCE_FIELD_MAPS.get(source)
+    if not field_map:
+        return None
+
+    mapped = {field: _clean(raw_job.get(raw_key)) for field, raw_key in field_map.items()}
+    if not mapped.get("title") or not mapped.get("company"):
+        return None
+    if not mapped.get("listing_url") and not mapped.get("apply_url"):
+        return None
+
+    location = mapped.get("location") or ""
+    remote = "remote" in location.lower() or "remote" in mapped["title"].lower()
+
+    salary = parse_salary(mapped.get("salary") or "")
+    salary["currency"] = CURRENCY_SYMBOLS.get(salary.get("currency"), salary.get("currency"))
+
+    posted_at = parse_posted_date(mapped.get("posted_at")) if mapped.get("posted_at") else None
+
+    normalized = {
+        "source_id": mapped.get("source_id"),
+        "title": mapped["title"],
+        "company": mapped["company"],
+        "company_logo": mapped.get("company_logo"),
+        "location": mapped.get("location"),
+        "remote": remote,
+        "job_type": None,
+        "employment_type": normalize_employment_type(mapped.get("employment_type")),
+        "salary": salary,
+        "posted_at": posted_at.isoformat() if posted_at else None,
+        "description": mapped.get("description"),
+        "listing_url": mapped.get("listing_url"),
+        "apply_url": mapped.get("apply_url"),
+    }
+    normalized["tags"] = extract_tags({**normalized, "description": normalized["description"] or ""})
+    normalized["skills_extracted"] = [
+        TECH_SKILL_NAMES.get(tech, tech) for tech in TECH_KEYWORDS if tech in normalized["tags"]
+    ]
+    return normalized
+
 # ---------------------------------------------------------------------------
 # End of file
 # ---------------------------------------------------------------------------
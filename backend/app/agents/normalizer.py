@@ -1,11 +1,14 @@
 import json
-import os
 import asyncio
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from backend.app.agents.graph import AgentState
 from backend.app.agents.llm_client import llm_client
+from backend.app.agents.prompt_registry import render_normalizer
+from backend.app.agents.rate_limiter import estimate_tokens
 from backend.app.db.models import Job, JobMetadata, SalaryInfo, OutreachContent
+from backend.app.db.mongo import db
+from backend.app.db.repositories.job_corpus_repository import JobCorpusRepository, POSTING_FIELDS, split_job_document
 from backend.app.agents.normalization_utils import (
     normalize_company_name,
     normalize_title,
@@ -14,23 +17,36 @@ from backend.app.agents.normalization_utils import (
     extract_tags,
     extract_skills,
     generate_fingerprint,
-    is_valid_job
+    generate_raw_key,
+    is_valid_job,
+    map_structured_job
 )
+from backend.core.config import settings
 
+# Process-wide count of jobs normalized by each path
+normalization_path_counts = {"corpus": 0, "fast_path": 0, "llm": 0}
 
-async def normalize_job_batch(raw_jobs: List[Dict[str, Any]], system_prompt_template: str) -> Dict[str, Any]:
+
+def _truncate_description(job: Dict[str, Any]) -> Dict[str, Any]:
+    job_copy = job.copy()
+    if job_copy.get('description') and len(job_copy['description']) > 500:
+        job_copy['description'] = job_copy['description'][:500] + "..."
+    return job_copy
+
+
+async def normalize_job_batch(raw_jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Use LLM to normalize a batch of jobs, then apply Python validation.
+    Each raw job is sent with a "ref" ("r0", "r1", ...) that the model echoes back
+    so outputs can be matched to their inputs.
     """
     # Truncate long descriptions to save tokens
-    truncated_jobs = []
-    for job in raw_jobs:
-        job_copy = job.copy()
-        if job_copy.get('description') and len(job_copy['description']) > 500:
-            job_copy['description'] = job_copy['description'][:500] + "..."
-        truncated_jobs.append(job_copy)
-
-    system_prompt = system_prompt_template.format(raw_jobs=json.dumps(truncated_jobs, indent=2))
+    truncated_jobs = [
+        {"ref": f"r{idx}", **_truncate_description(job)}
+        for idx, job in enumerate(raw_jobs)
+    ]
+
+    system_prompt = render_normalizer(raw_jobs=json.dumps(truncated_jobs, indent=2))
     
     response = await llm_client.generate_json(
         prompt="Normalize these job listings according to the schema.",
@@ -45,7 +61,48 @@ async def normalize_job_batch(raw_jobs: List[Dict[str, Any]], system_prompt_temp
         return {"normalized_jobs": [], "discarded_count": len(raw_jobs), "discard_reasons": ["llm_parse_error"] * len(raw_jobs)}
 
 
-def finalize_job(normalized_job: Dict[str, Any], raw_job: Dict[str, Any], source: str, scan_run_id: str = None, user_id: str = "") -> Job:
+def align_normalized_jobs(normalized_jobs: List[Any], batch_size: int) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Pair LLM outputs with the index of the raw job they came from using the echoed ref.
+    Positional alignment is only trusted when no output carries a ref and the counts match.
+    """
+    items = [job for job in normalized_jobs if isinstance(job, dict)]
+    if items and not any("ref" in job for job in items) and len(items) == batch_size:
+        return list(enumerate(items))
+
+    aligned = []
+    seen = set()
+    for job in items:
+        ref = str(job.get("ref", ""))
+        idx = int(ref[1:]) if ref.startswith("r") and ref[1:].isdigit() else None
+        if idx is None or idx >= batch_size or idx in seen:
+            continue
+        seen.add(idx)
+        aligned.append((idx, job))
+    return aligned
+
+
+def plan_batches(raw_jobs: List[Dict[str, Any]], token_budget: int, max_batch_size: int) -> List[List[int]]:
+    """
+    Group raw jobs (by index) into LLM batches that stay under token_budget prompt
+    tokens, so batches of short listings are larger than batches of long ones.
+    """
+    batches = []
+    batch: List[int] = []
+    batch_tokens = 0
+    for idx, raw_job in enumerate(raw_jobs):
+        tokens = estimate_tokens(json.dumps(_truncate_description(raw_job), default=str))
+        if batch and (batch_tokens + tokens > token_budget or len(batch) >= max_batch_size):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(idx)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def finalize_job(normalized_job: Dict[str, Any], raw_job: Dict[str, Any], source: str, scan_run_id: str = None, user_id: str = "", normalization_path: str = "llm") -> Job:
     """
     Apply Python-level validation and create Job model with metadata.
     """
@@ -77,8 +134,10 @@ def finalize_job(normalized_job: Dict[str, Any], raw_job: Dict[str, Any], source
     metadata = JobMetadata(
         fingerprint=fingerprint,
         scraped_from=source,
+        raw_key=generate_raw_key(raw_job, source),
         raw_payload=raw_job,
-        scan_run_id=scan_run_id
+        scan_run_id=scan_run_id,
+        normalization_path=normalization_path
     )
     
     # Create Job model
@@ -111,6 +170,198 @@ def finalize_job(normalized_job: Dict[str, Any], raw_job: Dict[str, Any], source
     return Job(**job_data)
 
 
+def job_from_posting(posting: Dict[str, Any], raw_key: str, scan_run_id: str = None, user_id: str = "") -> Job:
+    """Build a user's Job from a posting already in the job corpus, without normalizing."""
+    fingerprint = posting["_id"]
+    base_id = posting.get("source_id") or fingerprint
+    fields = {field: posting[field] for field in POSTING_FIELDS if posting.get(field) is not None}
+    metadata = JobMetadata(
+        fingerprint=fingerprint,
+        scraped_from=posting.get("source"),
+        raw_key=raw_key,
+        scan_run_id=scan_run_id,
+        normalization_path="corpus",
+    )
+    return Job(
+        _id=f"{user_id}:{base_id}" if user_id else base_id,
+        user_id=user_id,
+        metadata=metadata,
+        **fields,
+    )
+
+
+def _get_corpus_repository() -> Optional[JobCorpusRepository]:
+    if not settings.NORMALIZER_CORPUS_LOOKUP or db.client is None:
+        return None
+    return JobCorpusRepository(db.get_db())
+
+
+async def corpus_lookup(raw_jobs: List[Dict[str, Any]], scan_run_id: str = None, user_id: str = "", path_counts: Dict[str, int] = None) -> Tuple[List[Tuple[int, Job]], List[int]]:
+    """
+    Reuse postings that any user's scan already normalized.
+    Returns ((index, job) pairs, indexes of raw jobs that still need normalizing).
+    """
+    repo = _get_corpus_repository()
+    if repo is None:
+        return [], list(range(len(raw_jobs)))
+
+    raw_keys = [generate_raw_key(raw_job, resolve_source(raw_job)) for raw_job in raw_jobs]
+    try:
+        postings = await repo.find_by_raw_keys(raw_keys)
+    except Exception as e:
+        print(f"Job corpus lookup failed: {e}")
+        postings = {}
+
+    jobs = []
+    remaining = []
+    for idx, raw_key in enumerate(raw_keys):
+        posting = postings.get(raw_key)
+        if posting is None:
+            remaining.append(idx)
+            continue
+        try:
+            jobs.append((idx, job_from_posting(posting, raw_key, scan_run_id, user_id)))
+        except Exception as e:
+            print(f"Could not rebuild job from corpus, normalizing again: {e}")
+            remaining.append(idx)
+
+    _count_path("corpus", len(jobs), path_counts)
+    return jobs, remaining
+
+
+async def store_postings(jobs: List[Job]):
+    """Add freshly normalized postings to the corpus so later scans can skip them."""
+    repo = _get_corpus_repository()
+    if repo is None or not jobs:
+        return
+    try:
+        await repo.upsert_postings([split_job_document(job.model_dump(by_alias=True))[0] for job in jobs])
+    except Exception as e:
+        print(f"Job corpus write failed: {e}")
+
+
+def resolve_source(raw_job: Dict[str, Any]) -> str:
+    """Determine the source name from a raw job's "via" field."""
+    source = raw_job.get('via', 'unknown').lower().replace(' ', '_')
+    if 'google' in source:
+        source = 'google_jobs'
+    elif 'linkedin' in source:
+        source = 'linkedin'
+    elif 'indeed' in source:
+        source = 'indeed'
+    return source
+
+
+def _count_path(path: str, count: int, path_counts: Dict[str, int] = None):
+    normalization_path_counts[path] += count
+    if path_counts is not None:
+        path_counts[path] = path_counts.get(path, 0) + count
+
+
+def fast_path_normalize(raw_jobs: List[Dict[str, Any]], scan_run_id: str = None, user_id: str = "", path_counts: Dict[str, int] = None) -> Tuple[List[Tuple[int, Job]], List[int]]:
+    """
+    Normalize well-formed structured records with field mappings instead of the LLM.
+    Returns ((index, job) pairs, indexes of raw jobs that still need the LLM).
+    """
+    jobs = []
+    remaining = []
+    for idx, raw_job in enumerate(raw_jobs):
+        source = resolve_source(raw_job)
+        normalized_job = map_structured_job(raw_job, source)
+        if normalized_job is None:
+            remaining.append(idx)
+            continue
+        try:
+            jobs.append((idx, finalize_job(normalized_job, raw_job, source, scan_run_id, user_id, normalization_path="fast_path")))
+        except Exception as e:
+            print(f"Fast path could not finalize job, falling back to LLM: {e}")
+            remaining.append(idx)
+
+    _count_path("fast_path", len(jobs), path_counts)
+    return jobs, remaining
+
+
+async def _normalize_llm_batch(batch: List[Dict[str, Any]], scan_run_id: str = None, user_id: str = "") -> Tuple[List[Tuple[int, Job]], int, List[str]]:
+    """
+    Normalize one batch with the LLM.
+    Returns ((batch index, job) pairs, discarded_count, discard_reasons).
+    """
+    jobs = []
+    total_discarded = 0
+    discard_reasons = []
+
+    # Get LLM normalization
+    llm_result = await normalize_job_batch(batch)
+    normalized = llm_result.get("normalized_jobs", [])
+    aligned = align_normalized_jobs(normalized if isinstance(normalized, list) else [], len(batch))
+
+    # Finalize each job with Python validation
+    for idx, normalized_job in aligned:
+        try:
+            raw_job = batch[idx]
+            normalized_job.pop("ref", None)
+            source = resolve_source(raw_job)
+            job = finalize_job(normalized_job, raw_job, source, scan_run_id, user_id)
+            jobs.append((idx, job))
+        except Exception as e:
+            print(f"Failed to finalize job: {e}")
+            total_discarded += 1
+            discard_reasons.append(str(e))
+
+    unaligned = len(normalized) - len(aligned) if isinstance(normalized, list) else 0
+    if unaligned > 0:
+        total_discarded += unaligned
+        discard_reasons.extend(["unaligned_output"] * unaligned)
+
+    # Add LLM discarded count
+    total_discarded += llm_result.get("discarded_count", 0)
+    discard_reasons.extend(llm_result.get("discard_reasons", []))
+    return jobs, total_discarded, discard_reasons
+
+
+async def normalize_raw_jobs(raw_jobs: List[Dict[str, Any]], scan_run_id: str = None, user_id: str = "", path_counts: Dict[str, int] = None) -> Tuple[List[Job], int, List[str]]:
+    """
+    Normalize raw jobs. Postings already in the job corpus are reused as they are,
+    the fast path handles structured records and the remaining LLM batches run
+    concurrently (bounded by NORMALIZER_CONCURRENCY). Newly normalized postings are
+    added to the corpus.
+    Returns (jobs in input order, discarded_count, discard_reasons).
+    """
+    total_discarded = 0
+    discard_reasons = []
+
+    results, pending = await corpus_lookup(raw_jobs, scan_run_id, user_id, path_counts)
+    llm_indexes = pending
+
+    if settings.NORMALIZER_FAST_PATH_ENABLED and pending:
+        fast_jobs, fast_remaining = fast_path_normalize([raw_jobs[idx] for idx in pending], scan_run_id, user_id, path_counts)
+        results.extend((pending[pos], job) for pos, job in fast_jobs)
+        llm_indexes = [pending[pos] for pos in fast_remaining]
+
+    if llm_indexes:
+        _count_path("llm", len(llm_indexes), path_counts)
+        llm_jobs = [raw_jobs[idx] for idx in llm_indexes]
+        batches = [
+            [llm_indexes[pos] for pos in positions]
+            for positions in plan_batches(llm_jobs, settings.NORMALIZER_BATCH_TOKEN_BUDGET, settings.NORMALIZER_MAX_BATCH_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(max(1, settings.NORMALIZER_CONCURRENCY))
+
+        async def run(indexes: List[int]):
+            async with semaphore:
+                return await _normalize_llm_batch([raw_jobs[idx] for idx in indexes], scan_run_id, user_id)
+
+        batch_results = await asyncio.gather(*[run(indexes) for indexes in batches])
+        for indexes, (jobs, discarded, reasons) in zip(batches, batch_results):
+            results.extend((indexes[batch_idx], job) for batch_idx, job in jobs)
+            total_discarded += discarded
+            discard_reasons.extend(reasons)
+
+    results.sort(key=lambda item: item[0])
+    await store_postings([job for _, job in results if job.metadata.normalization_path != "corpus"])
+    return [job for _, job in results], total_discarded, discard_reasons
+
+
 async def normalizer_node(state: AgentState):
     """
     Normalize raw jobs using LLM + Python validation.
@@ -126,48 +377,15 @@ async def normalizer_node(state: AgentState):
         print("No raw jobs to normalize.")
         return {"normalized_jobs": []}
     
-    # Load prompt
-    prompt_path = os.path.join(os.path.dirname(__file__), "prompts", "normalizer.txt")
-    with open(prompt_path, "r") as f:
-        system_prompt_template = f.read()
-    
-    # Process jobs in batches for efficiency (batch of 3 to avoid rate limits)
-    batch_size = 3
-    all_normalized = []
-    total_discarded = 0
-    discard_reasons = []
-    
-    for i in range(0, len(raw_jobs), batch_size):
-        batch = raw_jobs[i:i+batch_size]
-        
-        # Get LLM normalization
-        llm_result = await normalize_job_batch(batch, system_prompt_template)
-        
-        # Finalize each job with Python validation
-        for idx, normalized_job in enumerate(llm_result.get("normalized_jobs", [])):
-            try:
-                # Determine source from raw_job
-                raw_job = batch[idx] if idx < len(batch) else {}
-                source = raw_job.get('via', 'unknown').lower().replace(' ', '_')
-                if 'google' in source:
-                    source = 'google_jobs'
-                elif 'linkedin' in source:
-                    source = 'linkedin'
-                elif 'indeed' in source:
-                    source = 'indeed'
-                
-                job = finalize_job(normalized_job, raw_job, source, scan_run_id, user_id)
-                all_normalized.append(job)
-            except Exception as e:
-                print(f"Failed to finalize job: {e}")
-                total_discarded += 1
-                discard_reasons.append(str(e))
-        
-        # Add LLM discarded count
-        total_discarded += llm_result.get("discarded_count", 0)
-        discard_reasons.extend(llm_result.get("discard_reasons", []))
+    path_counts = {"corpus": 0, "fast_path": 0, "llm": 0}
+    all_normalized, total_discarded, discard_reasons = await normalize_raw_jobs(
+        raw_jobs, scan_run_id, user_id, path_counts
+    )
     
-    print(f"Normalized {len(all_normalized)} jobs.")
+    print(
+        f"Normalized {len(all_normalized)} jobs ({path_counts['corpus']} from corpus, "
+        f"{path_counts['fast_path']} via fast path, {path_counts['llm']} sent to LLM)."
+    )
     print(f"Discarded {total_discarded} jobs. Reasons: {set(discard_reasons)}")
     
     return {"normalized_jobs": all_normalized}
@@ -1,20 +1,42 @@
 import json
-import os
 import asyncio
+from typing import List
 from backend.app.agents.graph import AgentState
 from backend.app.agents.llm_client import llm_client
+from backend.app.agents.prompt_registry import render_outreach
 from backend.app.db.models import Job, OutreachContent
+from backend.app.db.mongo import get_database
+from backend.app.db.repositories.job_repository import JobRepository
 from backend.app.utils.timeline import log_step
+from backend.core.config import settings
 
-async def generate_outreach(job: Job, user_profile: dict, system_prompt_template: str) -> dict:
-    system_prompt = system_prompt_template.format(
+def has_outreach(job: Job) -> bool:
+    return bool(job.outreach.email_subject or job.outreach.email_body or job.outreach.linkedin_dm)
+
+def outreach_payload(job: Job) -> dict:
+    return {
+        "job_id": job.id,
+        "email_subject": job.outreach.email_subject,
+        "email_body": job.outreach.email_body,
+        "linkedin_dm": job.outreach.linkedin_dm
+    }
+
+def select_top_matches(jobs: List[Job], top_n: int) -> List[Job]:
+    """The top_n best scored jobs that have no outreach yet"""
+    pending = [job for job in jobs if not has_outreach(job)]
+    pending.sort(key=lambda job: job.match_score or 0, reverse=True)
+    return pending[:max(0, top_n)]
+
+async def generate_outreach(job: Job, user_profile: dict, use_cache: bool = True) -> dict:
+    system_prompt = render_outreach(
         user_profile=json.dumps(user_profile, indent=2),
         job_details=job.model_dump_json(include={"title", "company", "description"})
     )
     
     response = await llm_client.generate_json(
         prompt="Generate outreach messages.",
-        system_message=system_prompt
+        system_message=system_prompt,
+        use_cache=use_cache
     )
     
     try:
@@ -26,31 +48,34 @@ async def generate_outreach(job: Job, user_profile: dict, system_prompt_template
             linkedin_dm=data.get("linkedin_dm")
         )
         
-        return {
-            "job_id": job.id,
-            "email_subject": job.outreach.email_subject,
-            "email_body": job.outreach.email_body,
-            "linkedin_dm": job.outreach.linkedin_dm
-        }
+        return outreach_payload(job)
     except Exception as e:
         print(f"Error generating outreach for job {job.id}: {e}")
         return None
 
+async def store_outreach(jobs: List[Job]):
+    """Save generated messages on already stored jobs"""
+    db = await get_database()
+    repo = JobRepository(db)
+    await asyncio.gather(*[repo.set_outreach(job.id, job.outreach.model_dump()) for job in jobs if has_outreach(job)])
+
 async def outreach_node(state: AgentState):
+    """
+    Generate messages for the OUTREACH_EAGER_TOP_N best matches only; the rest are
+    generated on demand (POST /api/jobs/{job_id}/outreach) and stored on the job.
+    """
     print("--- Outreach Agent ---")
     user_id = state.get("user_id", "unknown")
     run_id = state.get("run_id")
     matched_jobs = state.get("matched_jobs", [])
+    top_matches = select_top_matches(matched_jobs, settings.OUTREACH_EAGER_TOP_N)
+    if not top_matches:
+        return {"outreach_payloads": [], "matched_jobs": matched_jobs}
     
-    await log_step(user_id, f"Outreach: Generating messages for {len(matched_jobs)} matches...", run_id=run_id)
+    await log_step(user_id, f"Outreach: Generating messages for the top {len(top_matches)} matches...", run_id=run_id)
     user_profile = state.get("user_profile", {})
     
-    # Load prompt
-    prompt_path = os.path.join(os.path.dirname(__file__), "prompts", "outreach.txt")
-    with open(prompt_path, "r") as f:
-        system_prompt_template = f.read()
-        
-    tasks = [generate_outreach(job, user_profile, system_prompt_template) for job in matched_jobs]
+    tasks = [generate_outreach(job, user_profile) for job in top_matches]
     results = await asyncio.gather(*tasks)
     
     outreach_payloads = [res for res in results if res is not None]
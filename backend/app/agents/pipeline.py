@@ -0,0 +1,295 @@
+"""
+Streaming scan pipeline.
+Runs scout -> normalizer -> pre-filter -> matcher -> reviewer as concurrent stages joined
+by bounded asyncio queues, so jobs from the fastest source are normalized, scored and
+saved while slower sources are still scraping. Outreach is generated afterwards for the
+OUTREACH_EAGER_TOP_N best new matches only; the rest is generated on demand. The profiler
+runs alongside the scout and normalizer and only gates the pre-filter and matcher. Scout
+results that earlier scans of the same search already processed are dropped before
+normalization (see scan_state), and jobs the user already has right after it (see dedup).
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from backend.app.agents.graph import AgentState
+from backend.app.agents.scout import SOURCE_SEARCHES, source_pages, get_search_params
+from backend.app.agents.normalizer import normalize_raw_jobs
+from backend.app.agents.profiler import profiler_node
+from backend.app.agents.prefilter import prefilter_jobs
+from backend.app.agents.matcher import match_jobs, filter_matches
+from backend.app.agents.outreach import generate_outreach, select_top_matches, store_outreach
+from backend.app.agents.reviewer import save_new_jobs
+from backend.app.agents.scan_state import IncrementalScanState
+from backend.app.agents.dedup import KnownJobFilter
+from backend.app.db.models import Job
+from backend.app.utils.timeline import log_step
+from backend.app.utils.events import publish_event
+from backend.core.config import settings
+
+# End-of-stream marker passed down each queue once its producers are finished
+_DONE = object()
+
+
+async def _next_batch(queue: asyncio.Queue, batch_size: int, linger: float) -> Tuple[List[Any], bool]:
+    """
+    Take up to batch_size items, waiting at most linger seconds after the first one.
+    Returns (items, done); done is True once the end-of-stream marker was seen.
+    """
+    item = await queue.get()
+    if item is _DONE:
+        # Put it back so sibling workers of the same stage also stop
+        await queue.put(_DONE)
+        return [], True
+
+    batch = [item]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + linger
+    while len(batch) < batch_size:
+        timeout = deadline - loop.time()
+        try:
+            if timeout <= 0:
+                item = queue.get_nowait()
+            else:
+                item = await asyncio.wait_for(queue.get(), timeout)
+        except (asyncio.QueueEmpty, asyncio.TimeoutError):
+            break
+        if item is _DONE:
+            await queue.put(_DONE)
+            return batch, True
+        batch.append(item)
+    return batch, False
+
+
+async def _run_stage(
+    in_queue: asyncio.Queue,
+    out_queue: Optional[asyncio.Queue],
+    handler: Callable[[List[Any]], Awaitable[List[Any]]],
+    concurrency: int,
+    batch_size: int,
+    linger: float,
+):
+    """Run handler over batches from in_queue with concurrency workers, forwarding results."""
+    async def worker():
+        while True:
+            batch, done = await _next_batch(in_queue, batch_size, linger)
+            if batch:
+                results = await handler(batch)
+                if out_queue is not None:
+                    for result in results:
+                        await out_queue.put(result)
+            if done:
+                return
+
+    await asyncio.gather(*[worker() for _ in range(max(1, concurrency))])
+    if out_queue is not None:
+        await out_queue.put(_DONE)
+
+
+class ScanPipeline:
+    def __init__(self, state: AgentState):
+        self.state = state
+        self.user_id = state.get("user_id", "")
+        self.run_id = state.get("run_id")
+        run_meta = state.get("run_meta", {})
+        self.scan_run_id = run_meta.get("scan_run_id")
+        self.threshold = run_meta.get("match_threshold", 0.7)
+        self.linger = settings.SCAN_PIPELINE_BATCH_LINGER_SECONDS
+
+        self.raw_jobs: List[Dict[str, Any]] = []
+        self.normalized_jobs: List[Job] = []
+        self.scored_count = 0
+        self.candidate_count = 0
+        self.matched_count = 0
+        self.outreach_payloads: List[Dict[str, Any]] = []
+        self.saved_jobs: List[Job] = []
+        self.discarded = 0
+        self.discard_reasons: List[str] = []
+        self.normalization_paths = {"corpus": 0, "fast_path": 0, "llm": 0}
+        # Global cap on jobs sent to the LLM matcher (PREFILTER_TOP_K), spent on the best
+        # pre-scores of each PREFILTER_WINDOW_SIZE window
+        self.llm_budget = settings.PREFILTER_TOP_K if settings.PREFILTER_TOP_K > 0 else None
+        self.scan_state = IncrementalScanState.for_user(self.user_id)
+        self.known_jobs = KnownJobFilter.for_user(self.user_id)
+
+        self._started_at = 0.0
+        self._first_match_at: Optional[float] = None
+        self._profile_task: Optional[asyncio.Task] = None
+
+    async def run(self) -> Dict[str, Any]:
+        self._started_at = time.monotonic()
+        queue_size = settings.SCAN_PIPELINE_QUEUE_SIZE
+        raw_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        normalized_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        candidate_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        persist_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+        async def normalize(batch: List[Dict[str, Any]]) -> List[Job]:
+            jobs, discarded, reasons = await normalize_raw_jobs(
+                batch, self.scan_run_id, self.user_id, self.normalization_paths
+            )
+            self.normalized_jobs.extend(jobs)
+            self.discarded += discarded
+            self.discard_reasons.extend(reasons)
+            self._publish_progress("normalize")
+            fresh = await self.known_jobs.drop_known(jobs)
+            kept = {id(job) for job in fresh}
+            self.scan_state.mark_processed([job for job in jobs if id(job) not in kept])
+            return fresh
+
+        async def prefilter(window: List[Job]) -> List[Job]:
+            # Pre-scored a window at a time so term IDF and the budget cut see many jobs
+            user_profile = await self._user_profile()
+            candidates = window
+            if settings.PREFILTER_ENABLED:
+                candidates, dropped = prefilter_jobs(window, user_profile, settings.PREFILTER_MIN_SCORE)
+                self.scan_state.mark_processed(dropped)
+            if self.llm_budget is not None:
+                # Kept jobs come best first, so the cap drops the weakest of the window
+                candidates = candidates[:self.llm_budget]
+                self.llm_budget -= len(candidates)
+            self.candidate_count += len(candidates)
+            return candidates
+
+        async def match(candidates: List[Job]) -> List[Job]:
+            user_profile = await self._user_profile()
+            scored = await match_jobs(candidates, user_profile)
+            # A failed match call leaves match_score unset; the next scan retries the job
+            self.scan_state.mark_processed([job for job in scored if job.match_score is not None])
+            self.scored_count += len(scored)
+            matched = filter_matches(scored, self.threshold)
+            self.matched_count += len(matched)
+            if matched and self._first_match_at is None:
+                self._first_match_at = time.monotonic()
+                print(f"First match after {self._first_match_at - self._started_at:.1f}s")
+            self._publish_progress("match")
+            return matched
+
+        async def persist(batch: List[Job]) -> List[Job]:
+            self.saved_jobs.extend(await save_new_jobs(batch, self.user_id))
+            self._publish_progress("persist")
+            return []
+
+        self._profile_task = asyncio.create_task(profiler_node(self.state))
+        tasks = [
+            self._profile_task,
+            # Stored fingerprints load while the sources are still being scraped
+            asyncio.create_task(self.known_jobs.load()),
+            asyncio.create_task(self._scout(raw_queue)),
+            asyncio.create_task(_run_stage(
+                raw_queue, normalized_queue, normalize,
+                settings.SCAN_NORMALIZE_CONCURRENCY, settings.NORMALIZER_MAX_BATCH_SIZE, self.linger,
+            )),
+            asyncio.create_task(_run_stage(
+                normalized_queue, candidate_queue, prefilter,
+                1, max(1, settings.PREFILTER_WINDOW_SIZE), settings.PREFILTER_WINDOW_LINGER_SECONDS,
+            )),
+            asyncio.create_task(_run_stage(
+                candidate_queue, persist_queue, match,
+                settings.SCAN_MATCH_CONCURRENCY, max(1, settings.MATCHER_BATCH_SIZE), self.linger,
+            )),
+            asyncio.create_task(_run_stage(
+                persist_queue, None, persist,
+                1, settings.SCAN_PERSIST_BATCH_SIZE, self.linger,
+            )),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        await self.scan_state.commit()
+        await self._eager_outreach()
+        await self._log_summary()
+        return {
+            "user_profile": self._profile_task.result().get("user_profile", self.state.get("user_profile", {})),
+            "raw_jobs": self.raw_jobs,
+            "normalized_jobs": self.normalized_jobs,
+            "matched_jobs": self.saved_jobs,
+            "outreach_payloads": self.outreach_payloads,
+        }
+
+    def _publish_progress(self, stage: str):
+        """Partial counts for live subscribers; cheap no-op when nobody is listening"""
+        publish_event(self.user_id, "progress", {
+            "stage": stage,
+            "raw_jobs": len(self.raw_jobs),
+            "normalized_jobs": len(self.normalized_jobs),
+            "scored_jobs": self.scored_count,
+            "matched_jobs": self.matched_count,
+            "saved_jobs": len(self.saved_jobs),
+        }, run_id=self.run_id)
+
+    async def _user_profile(self) -> Dict[str, Any]:
+        result = await asyncio.shield(self._profile_task)
+        return result.get("user_profile", self.state.get("user_profile", {}))
+
+    async def _eager_outreach(self):
+        """Messages for the best new matches; every other job gets them on demand"""
+        top_matches = select_top_matches(self.saved_jobs, settings.OUTREACH_EAGER_TOP_N)
+        if not top_matches:
+            return
+        user_profile = await self._user_profile()
+        results = await asyncio.gather(*[generate_outreach(job, user_profile) for job in top_matches])
+        self.outreach_payloads.extend(res for res in results if res is not None)
+        await store_outreach(top_matches)
+
+    async def _scout(self, raw_queue: asyncio.Queue):
+        """Run every source search concurrently and enqueue raw jobs as each one returns."""
+        print("--- Scout Agent ---")
+        await log_step(self.user_id, "Scout Agent: Starting job search across sources...", run_id=self.run_id)
+        sources, query_str, location = get_search_params(self.state)
+
+        async def enqueue(raw_jobs: List[Dict[str, Any]]):
+            for raw_job in raw_jobs:
+                self.raw_jobs.append(raw_job)
+                await raw_queue.put(raw_job)
+            self._publish_progress("scout")
+
+        async def fetch(source: str):
+            label, _ = SOURCE_SEARCHES[source]
+            await log_step(self.user_id, f"Scout: {label}...", run_id=self.run_id, verbose=True)
+            watermark = await self.scan_state.watermark(source, query_str, location)
+            # Hand each result page downstream as soon as it arrives (or comes out of the cache),
+            # minus what earlier scans of this search already processed
+            async for page in source_pages(source, query_str, location):
+                await enqueue(self.scan_state.filter(watermark, page))
+
+        try:
+            await asyncio.gather(*[fetch(source) for source in sources])
+        finally:
+            await raw_queue.put(_DONE)
+
+        print(f"Scout found {len(self.raw_jobs)} new raw jobs ({self.scan_state.skipped} seen by earlier scans).")
+        await log_step(self.user_id, f"Scout: Found {len(self.raw_jobs)} new raw jobs.", run_id=self.run_id)
+
+    async def _log_summary(self):
+        elapsed = time.monotonic() - self._started_at
+        print(
+            f"Normalized {len(self.normalized_jobs)} jobs "
+            f"({self.normalization_paths['corpus']} from corpus, {self.normalization_paths['fast_path']} via fast path, "
+            f"{self.normalization_paths['llm']} sent to LLM)."
+        )
+        print(f"Discarded {self.discarded} jobs. Reasons: {set(self.discard_reasons)}")
+        print(
+            f"Early dedup dropped {self.known_jobs.stats['known']} known jobs "
+            f"({self.known_jobs.stats['within_run']} repeated within the scan, "
+            f"{self.known_jobs.stats['false_positives']} Bloom false positives)."
+        )
+        print(f"Matched {self.matched_count} out of {len(self.normalized_jobs)} jobs ({self.candidate_count} sent to LLM).")
+        print(f"Generated outreach for {len(self.outreach_payloads)} jobs.")
+        print(f"Reviewer approved and saved {len(self.saved_jobs)} new jobs. Pipeline took {elapsed:.1f}s.")
+        await log_step(
+            self.user_id,
+            f"Matcher: Scored {self.scored_count} of {len(self.normalized_jobs)} jobs, {self.matched_count} matches",
+            run_id=self.run_id,
+        )
+        await log_step(self.user_id, f"Reviewer: Saved {len(self.saved_jobs)} new jobs.", run_id=self.run_id)
+
+
+async def run_scan_pipeline(state: AgentState) -> Dict[str, Any]:
+    """Run everything after the supervisor as a streaming pipeline and return the state update."""
+    return await ScanPipeline(state).run()
@@ -0,0 +1,134 @@
+"""
+Deterministic pre-scoring of normalized jobs against the user profile.
+Used by the matcher to skip obvious mismatches before any LLM call. Scores are a
+TF-IDF weighted overlap between profile terms and job terms, computed for the whole
+batch at once, plus small bonuses for remote and location preferences.
+"""
+import re
+from typing import Any, Dict, List, Set, Tuple
+
+import numpy as np
+
+from backend.app.db.models import Job
+
+TERM_REGEX = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+STOPWORDS = {"a", "an", "and", "or", "the", "of", "in", "to", "for", "with", "at", "on", "by", "as", "is", "&"}
+
+# Relative weight of each job field when a profile term appears in it
+JOB_FIELD_WEIGHTS = {
+    "skills_extracted": 1.0,
+    "tags": 1.0,
+    "title": 1.0,
+    "description": 0.25,
+}
+# Relative weight of each profile field; keywords are the user's search intent
+PROFILE_FIELD_WEIGHTS = {
+    "skills": 1.0,
+    "keywords": 1.5,
+}
+TERM_OVERLAP_WEIGHT = 0.8
+REMOTE_WEIGHT = 0.1
+LOCATION_WEIGHT = 0.1
+
+
+def tokenize(values: Any) -> Set[str]:
+    """Lowercase word terms from a string or list of strings."""
+    if not values:
+        return set()
+    if isinstance(values, str):
+        values = [values]
+    terms = set()
+    for value in values:
+        if not isinstance(value, str):
+            continue
+        for term in TERM_REGEX.findall(value.lower()):
+            term = term.rstrip(".")
+            if term and term not in STOPWORDS:
+                terms.add(term)
+    return terms
+
+
+def _profile_terms(user_profile: Dict[str, Any]) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for field, weight in PROFILE_FIELD_WEIGHTS.items():
+        for term in tokenize(user_profile.get(field)):
+            weights[term] = max(weights.get(term, 0.0), weight)
+    preferences = user_profile.get("preferences") or {}
+    for field in ("job_types", "employment_types"):
+        for term in tokenize(preferences.get(field)):
+            weights.setdefault(term, 0.5)
+    return weights
+
+
+def _wants_remote(preferences: Dict[str, Any]) -> bool:
+    if preferences.get("remote"):
+        return True
+    location = preferences.get("location")
+    return isinstance(location, str) and "remote" in location.lower()
+
+
+def score_jobs(jobs: List[Job], user_profile: Dict[str, Any]) -> np.ndarray:
+    """Return a pre-score in [0, 1] for every job, in input order."""
+    if not jobs:
+        return np.zeros(0, dtype=np.float32)
+
+    profile_weights = _profile_terms(user_profile)
+    preferences = user_profile.get("preferences") or {}
+    vocab = {term: idx for idx, term in enumerate(profile_weights)}
+
+    overlap = np.zeros(len(jobs), dtype=np.float32)
+    if vocab:
+        matrix = np.zeros((len(jobs), len(vocab)), dtype=np.float32)
+        for row, job in enumerate(jobs):
+            for field, weight in JOB_FIELD_WEIGHTS.items():
+                cols = [vocab[t] for t in tokenize(getattr(job, field)) if t in vocab]
+                if cols:
+                    matrix[row, cols] = np.maximum(matrix[row, cols], weight)
+
+        doc_freq = (matrix > 0).sum(axis=0)
+        idf = np.log((1.0 + len(jobs)) / (1.0 + doc_freq)) + 1.0
+        query = np.array([profile_weights[t] for t in vocab], dtype=np.float32) * idf
+        # Share of the profile's weighted terms found in each job (capped so that a
+        # handful of strong hits is enough for a full overlap score)
+        coverage = matrix @ query / max(query.sum(), 1e-9)
+        saturation = min(1.0, 5.0 / len(vocab))
+        overlap = np.minimum(coverage / saturation, 1.0)
+
+    remote_match = np.zeros(len(jobs), dtype=np.float32)
+    if _wants_remote(preferences):
+        remote_match = np.array([1.0 if job.remote else 0.0 for job in jobs], dtype=np.float32)
+
+    location_match = np.zeros(len(jobs), dtype=np.float32)
+    location_terms = tokenize(preferences.get("location")) - {"remote"}
+    if location_terms:
+        location_match = np.array(
+            [1.0 if location_terms & tokenize(job.location) else 0.0 for job in jobs],
+            dtype=np.float32,
+        )
+
+    scores = TERM_OVERLAP_WEIGHT * overlap + REMOTE_WEIGHT * remote_match + LOCATION_WEIGHT * location_match
+    return np.clip(scores, 0.0, 1.0)
+
+
+def prefilter_jobs(jobs: List[Job], user_profile: Dict[str, Any], min_score: float, top_k: int = 0) -> Tuple[List[Job], List[Job]]:
+    """
+    Score jobs, store the score on job.pre_score and split them into (kept, dropped).
+    Kept jobs are those at or above min_score, limited to the best top_k when top_k > 0,
+    ordered by descending score.
+    """
+    scores = score_jobs(jobs, user_profile)
+    for job, score in zip(jobs, scores):
+        job.pre_score = round(float(score), 4)
+
+    if not _profile_terms(user_profile):
+        # Nothing to compare against; let the LLM decide
+        return list(jobs), []
+
+    order = np.argsort(-scores, kind="stable")
+    kept_idx = [int(i) for i in order if scores[i] >= min_score]
+    if top_k > 0:
+        kept_idx = kept_idx[:top_k]
+    kept_set = set(kept_idx)
+    kept = [jobs[i] for i in kept_idx]
+    dropped = [job for i, job in enumerate(jobs) if i not in kept_set]
+    return kept, dropped
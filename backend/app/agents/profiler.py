@@ -1,8 +1,8 @@
 import json
-import os
 
 from backend.app.agents.graph import AgentState
 from backend.app.agents.llm_client import llm_client
+from backend.app.agents.prompt_registry import render_profiler
 from backend.app.utils.timeline import log_step
 
 
@@ -14,11 +14,7 @@ async def profiler_node(state: AgentState):
 
     user_profile = state.get("user_profile", {})
 
-    prompt_path = os.path.join(os.path.dirname(__file__), "prompts", "profiler.txt")
-    with open(prompt_path, "r") as f:
-        system_prompt_template = f.read()
-
-    system_prompt = system_prompt_template.format(user_profile=json.dumps(user_profile, indent=2))
+    system_prompt = render_profiler(user_profile=json.dumps(user_profile, indent=2))
 
     response = await llm_client.generate_json(
         prompt="Analyze and refine the user profile.",
@@ -0,0 +1,158 @@
+"""
+Prompt templates of every agent, read from agents/prompts once and kept in memory.
+Each template is validated against the placeholders its agent fills in and compiled
+into alternating static text and placeholders, so rendering is a join with no disk
+I/O or format parsing. Rendered prompt sizes are tracked per template. With
+PROMPT_RELOAD on (development), edited files are picked up by a polling task.
+"""
+import asyncio
+import os
+import string
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from backend.app.agents.rate_limiter import estimate_tokens
+from backend.core.config import settings
+
+PROMPTS_DIR = os.path.join(os.path.dirname(__file__), "prompts")
+
+# Template name (prompts/<name>.txt) -> placeholders the agent fills in
+PROMPT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "supervisor": ("user_profile",),
+    "profiler": ("user_profile",),
+    "normalizer": ("raw_jobs",),
+    "matcher": ("user_profile", "job_details"),
+    "matcher_batch": ("user_profile", "jobs"),
+    "outreach": ("user_profile", "job_details"),
+}
+
+
+class PromptField(str):
+    """Name of a placeholder inside a compiled template"""
+
+
+class PromptTemplate:
+    def __init__(self, name: str, text: str, fields: Tuple[str, ...]):
+        self.name = name
+        self.fields = fields
+        self.parts = self._compile(text)
+        self.static_tokens = estimate_tokens("".join(part for part in self.parts if not isinstance(part, PromptField)))
+        self._stats = {"renders": 0, "tokens_total": 0, "tokens_max": 0}
+
+    def _compile(self, text: str) -> List[Union[str, PromptField]]:
+        """Split into static text ({{ }} already unescaped) and placeholders, validating both"""
+        parts: List[Union[str, PromptField]] = []
+        found = set()
+        try:
+            parsed = list(string.Formatter().parse(text))
+        except ValueError as e:
+            raise ValueError(f"Prompt '{self.name}' is not a valid template: {e}")
+        for literal, field, format_spec, conversion in parsed:
+            if literal:
+                parts.append(literal)
+            if field is None:
+                continue
+            if field not in self.fields:
+                raise ValueError(f"Prompt '{self.name}' has unknown placeholder {{{field}}}")
+            if format_spec or conversion:
+                raise ValueError(f"Prompt '{self.name}' placeholder {{{field}}} must not use a format spec")
+            found.add(field)
+            parts.append(PromptField(field))
+        missing = set(self.fields) - found
+        if missing:
+            raise ValueError(f"Prompt '{self.name}' is missing placeholders {sorted(missing)}")
+        return parts
+
+    def render(self, **values: str) -> str:
+        prompt = "".join(values[part] if isinstance(part, PromptField) else part for part in self.parts)
+        tokens = estimate_tokens(prompt)
+        self._stats["renders"] += 1
+        self._stats["tokens_total"] += tokens
+        self._stats["tokens_max"] = max(self._stats["tokens_max"], tokens)
+        return prompt
+
+    def get_stats(self) -> Dict[str, Any]:
+        renders = self._stats["renders"]
+        return {
+            **self._stats,
+            "static_tokens": self.static_tokens,
+            "tokens_avg": round(self._stats["tokens_total"] / renders, 1) if renders else 0.0,
+        }
+
+
+class PromptRegistry:
+    def __init__(self, directory: str, fields: Dict[str, Tuple[str, ...]]):
+        self.directory = directory
+        self.fields = fields
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._mtimes: Dict[str, float] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.txt")
+
+    def _read(self, name: str) -> PromptTemplate:
+        with open(self._path(name), "r") as f:
+            return PromptTemplate(name, f.read(), self.fields[name])
+
+    def load(self):
+        """Read and validate every template; raises if any file is missing or invalid"""
+        templates = {name: self._read(name) for name in self.fields}
+        self._mtimes = {name: os.path.getmtime(self._path(name)) for name in self.fields}
+        self._templates = templates
+
+    def get(self, name: str) -> PromptTemplate:
+        if not self._templates:
+            self.load()
+        return self._templates[name]
+
+    def reload_changed(self) -> List[str]:
+        """Re-read templates whose file changed; an invalid edit keeps the previous version"""
+        reloaded = []
+        for name in self.fields:
+            try:
+                mtime = os.path.getmtime(self._path(name))
+                if mtime == self._mtimes.get(name):
+                    continue
+                self._mtimes[name] = mtime
+                self._templates[name] = self._read(name)
+                reloaded.append(name)
+            except Exception as e:
+                print(f"Prompt '{name}' not reloaded: {e}")
+        return reloaded
+
+    async def watch(self, interval: Optional[float] = None):
+        """Poll the prompt files and reload edited ones until cancelled"""
+        interval = interval or settings.PROMPT_RELOAD_INTERVAL_SECONDS
+        while True:
+            await asyncio.sleep(interval)
+            for name in await asyncio.to_thread(self.reload_changed):
+                print(f"Reloaded prompt '{name}'")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: template.get_stats() for name, template in self._templates.items()}
+
+
+prompt_registry = PromptRegistry(PROMPTS_DIR, PROMPT_FIELDS)
+
+
+def render_supervisor(user_profile: str) -> str:
+    return prompt_registry.get("supervisor").render(user_profile=user_profile)
+
+
+def render_profiler(user_profile: str) -> str:
+    return prompt_registry.get("profiler").render(user_profile=user_profile)
+
+
+def render_normalizer(raw_jobs: str) -> str:
+    return prompt_registry.get("normalizer").render(raw_jobs=raw_jobs)
+
+
+def render_matcher(user_profile: str, job_details: str) -> str:
+    return prompt_registry.get("matcher").render(user_profile=user_profile, job_details=job_details)
+
+
+def render_matcher_batch(user_profile: str, jobs: str) -> str:
+    return prompt_registry.get("matcher_batch").render(user_profile=user_profile, jobs=jobs)
+
+
+def render_outreach(user_profile: str, job_details: str) -> str:
+    return prompt_registry.get("outreach").render(user_profile=user_profile, job_details=job_details)
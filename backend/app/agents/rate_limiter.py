@@ -0,0 +1,143 @@
+"""
+Process-wide request/token rate governor for LLM calls.
+Callers queue in FIFO order and are released only when both the requests-per-minute
+and tokens-per-minute buckets have capacity. Bucket levels are corrected from the
+provider's x-ratelimit-* headers after every response.
+"""
+import asyncio
+import random
+import re
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from backend.core.config import settings
+
+DURATION_REGEX = re.compile(r"(?P<value>\d+(?:\.\d+)?)(?P<unit>ms|h|m|s)")
+UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Convert reset header values like "2m59.56s", "7.66s" or "250ms" to seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    matches = DURATION_REGEX.findall(value)
+    if not matches:
+        return None
+    return sum(float(amount) * UNIT_SECONDS[unit] for amount, unit in matches)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token) used before a request is sent."""
+    if not text:
+        return 0
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.level = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be consumed (requests larger than capacity wait for a full bucket)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.refill_per_second
+
+    def consume(self, amount: float):
+        self._refill()
+        self.level -= amount
+
+    def sync(self, remaining: float):
+        """Never believe we have more capacity than the provider reports."""
+        self._refill()
+        self.level = min(self.level, remaining)
+
+
+class RateGovernor:
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, jitter_seconds: float = 0.25):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+        self.jitter_seconds = jitter_seconds
+        self._lock: Optional[asyncio.Lock] = None
+        self._blocked_until = 0.0
+        self._stats = {"acquired": 0, "waited_seconds": 0.0, "throttled": 0, "penalties": 0}
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def acquire(self, estimated_tokens: int):
+        """Wait (in arrival order) until one request of estimated_tokens fits in both budgets."""
+        async with self._get_lock():
+            while True:
+                wait = max(
+                    self._blocked_until - time.monotonic(),
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(estimated_tokens),
+                )
+                if wait <= 0:
+                    break
+                wait += random.uniform(0, self.jitter_seconds)
+                self._stats["throttled"] += 1
+                self._stats["waited_seconds"] += wait
+                await asyncio.sleep(wait)
+            self.requests.consume(1)
+            self.tokens.consume(estimated_tokens)
+            self._stats["acquired"] += 1
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """Correct the token bucket once the real usage is known."""
+        if actual_tokens is not None:
+            self.tokens.consume(actual_tokens - estimated_tokens)
+
+    def update_from_headers(self, headers: Mapping[str, Any]):
+        """Apply x-ratelimit-remaining-*/x-ratelimit-reset-* headers from a response."""
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            if remaining is None:
+                continue
+            try:
+                remaining = float(remaining)
+            except (TypeError, ValueError):
+                continue
+            bucket.sync(remaining)
+            if remaining <= 0:
+                reset = parse_reset_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                if reset:
+                    self.penalize(reset)
+
+    def penalize(self, seconds: float):
+        """Hold every caller back for seconds, e.g. after a 429 with retry-after."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self._stats["penalties"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "waited_seconds": round(self._stats["waited_seconds"], 2),
+            "requests_available": round(self.requests.level, 2),
+            "tokens_available": round(self.tokens.level, 2),
+        }
+
+
+rate_governor = RateGovernor(
+    requests_per_minute=settings.LLM_RATE_LIMIT_RPM,
+    tokens_per_minute=settings.LLM_RATE_LIMIT_TPM,
+    jitter_seconds=settings.LLM_RATE_LIMIT_JITTER_SECONDS,
+)
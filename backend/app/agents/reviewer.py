@@ -1,12 +1,46 @@
 import json
 import os
 import asyncio
+from typing import Dict, List
 from backend.app.agents.graph import AgentState
 from backend.app.agents.llm_client import llm_client
+from backend.app.db.models import Job
 from backend.app.db.mongo import get_database
 from backend.app.db.repositories.job_repository import JobRepository
+from backend.app.db.repositories.job_corpus_repository import split_job_document
+from backend.app.services.dashboard_service import invalidate_dashboard_stats
 from backend.app.utils.timeline import log_step
 
+async def save_new_jobs(jobs: List[Job], user_id: str) -> List[Job]:
+    """Persist jobs the user does not already have and return them."""
+    # Deduplication using fingerprint (more reliable than ID)
+    db = await get_database()
+    repo = JobRepository(db)
+
+    unique_jobs: Dict[str, Job] = {}
+    for job in jobs:
+        if job.metadata.fingerprint in unique_jobs:
+            print(f"Duplicate job within run: {job.metadata.fingerprint} (job: {job.title} at {job.company})")
+            continue
+        unique_jobs[job.metadata.fingerprint] = job
+
+    # One $in lookup for the whole run instead of one query per job
+    existing = await repo.find_existing_fingerprints(list(unique_jobs), user_id)
+    for fingerprint in existing:
+        job = unique_jobs.pop(fingerprint)
+        print(f"Duplicate job found by fingerprint: {fingerprint} (job: {job.title} at {job.company})")
+
+    # Postings go to the shared corpus, the user keeps a slim reference
+    new_jobs = list(unique_jobs.values())
+    documents = [split_job_document(job.model_dump(by_alias=True)) for job in new_jobs]
+    await repo.corpus.upsert_postings([posting for posting, _ in documents])
+
+    # Single unordered insert; duplicate-key errors mean a concurrent scan saved it first
+    inserted_ids = set(await repo.insert_many_new([match for _, match in documents]))
+    if inserted_ids:
+        invalidate_dashboard_stats(user_id)
+    return [job for job in new_jobs if job.id in inserted_ids]
+
 async def reviewer_node(state: AgentState):
     print("--- Reviewer Agent ---")
     user_id = state.get("user_id", "unknown")
@@ -19,20 +53,7 @@ async def reviewer_node(state: AgentState):
         print("No jobs to review.")
         return {"matched_jobs": []}
     
-    # Deduplication using fingerprint (more reliable than ID)
-    db = await get_database()
-    repo = JobRepository(db)
-    
-    final_jobs = []
-    for job in matched_jobs:
-        # Check for duplicate using fingerprint
-        existing = await repo.find_by_fingerprint(job.metadata.fingerprint, user_id)
-        if not existing:
-            # Save to DB
-            await repo.create(job.model_dump(by_alias=True))
-            final_jobs.append(job)
-        else:
-            print(f"Duplicate job found by fingerprint: {job.metadata.fingerprint} (job: {job.title} at {job.company})")
+    final_jobs = await save_new_jobs(matched_jobs, user_id)
             
     print(f"Reviewer approved and saved {len(final_jobs)} new jobs.")
     
@@ -0,0 +1,129 @@
+"""
+Incremental scans.
+Every (user, source, query) search remembers the newest posted_at it has seen and the
+ids of the postings it returned lately. Scout results already seen, or posted at or
+before the mark, are dropped before normalization, so a steady-state scan only spends
+LLM calls on what is new since the last one. State advances once a scan completes,
+and only for postings that were actually normalized and scored (or filtered out on
+purpose): anything a failed LLM call left behind is seen again by the next scan.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+from backend.app.db.models import Job
+from backend.app.db.mongo import db
+from backend.app.db.repositories.scan_state_repository import ScanStateRepository
+from backend.app.agents.normalization_utils import generate_raw_key, parse_posted_date
+from backend.app.agents.normalizer import resolve_source
+from backend.app.agents.source_cache import make_search_key
+from backend.core.config import settings
+
+# Seen ids are raw keys cut to 64 bits; plenty to tell one search's postings apart
+SEEN_ID_LENGTH = 16
+
+
+def seen_id(raw_key: str) -> str:
+    return raw_key[:SEEN_ID_LENGTH]
+
+
+class SearchWatermark:
+    """State of one search during a scan: what was stored before and what this scan saw"""
+
+    def __init__(self, source: str, search_key: str, state: Optional[Dict[str, Any]] = None):
+        state = state or {}
+        self.source = source
+        self.search_key = search_key
+        self.posted_at_mark: Optional[datetime] = state.get("posted_at_mark")
+        self.seen_ids: Set[str] = set(state.get("seen_ids", []))
+        self.new_ids: Dict[str, None] = {}  # Ordered set of ids first seen by this scan, processed or not
+        self.newest_posted_at: Optional[datetime] = None
+
+    def is_new(self, raw_job: Dict[str, Any], slack: timedelta) -> bool:
+        """
+        Record a scout result and tell whether it still needs processing.
+        Only postings dated well before the mark are dropped on their date alone; inside
+        the slack the seen ids decide, since relative dates are coarse.
+        """
+        job_id = seen_id(generate_raw_key(raw_job, resolve_source(raw_job)))
+        posted_at = parse_posted_date(raw_job.get("posted_at") or "")
+        if posted_at is not None and (self.newest_posted_at is None or posted_at > self.newest_posted_at):
+            self.newest_posted_at = posted_at
+
+        if job_id in self.seen_ids or job_id in self.new_ids:
+            return False
+        if self.posted_at_mark is not None and posted_at is not None and posted_at <= self.posted_at_mark - slack:
+            return False
+        self.new_ids[job_id] = None
+        return True
+
+
+class IncrementalScanState:
+    """
+    High-water marks of one user's scan. Disabled (everything is new, nothing is
+    saved) when SCAN_INCREMENTAL_ENABLED is off or Mongo is not connected.
+    """
+
+    def __init__(self, user_id: str, repo: Optional[ScanStateRepository] = None):
+        self.user_id = user_id
+        self.repo = repo
+        self.slack = timedelta(hours=settings.SCAN_STATE_POSTED_AT_SLACK_HOURS)
+        self.watermarks: List[SearchWatermark] = []
+        self.skipped = 0
+        self._processed: Set[str] = set()
+
+    @classmethod
+    def for_user(cls, user_id: str) -> "IncrementalScanState":
+        if not settings.SCAN_INCREMENTAL_ENABLED or not user_id or db.client is None:
+            return cls(user_id)
+        return cls(user_id, ScanStateRepository(db.get_db()))
+
+    async def watermark(self, source: str, query: str, location: str) -> Optional[SearchWatermark]:
+        if self.repo is None:
+            return None
+        search_key = make_search_key(source, query, location)
+        try:
+            state = await self.repo.get_state(self.user_id, search_key)
+        except Exception as e:
+            print(f"Could not load scan state for {source}, scanning everything: {e}")
+            state = None
+        watermark = SearchWatermark(source, search_key, state)
+        self.watermarks.append(watermark)
+        return watermark
+
+    def filter(self, watermark: Optional[SearchWatermark], raw_jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Scout results the user has not had processed yet"""
+        if watermark is None:
+            return raw_jobs
+        fresh = [raw_job for raw_job in raw_jobs if watermark.is_new(raw_job, self.slack)]
+        self.skipped += len(raw_jobs) - len(fresh)
+        return fresh
+
+    def mark_processed(self, jobs: List[Job]):
+        """
+        Jobs this scan reached a decision on: scored, or dropped by the pre-filter or as
+        already stored. Everything else (normalization discards, failed match calls,
+        jobs over the LLM budget) is seen again by the next scan.
+        """
+        self._processed.update(seen_id(job.metadata.raw_key) for job in jobs if job.metadata.raw_key)
+
+    async def commit(self):
+        """Advance every search's state; call only once the scan completed"""
+        if self.repo is None:
+            return
+        states = []
+        for watermark in self.watermarks:
+            new_ids = [job_id for job_id in watermark.new_ids if job_id in self._processed]
+            # With postings left over the date alone no longer proves a posting was handled
+            complete = len(new_ids) == len(watermark.new_ids)
+            posted_at_mark = watermark.newest_posted_at if complete else None
+            if new_ids or posted_at_mark is not None:
+                states.append({
+                    "search_key": watermark.search_key,
+                    "source": watermark.source,
+                    "seen_ids": new_ids,
+                    "posted_at_mark": posted_at_mark,
+                })
+        try:
+            await self.repo.save_states(self.user_id, states, settings.SCAN_STATE_MAX_SEEN_IDS)
+        except Exception as e:
+            print(f"Could not save scan state: {e}")
@@ -1,58 +1,83 @@
 import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
 from backend.app.agents.graph import AgentState
 from backend.app.utils.timeline import log_step
+from backend.app.agents.source_cache import source_cache
+from backend.core.config import settings
 from backend.app.agents.tools_sources import (
     search_google_jobs_serpapi,
+    stream_google_jobs_pages,
     fetch_yc_jobs,
     fetch_wellfound_jobs,
     search_linkedin_playwright,
     search_indeed_playwright
 )
 
-async def scout_node(state: AgentState):
-    print("--- Scout Agent ---")
-    user_id = state.get("user_id", "unknown")
-    run_id = state.get("run_id")
-    await log_step(user_id, "Scout Agent: Starting job search across sources...", run_id=run_id)
-    
+# source -> (timeline label, search(query, location))
+SOURCE_SEARCHES: Dict[str, Tuple[str, Callable[[str, str], Awaitable[List[Dict[str, Any]]]]]] = {
+    "google_jobs": ("Searching Google Jobs", lambda query, location: search_google_jobs_serpapi(query, location)),
+    "yc": ("Fetching YC Jobs", lambda query, location: fetch_yc_jobs(query)),
+    "wellfound": ("Fetching Wellfound Jobs", lambda query, location: fetch_wellfound_jobs(query)),
+    "linkedin": ("Searching LinkedIn", lambda query, location: search_linkedin_playwright(query)),
+    "indeed": ("Searching Indeed", lambda query, location: search_indeed_playwright(query)),
+}
+
+# Sources that can stream result pages as they arrive (used by the streaming pipeline)
+SOURCE_PAGE_STREAMS: Dict[str, Callable[[str, str], AsyncIterator[List[Dict[str, Any]]]]] = {
+    "google_jobs": lambda query, location: stream_google_jobs_pages(query, location),
+}
+
+async def _single_page(search: Awaitable[List[Dict[str, Any]]]) -> AsyncIterator[List[Dict[str, Any]]]:
+    yield await search
+
+def source_pages(source: str, query: str, location: str) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Result pages of one source search, served from the shared source cache when enabled."""
+    def fetch() -> AsyncIterator[List[Dict[str, Any]]]:
+        if source in SOURCE_PAGE_STREAMS:
+            return SOURCE_PAGE_STREAMS[source](query, location)
+        return _single_page(SOURCE_SEARCHES[source][1](query, location))
+
+    if not settings.SOURCE_CACHE_ENABLED:
+        return fetch()
+    return source_cache.pages(source, query, location, fetch)
+
+async def search_source(source: str, query: str, location: str) -> List[Dict[str, Any]]:
+    """All results of one source search."""
+    return [job async for page in source_pages(source, query, location) for job in page]
+
+def get_search_params(state: AgentState) -> Tuple[List[str], str, str]:
+    """Return (sources, query string, location) for a scan."""
     run_meta = state.get("run_meta", {})
     sources = run_meta.get("sources_used", [])
     search_query = state.get("search_query", {})
-    
+
     keywords = search_query.get("keywords", [])
     location = search_query.get("location", "Remote")
     query_str = " ".join(keywords)
-    
+    return [source for source in SOURCE_SEARCHES if source in sources], query_str, location
+
+async def scout_node(state: AgentState):
+    print("--- Scout Agent ---")
+    user_id = state.get("user_id", "unknown")
+    run_id = state.get("run_id")
+    await log_step(user_id, "Scout Agent: Starting job search across sources...", run_id=run_id)
+
+    sources, query_str, location = get_search_params(state)
+
     tasks = []
-    
-    if "google_jobs" in sources:
-        await log_step(user_id, "Scout: Searching Google Jobs...", run_id=run_id)
-        tasks.append(search_google_jobs_serpapi(query_str, location))
-        
-    if "yc" in sources:
-        await log_step(user_id, "Scout: Fetching YC Jobs...", run_id=run_id)
-        tasks.append(fetch_yc_jobs(query_str))
-        
-    if "wellfound" in sources:
-        await log_step(user_id, "Scout: Fetching Wellfound Jobs...", run_id=run_id)
-        tasks.append(fetch_wellfound_jobs(query_str))
-        
-    if "linkedin" in sources:
-        await log_step(user_id, "Scout: Searching LinkedIn...", run_id=run_id)
-        tasks.append(search_linkedin_playwright(query_str))
-        
-    if "indeed" in sources:
-        await log_step(user_id, "Scout: Searching Indeed...", run_id=run_id)
-        tasks.append(search_indeed_playwright(query_str))
-        
+    for source in sources:
+        label, _ = SOURCE_SEARCHES[source]
+        await log_step(user_id, f"Scout: {label}...", run_id=run_id, verbose=True)
+        tasks.append(search_source(source, query_str, location))
+
     results = await asyncio.gather(*tasks)
-    
+
     # Flatten results
     raw_jobs = []
     for result_list in results:
         raw_jobs.extend(result_list)
-        
+
     print(f"Scout found {len(raw_jobs)} raw jobs.")
     await log_step(user_id, f"Scout: Found {len(raw_jobs)} raw jobs.", run_id=run_id)
-    
+
     return {"raw_jobs": raw_jobs}
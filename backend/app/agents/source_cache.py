@@ -0,0 +1,197 @@
+"""
+Cross-user cache of raw scout results.
+Results are keyed by the normalized (source, query, location) and stored page by page,
+in memory and in Mongo. A fresh entry is served as is; an entry past its source's TTL
+but inside the stale window is served immediately while one background task refetches
+it (stale-while-revalidate). Empty or failed fetches are never cached.
+"""
+import asyncio
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+from backend.app.db.mongo import db
+from backend.app.db.repositories.source_cache_repository import SourceCacheRepository
+from backend.core.config import settings
+
+Page = List[Dict[str, Any]]
+
+
+def normalize_query(query: str) -> str:
+    """Case, spacing and keyword order do not change what a source returns"""
+    return " ".join(sorted(set(query.lower().split())))
+
+
+def make_search_key(source: str, query: str, location: str) -> str:
+    payload = json.dumps([source, normalize_query(query), " ".join((location or "").lower().split())])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SourceResultCache:
+    def __init__(
+        self,
+        ttl_seconds: Dict[str, int],
+        default_ttl_seconds: int,
+        stale_seconds: int,
+        max_entries: int = 256,
+        persist: bool = True,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.default_ttl_seconds = default_ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.persist = persist
+
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_failures": 0}
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "memory_size": len(self._memory),
+            "refreshing": len(self._refreshing),
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Drop the in-memory tier (the persistent tier is left untouched)."""
+        self._memory.clear()
+
+    def ttl_for(self, source: str) -> int:
+        return self.ttl_seconds.get(source, self.default_ttl_seconds)
+
+    async def pages(
+        self,
+        source: str,
+        query: str,
+        location: str,
+        fetch: Callable[[], AsyncIterator[Page]],
+    ) -> AsyncIterator[Page]:
+        """
+        Yield the result pages of a search, from the cache when possible.
+        On a miss the pages from fetch() are passed through as they arrive and cached
+        once the search completes.
+        """
+        key = make_search_key(source, query, location)
+        entry = await self._lookup(key)
+        if entry is not None:
+            self._stats["hits"] += 1
+            if entry["fresh_until"] <= datetime.utcnow():
+                self._stats["stale_hits"] += 1
+                self._revalidate(key, source, fetch)
+            for page in entry["pages"]:
+                # Downstream stages may modify raw jobs; keep the shared copy intact
+                yield copy.deepcopy(page)
+            return
+
+        self._stats["misses"] += 1
+        pages: List[Page] = []
+        async for page in fetch():
+            pages.append(copy.deepcopy(page))
+            yield page
+        await self._store(key, source, pages)
+
+    async def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry["expires_at"] > datetime.utcnow():
+                self._memory.move_to_end(key)
+                return entry
+            del self._memory[key]
+
+        entry = await self._persistent_get(key)
+        if entry is not None:
+            self._memory_set(key, entry)
+        return entry
+
+    def _revalidate(self, key: str, source: str, fetch: Callable[[], AsyncIterator[Page]]):
+        """Refetch a stale search in the background, once per key at a time"""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        self._stats["refreshes"] += 1
+
+        async def refresh():
+            try:
+                await self._store(key, source, [page async for page in fetch()])
+            except Exception as e:
+                self._stats["refresh_failures"] += 1
+                print(f"Source cache refresh failed for {source}: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _store(self, key: str, source: str, pages: List[Page]):
+        if not any(pages):
+            return
+        now = datetime.utcnow()
+        fresh_until = now + timedelta(seconds=self.ttl_for(source))
+        entry = {
+            "source": source,
+            "fetched_at": now,
+            "fresh_until": fresh_until,
+            "expires_at": fresh_until + timedelta(seconds=self.stale_seconds),
+        }
+        self._memory_set(key, {**entry, "pages": pages})
+        await self._persistent_set(key, entry, pages)
+
+    def _memory_set(self, key: str, entry: Dict[str, Any]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _get_repository(self) -> Optional[SourceCacheRepository]:
+        if not self.persist or db.client is None:
+            return None
+        return SourceCacheRepository(db.get_db())
+
+    async def _persistent_get(self, key: str) -> Optional[Dict[str, Any]]:
+        repo = self._get_repository()
+        if repo is None:
+            return None
+        try:
+            docs = await repo.get_pages(key)
+        except Exception as e:
+            print(f"Source cache read failed: {e}")
+            return None
+        # Only a complete set of pages from the same fetch counts as a hit
+        if not docs or len(docs) != docs[0]["page_count"]:
+            return None
+        if any(doc["fetched_at"] != docs[0]["fetched_at"] for doc in docs):
+            return None
+        first = docs[0]
+        return {
+            "source": first["source"],
+            "fetched_at": first["fetched_at"],
+            "fresh_until": first["fresh_until"],
+            "expires_at": first["expires_at"],
+            "pages": [doc["jobs"] for doc in docs],
+        }
+
+    async def _persistent_set(self, key: str, entry: Dict[str, Any], pages: List[Page]):
+        repo = self._get_repository()
+        if repo is None:
+            return
+        try:
+            await repo.set_pages(key, entry, pages)
+        except Exception as e:
+            print(f"Source cache write failed: {e}")
+
+
+source_cache = SourceResultCache(
+    ttl_seconds=settings.SOURCE_CACHE_TTL_SECONDS,
+    default_ttl_seconds=settings.SOURCE_CACHE_DEFAULT_TTL_SECONDS,
+    stale_seconds=settings.SOURCE_CACHE_STALE_SECONDS,
+    max_entries=settings.SOURCE_CACHE_MEMORY_MAX_ENTRIES,
+    persist=settings.SOURCE_CACHE_PERSIST,
+)
@@ -1,7 +1,7 @@
 import json
-import os
 from backend.app.agents.graph import AgentState
 from backend.app.agents.llm_client import llm_client
+from backend.app.agents.prompt_registry import render_supervisor
 from backend.app.utils.timeline import log_step
 
 async def supervisor_node(state: AgentState):
@@ -12,12 +12,7 @@ async def supervisor_node(state: AgentState):
     
     user_profile = state.get("user_profile", {})
     
-    # Load prompt
-    prompt_path = os.path.join(os.path.dirname(__file__), "prompts", "supervisor.txt")
-    with open(prompt_path, "r") as f:
-        system_prompt_template = f.read()
-        
-    system_prompt = system_prompt_template.format(user_profile=json.dumps(user_profile, indent=2))
+    system_prompt = render_supervisor(user_profile=json.dumps(user_profile, indent=2))
     
     # Generate configuration
     response = await llm_client.generate_json(
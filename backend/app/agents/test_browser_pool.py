@@ -0,0 +1,73 @@
+from pathlib import Path
+import sys
+from unittest import IsolatedAsyncioTestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.agents.browser_pool import BrowserPool
+
+
+class FakePage:
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def new_page(self):
+        return FakePage()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeBrowserPool(BrowserPool):
+    async def _launch_browser(self):
+        return FakeBrowser()
+
+
+class BrowserPoolTest(IsolatedAsyncioTestCase):
+    async def test_reuses_context_until_page_limit(self):
+        pool = FakeBrowserPool(size=2, max_pages_per_context=2)
+        for _ in range(3):
+            async with pool.page():
+                pass
+        self.assertEqual(pool.launches, 1)
+        self.assertEqual(len(pool._browser.contexts), 2)
+        self.assertTrue(pool._browser.contexts[0].closed)
+
+    async def test_failed_scrape_recycles_context(self):
+        pool = FakeBrowserPool(size=1, max_pages_per_context=10)
+        with self.assertRaises(TimeoutError):
+            async with pool.page():
+                raise TimeoutError("page.goto timed out")
+        self.assertEqual(pool.get_stats()["idle_contexts"], 0)
+        self.assertTrue(pool._browser.contexts[0].closed)
+
+    async def test_relaunches_disconnected_browser(self):
+        pool = FakeBrowserPool(size=1, max_pages_per_context=10)
+        async with pool.page():
+            pass
+        pool._browser.connected = False
+        async with pool.page():
+            pass
+        self.assertEqual(pool.launches, 2)
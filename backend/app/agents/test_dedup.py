@@ -0,0 +1,18 @@
+from pathlib import Path
+import sys
+from unittest import TestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.agents.dedup import BloomFilter
+
+
+class BloomFilterTest(TestCase):
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(1000, 0.01)
+        for idx in range(1000):
+            bloom.add(f"stored-{idx}")
+
+        self.assertTrue(all(f"stored-{idx}" in bloom for idx in range(1000)))
+        false_positives = sum(f"other-{idx}" in bloom for idx in range(10000))
+        self.assertLess(false_positives, 300)
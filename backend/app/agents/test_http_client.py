@@ -0,0 +1,38 @@
+from pathlib import Path
+import sys
+from unittest import TestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.agents.http_client import ConditionalGetStore
+
+
+class ConditionalGetStoreTest(TestCase):
+    def test_validators_become_request_headers(self):
+        store = ConditionalGetStore(max_entries=10)
+        store.store("u", '"v1"', "Mon, 01 Jan 2024 00:00:00 GMT", ["job"])
+
+        self.assertEqual(store.request_headers("u"), {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        })
+        self.assertEqual(store.get_parsed("u"), ["job"])
+
+    def test_response_without_validators_is_not_kept(self):
+        store = ConditionalGetStore(max_entries=10)
+        store.store("u", '"v1"', None, ["old"])
+        store.store("u", None, None, ["new"])
+
+        self.assertEqual(store.request_headers("u"), {})
+        self.assertIsNone(store.get_parsed("u"))
+
+    def test_least_recently_used_url_is_evicted(self):
+        store = ConditionalGetStore(max_entries=2)
+        store.store("a", '"a"', None, 1)
+        store.store("b", '"b"', None, 2)
+        store.get_parsed("a")
+        store.store("c", '"c"', None, 3)
+
+        self.assertIsNone(store.get_parsed("b"))
+        self.assertEqual(store.get_parsed("a"), 1)
+        self.assertEqual(store.get_parsed("c"), 3)
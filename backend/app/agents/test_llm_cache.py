@@ -0,0 +1,64 @@
+from pathlib import Path
+import asyncio
+import sys
+from unittest import IsolatedAsyncioTestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.agents.llm_cache import LLMResponseCache, make_cache_key
+
+
+class LLMResponseCacheTest(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cache = LLMResponseCache(max_entries=2, ttl_seconds=60, persist=False)
+        self.calls = 0
+
+    async def _compute(self, value: str = "response", delay: float = 0.0):
+        self.calls += 1
+        if delay:
+            await asyncio.sleep(delay)
+        return value
+
+    async def test_second_lookup_is_served_from_memory(self):
+        first = await self.cache.get_or_compute("k", self._compute)
+        second = await self.cache.get_or_compute("k", self._compute)
+        self.assertEqual((first, second), ("response", "response"))
+        self.assertEqual(self.calls, 1)
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    async def test_concurrent_identical_requests_share_one_call(self):
+        results = await asyncio.gather(
+            *[self.cache.get_or_compute("k", lambda: self._compute(delay=0.01)) for _ in range(5)]
+        )
+        self.assertEqual(results, ["response"] * 5)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.cache.get_stats()["coalesced"], 4)
+
+    async def test_lru_evicts_least_recently_used(self):
+        await self.cache.get_or_compute("a", lambda: self._compute("a"))
+        await self.cache.get_or_compute("b", lambda: self._compute("b"))
+        await self.cache.get_or_compute("a", lambda: self._compute("a"))
+        await self.cache.get_or_compute("c", lambda: self._compute("c"))
+        await self.cache.get_or_compute("b", lambda: self._compute("b"))
+        self.assertEqual(self.calls, 4)
+        self.assertEqual(self.cache.get_stats()["evictions"], 2)
+
+    async def test_expired_entries_are_recomputed(self):
+        cache = LLMResponseCache(ttl_seconds=0, persist=False)
+        await cache.get_or_compute("k", self._compute)
+        await cache.get_or_compute("k", self._compute)
+        self.assertEqual(self.calls, 2)
+
+    async def test_errors_propagate_and_are_not_cached(self):
+        async def fail():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            await self.cache.get_or_compute("k", fail)
+        self.assertEqual(await self.cache.get_or_compute("k", self._compute), "response")
+
+    def test_cache_key_depends_on_response_format(self):
+        plain = make_cache_key("m", "sys", "prompt")
+        as_json = make_cache_key("m", "sys", "prompt", {"type": "json_object"})
+        self.assertNotEqual(plain, as_json)
@@ -0,0 +1,76 @@
+from pathlib import Path
+import asyncio
+import json
+import sys
+from unittest import TestCase
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.agents.llm_client import llm_client
+from backend.app.agents.matcher import match_job_batch
+from backend.app.db.models import Job, JobMetadata
+
+SINGLE_SCORE = 0.5
+
+
+def make_job(title: str) -> Job:
+    return Job(_id=title, source="google_jobs", title=title, metadata=JobMetadata(fingerprint=title))
+
+
+def match(job_id: str, score=0.9, missing_skills=None) -> dict:
+    return {"job_id": job_id, "match_score": score, "match_reasoning": "ok", "missing_skills": missing_skills or []}
+
+
+class MatchJobBatchTest(TestCase):
+    def run_batch(self, jobs, batch_response: str):
+        """Score jobs with a canned batch response; returns the titles scored one at a time"""
+        single_titles = []
+
+        async def generate_json(prompt, system_message, use_cache=True):
+            if prompt.startswith("Evaluate these"):
+                return batch_response
+            single_titles.extend(job.title for job in jobs if f'"title":"{job.title}"' in system_message)
+            return json.dumps({"match_score": SINGLE_SCORE, "match_reasoning": "single", "missing_skills": []})
+
+        with patch.object(llm_client, "generate_json", generate_json):
+            scored = asyncio.run(match_job_batch(jobs, {"skills": ["Python"]}))
+        return scored, single_titles
+
+    def test_items_are_applied_by_id_in_any_order(self):
+        jobs = [make_job("a"), make_job("b"), make_job("c")]
+        response = json.dumps({"matches": [match("j2", 0.3), match("j0", 0.9), match("j1", 0.6, ["Go"])]})
+
+        scored, single_titles = self.run_batch(jobs, response)
+
+        self.assertEqual([job.match_score for job in scored], [0.9, 0.6, 0.3])
+        self.assertEqual(scored[1].missing_skills, ["Go"])
+        self.assertEqual(single_titles, [])
+
+    def test_only_bad_or_missing_items_are_retried_singly(self):
+        jobs = [make_job(title) for title in ("ok", "range", "nan", "skills", "missing", "dup")]
+        response = json.dumps({"matches": [
+            match("j0", 0.8),
+            match("j1", 1.5),
+            match("j2", "high"),
+            match("j3", 0.7, "Go"),
+            match("j5", 0.4),
+            match("j5", 0.9),  # Duplicate id: the first well-formed item wins
+            match("j9", 0.9),  # Unknown id
+        ]})
+
+        scored, single_titles = self.run_batch(jobs, response)
+
+        self.assertEqual(sorted(single_titles), ["missing", "nan", "range", "skills"])
+        self.assertEqual(
+            [job.match_score for job in scored],
+            [0.8, SINGLE_SCORE, SINGLE_SCORE, SINGLE_SCORE, SINGLE_SCORE, 0.4],
+        )
+
+    def test_unparseable_response_scores_every_job_singly(self):
+        jobs = [make_job("a"), make_job("b")]
+
+        scored, single_titles = self.run_batch(jobs, "not json")
+
+        self.assertEqual(sorted(single_titles), ["a", "b"])
+        self.assertEqual([job.match_score for job in scored], [SINGLE_SCORE, SINGLE_SCORE])
@@ -0,0 +1,56 @@
+from pathlib import Path
+import sys
+from unittest import TestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.agents.normalization_utils import map_structured_job, parse_salary
+
+
+class ParseSalaryTest(TestCase):
+    def test_range_with_repeated_currency(self):
+        self.assertEqual(
+            parse_salary("$100k-$150k per year"),
+            {"min": 100000.0, "max": 150000.0, "currency": "$", "interval": "year"},
+        )
+
+    def test_serpapi_interval_wording(self):
+        self.assertEqual(parse_salary("$25 an hour")["interval"], "hour")
+
+
+class MapStructuredJobTest(TestCase):
+    def setUp(self):
+        self.raw_job = {
+            "id": "abc",
+            "title": "Senior Python Engineer",
+            "company": "Acme Inc.",
+            "location": "Remote, US",
+            "description": "FastAPI and AWS experience required.",
+            "via": "Google Jobs",
+            "listing_url": "https://example.com/job/abc",
+            "apply_url": None,
+            "salary": "$100k-$150k per year",
+            "posted_at": "2 days ago",
+            "employment_type": "Full-time",
+        }
+
+    def test_maps_google_jobs_record(self):
+        job = map_structured_job(self.raw_job, "google_jobs")
+        self.assertEqual(job["source_id"], "abc")
+        self.assertTrue(job["remote"])
+        self.assertEqual(job["employment_type"], "full-time")
+        self.assertEqual(job["salary"]["currency"], "USD")
+        self.assertIsNotNone(job["posted_at"])
+        self.assertIn("python", job["tags"])
+        self.assertIn("FastAPI", job["skills_extracted"])
+
+    def test_placeholder_values_fall_back_to_llm(self):
+        self.raw_job["company"] = "Unknown"
+        self.assertIsNone(map_structured_job(self.raw_job, "linkedin"))
+
+    def test_missing_urls_fall_back_to_llm(self):
+        self.raw_job["listing_url"] = ""
+        self.assertIsNone(map_structured_job(self.raw_job, "google_jobs"))
+
+    def test_unmapped_source_falls_back_to_llm(self):
+        self.assertIsNone(map_structured_job(self.raw_job, "yc"))
@@ -0,0 +1,69 @@
+from pathlib import Path
+import json
+import sys
+from unittest import TestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.agents.normalizer import align_normalized_jobs, plan_batches
+from backend.app.agents.rate_limiter import estimate_tokens
+
+
+def raw_job(job_id: str, description: str = "") -> dict:
+    return {"id": job_id, "title": f"Engineer {job_id}", "company": "Acme", "description": description}
+
+
+def job_tokens(job: dict) -> int:
+    return estimate_tokens(json.dumps(job, default=str))
+
+
+class AlignNormalizedJobsTest(TestCase):
+    def test_pairs_outputs_by_ref_in_any_order(self):
+        outputs = [{"ref": "r2", "title": "c"}, {"ref": "r0", "title": "a"}, {"ref": "r1", "title": "b"}]
+        self.assertEqual(
+            [(idx, job["title"]) for idx, job in align_normalized_jobs(outputs, 3)],
+            [(2, "c"), (0, "a"), (1, "b")],
+        )
+
+    def test_duplicate_and_out_of_range_refs_are_dropped(self):
+        outputs = [
+            {"ref": "r0", "title": "first"},
+            {"ref": "r0", "title": "duplicate"},
+            {"ref": "r3", "title": "out of range"},
+            {"ref": "x1", "title": "malformed"},
+            {"ref": "r1", "title": "second"},
+        ]
+        self.assertEqual(
+            [(idx, job["title"]) for idx, job in align_normalized_jobs(outputs, 2)],
+            [(0, "first"), (1, "second")],
+        )
+
+    def test_missing_refs_leave_their_raw_jobs_unaligned(self):
+        outputs = [{"ref": "r1", "title": "b"}, {"title": "no ref"}, "not a job"]
+        self.assertEqual(align_normalized_jobs(outputs, 3), [(1, {"ref": "r1", "title": "b"})])
+
+    def test_positional_fallback_only_when_no_refs_and_counts_match(self):
+        outputs = [{"title": "a"}, {"title": "b"}]
+        self.assertEqual(align_normalized_jobs(outputs, 2), [(0, outputs[0]), (1, outputs[1])])
+        # A dropped output would shift every later pairing, so nothing is trusted
+        self.assertEqual(align_normalized_jobs(outputs, 3), [])
+
+
+class PlanBatchesTest(TestCase):
+    def test_splits_on_token_budget(self):
+        raw_jobs = [raw_job(str(idx), "x" * 200) for idx in range(4)]
+        budget = job_tokens(raw_jobs[0]) * 2
+        self.assertEqual(plan_batches(raw_jobs, budget, 10), [[0, 1], [2, 3]])
+
+    def test_splits_on_max_batch_size(self):
+        raw_jobs = [raw_job(str(idx)) for idx in range(5)]
+        self.assertEqual(plan_batches(raw_jobs, 100000, 2), [[0, 1], [2, 3], [4]])
+
+    def test_job_over_budget_gets_its_own_batch(self):
+        raw_jobs = [raw_job("0"), raw_job("1", "x" * 500), raw_job("2")]
+        budget = job_tokens(raw_jobs[0]) * 2
+        self.assertGreater(job_tokens(raw_jobs[1]), budget)
+        self.assertEqual(plan_batches(raw_jobs, budget, 10), [[0], [1], [2]])
+
+    def test_empty_input(self):
+        self.assertEqual(plan_batches([], 1000, 5), [])
@@ -0,0 +1,55 @@
+from pathlib import Path
+import sys
+from unittest import TestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.agents.prefilter import prefilter_jobs, score_jobs, tokenize
+from backend.app.db.models import Job, JobMetadata
+
+
+def make_job(job_id: str, title: str, skills=None, tags=None, remote=False, location=None) -> Job:
+    return Job(
+        _id=job_id,
+        source="google_jobs",
+        title=title,
+        skills_extracted=skills or [],
+        tags=tags or [],
+        remote=remote,
+        location=location,
+        metadata=JobMetadata(fingerprint=job_id),
+    )
+
+
+class PrefilterTest(TestCase):
+    def setUp(self):
+        self.profile = {
+            "skills": ["Python", "FastAPI", "MongoDB"],
+            "keywords": ["Backend Engineer"],
+            "preferences": {"location": "Remote"},
+        }
+        self.jobs = [
+            make_job("nurse", "Registered Nurse", tags=["healthcare"], location="Austin, TX"),
+            make_job("backend", "Senior Backend Engineer", skills=["Python", "FastAPI"], tags=["python"], remote=True),
+            make_job("frontend", "Frontend Engineer", skills=["React"], tags=["javascript"]),
+        ]
+
+    def test_tokenize_keeps_language_symbols(self):
+        self.assertEqual(tokenize(["C++ and C#", "Node.js."]), {"c++", "c#", "node.js"})
+
+    def test_relevant_jobs_score_higher(self):
+        scores = score_jobs(self.jobs, self.profile)
+        self.assertGreater(scores[1], scores[2])
+        self.assertGreater(scores[2], scores[0])
+        self.assertTrue(all(0.0 <= s <= 1.0 for s in scores))
+
+    def test_prefilter_applies_floor_and_top_k(self):
+        kept, dropped = prefilter_jobs(self.jobs, self.profile, min_score=0.05, top_k=1)
+        self.assertEqual([job.id for job in kept], ["backend"])
+        self.assertEqual({job.id for job in dropped}, {"nurse", "frontend"})
+        self.assertTrue(all(job.pre_score is not None for job in self.jobs))
+
+    def test_empty_profile_keeps_everything(self):
+        kept, dropped = prefilter_jobs(self.jobs, {"skills": []}, min_score=0.5)
+        self.assertEqual(len(kept), 3)
+        self.assertEqual(dropped, [])
@@ -0,0 +1,29 @@
+from pathlib import Path
+import sys
+from unittest import TestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.agents.prompt_registry import PROMPT_FIELDS, PROMPTS_DIR, PromptRegistry, PromptTemplate
+
+
+class PromptTemplateTest(TestCase):
+    def test_render_matches_str_format(self):
+        text = 'Profile:\n{user_profile}\nReturn {{"score": 0}} for {job_details}.'
+        template = PromptTemplate("matcher", text, ("user_profile", "job_details"))
+
+        rendered = template.render(user_profile='{"skills": []}', job_details="a {job}")
+
+        self.assertEqual(rendered, text.format(user_profile='{"skills": []}', job_details="a {job}"))
+        self.assertEqual(template.get_stats()["renders"], 1)
+
+    def test_rejects_unknown_and_missing_placeholders(self):
+        with self.assertRaises(ValueError):
+            PromptTemplate("outreach", "{user_profile} {job}", ("user_profile", "job_details"))
+        with self.assertRaises(ValueError):
+            PromptTemplate("outreach", "{user_profile}", ("user_profile", "job_details"))
+
+    def test_shipped_prompts_are_valid(self):
+        registry = PromptRegistry(PROMPTS_DIR, PROMPT_FIELDS)
+        registry.load()
+        self.assertEqual(set(registry.get_stats()), set(PROMPT_FIELDS))
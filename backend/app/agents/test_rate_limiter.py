@@ -0,0 +1,64 @@
+from pathlib import Path
+import sys
+import time
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.agents.rate_limiter import RateGovernor, TokenBucket, estimate_tokens, parse_reset_duration
+
+
+class ParseResetDurationTest(TestCase):
+    def test_parses_provider_formats(self):
+        self.assertAlmostEqual(parse_reset_duration("2m59.56s"), 179.56)
+        self.assertAlmostEqual(parse_reset_duration("7.66s"), 7.66)
+        self.assertAlmostEqual(parse_reset_duration("250ms"), 0.25)
+        self.assertAlmostEqual(parse_reset_duration("1h"), 3600)
+        self.assertEqual(parse_reset_duration("12"), 12.0)
+        self.assertIsNone(parse_reset_duration(""))
+        self.assertIsNone(parse_reset_duration("soon"))
+
+    def test_estimate_tokens(self):
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("a" * 400), 101)
+
+
+class TokenBucketTest(TestCase):
+    def test_wait_time_reflects_deficit(self):
+        bucket = TokenBucket(capacity=10, refill_per_second=10)
+        bucket.consume(10)
+        self.assertGreater(bucket.wait_time(5), 0.4)
+        self.assertLessEqual(bucket.wait_time(5), 0.5)
+
+    def test_sync_caps_level_at_reported_remaining(self):
+        bucket = TokenBucket(capacity=100, refill_per_second=1)
+        bucket.sync(3)
+        self.assertLess(bucket.level, 4)
+
+
+class RateGovernorTest(IsolatedAsyncioTestCase):
+    async def test_acquire_within_budget_does_not_wait(self):
+        governor = RateGovernor(requests_per_minute=60, tokens_per_minute=6000, jitter_seconds=0)
+        start = time.monotonic()
+        for _ in range(5):
+            await governor.acquire(100)
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual(governor.get_stats()["throttled"], 0)
+
+    async def test_acquire_waits_when_request_budget_is_spent(self):
+        governor = RateGovernor(requests_per_minute=600, tokens_per_minute=600000, jitter_seconds=0)
+        governor.requests.consume(governor.requests.level)
+        start = time.monotonic()
+        await governor.acquire(1)
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+        self.assertEqual(governor.get_stats()["throttled"], 1)
+
+    async def test_exhausted_headers_block_until_reset(self):
+        governor = RateGovernor(requests_per_minute=600, tokens_per_minute=600000, jitter_seconds=0)
+        governor.update_from_headers({
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "150ms",
+        })
+        start = time.monotonic()
+        await governor.acquire(1)
+        self.assertGreaterEqual(time.monotonic() - start, 0.14)
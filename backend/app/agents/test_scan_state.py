@@ -0,0 +1,68 @@
+from pathlib import Path
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.agents.normalization_utils import generate_raw_key
+from backend.app.agents.scan_state import IncrementalScanState, SearchWatermark, seen_id
+from backend.app.db.models import Job, JobMetadata
+
+
+def raw_job(job_id: str, posted_at: str = "") -> dict:
+    return {"id": job_id, "title": f"Engineer {job_id}", "company": "Acme", "via": "Google Jobs", "posted_at": posted_at}
+
+
+class SearchWatermarkTest(TestCase):
+    def test_drops_seen_and_old_postings(self):
+        seen = seen_id(generate_raw_key(raw_job("1"), "google_jobs"))
+        watermark = SearchWatermark("google_jobs", "key", {
+            "posted_at_mark": datetime.utcnow() - timedelta(days=1),
+            "seen_ids": [seen],
+        })
+        slack = timedelta(hours=24)
+
+        self.assertFalse(watermark.is_new(raw_job("1", "1 day ago"), slack))
+        self.assertFalse(watermark.is_new(raw_job("2", "5 days ago"), slack))
+        # Inside the slack only the seen ids decide
+        self.assertTrue(watermark.is_new(raw_job("3", "1 day ago"), slack))
+        self.assertTrue(watermark.is_new(raw_job("4"), slack))
+        self.assertFalse(watermark.is_new(raw_job("4"), slack))
+        self.assertEqual(len(watermark.new_ids), 2)
+
+
+class FakeScanStateRepository:
+    def __init__(self):
+        self.saved = []
+
+    async def get_state(self, user_id, search_key):
+        return None
+
+    async def save_states(self, user_id, states, max_seen_ids):
+        self.saved.extend(states)
+
+
+class IncrementalScanStateTest(TestCase):
+    def test_commit_only_saves_processed_postings(self):
+        repo = FakeScanStateRepository()
+        scan_state = IncrementalScanState("user", repo)
+        raw_jobs = [raw_job("1", "1 day ago"), raw_job("2", "1 day ago")]
+
+        async def scan():
+            watermark = await scan_state.watermark("google_jobs", "engineer", "remote")
+            scan_state.filter(watermark, raw_jobs)
+            # Only the first posting was scored; the second failed normalization
+            scored = Job(
+                _id="1", source="google_jobs", title="Engineer 1",
+                metadata=JobMetadata(fingerprint="1", raw_key=generate_raw_key(raw_jobs[0], "google_jobs")),
+            )
+            scan_state.mark_processed([scored])
+            await scan_state.commit()
+
+        asyncio.run(scan())
+        self.assertEqual(len(repo.saved), 1)
+        self.assertEqual(repo.saved[0]["seen_ids"], [seen_id(generate_raw_key(raw_jobs[0], "google_jobs"))])
+        # The unprocessed posting must not be dropped on its date next time
+        self.assertIsNone(repo.saved[0]["posted_at_mark"])
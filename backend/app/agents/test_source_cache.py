@@ -0,0 +1,59 @@
+from pathlib import Path
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from unittest import IsolatedAsyncioTestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.agents.source_cache import SourceResultCache, make_search_key
+
+
+class SourceResultCacheTest(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cache = SourceResultCache(
+            ttl_seconds={"google_jobs": 60}, default_ttl_seconds=30, stale_seconds=60, persist=False
+        )
+        self.fetches = 0
+
+    def _fetch(self, pages):
+        async def fetch():
+            self.fetches += 1
+            for page in pages:
+                yield page
+        return fetch
+
+    async def _search(self, pages, query="python remote"):
+        return [page async for page in self.cache.pages("google_jobs", query, "Remote", self._fetch(pages))]
+
+    async def test_second_search_is_served_from_cache(self):
+        first = await self._search([[{"title": "a"}], [{"title": "b"}]])
+        second = await self._search([[{"title": "other"}]], query="Remote  PYTHON")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.fetches, 1)
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+
+    async def test_cached_jobs_are_copies(self):
+        pages = await self._search([[{"title": "a"}]])
+        pages[0][0]["title"] = "changed"
+
+        self.assertEqual(await self._search([]), [[{"title": "a"}]])
+
+    async def test_empty_results_are_not_cached(self):
+        await self._search([[]])
+        await self._search([[]])
+
+        self.assertEqual(self.fetches, 2)
+
+    async def test_stale_entry_is_served_and_refreshed_once(self):
+        await self._search([[{"title": "old"}]])
+        entry = self.cache._memory[make_search_key("google_jobs", "python remote", "Remote")]
+        entry["fresh_until"] = datetime.utcnow() - timedelta(seconds=1)
+
+        results = await asyncio.gather(*[self._search([[{"title": "new"}]]) for _ in range(3)])
+        await asyncio.gather(*self.cache._tasks)
+
+        self.assertEqual(results, [[[{"title": "old"}]]] * 3)
+        self.assertEqual(self.fetches, 2)
+        self.assertEqual(await self._search([]), [[{"title": "new"}]])
@@ -2,128 +2,176 @@
 Real job scraping implementations using SerpAPI, BeautifulSoup, and Playwright.
 """
 import asyncio
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any
 import os
-from serpapi import Client
 from bs4 import BeautifulSoup
-import aiohttp
 from backend.core.config import settings
 from backend.app.agents.scraper_utils import retry_async
+from backend.app.agents.browser_pool import browser_pool
+from backend.app.agents.http_client import get_http_session, fetch_parsed
+
+
+SERPAPI_SEARCH_URL = "https://serpapi.com/search.json"
+
+
+def _enrich_google_job(job: Dict[str, Any], location: str) -> Dict[str, Any]:
+    """Extract listing_url, apply_url, source_id, company_logo, salary, description."""
+    # Extract URLs
+    apply_options = job.get("apply_options", [])
+    apply_url = apply_options[0].get("link") if apply_options else None
+    listing_url = job.get("share_link") or job.get("link")
+    
+    # Extract salary from detected_extensions
+    extensions = job.get("detected_extensions", {})
+    salary_str = extensions.get("salary", "")
+    posted_at_str = extensions.get("posted_at", extensions.get("posted", ""))
+    employment_type = extensions.get("schedule_type", "")
+    
+    return {
+        "id": job.get("job_id", ""),
+        "title": job.get("title", ""),
+        "company": job.get("company_name", ""),
+        "company_logo": job.get("thumbnail", ""),
+        "location": job.get("location", location),
+        "description": job.get("description", ""),
+        "via": "Google Jobs",
+        "listing_url": listing_url,
+        "apply_url": apply_url,
+        "salary": salary_str,
+        "posted_at": posted_at_str,
+        "employment_type": employment_type,
+        "extensions": job.get("extensions", [])
+    }
+
+
+async def _fetch_serpapi_page(params: Dict[str, Any], attempts: int = 2) -> Dict[str, Any]:
+    """One SerpAPI request over the shared HTTP session, retried once on failure."""
+    session = await get_http_session()
+    delay = 1.0
+    for attempt in range(attempts):
+        try:
+            async with session.get(SERPAPI_SEARCH_URL, params=params) as response:
+                data = await response.json(content_type=None)
+                if response.status != 200 or data.get("error"):
+                    raise RuntimeError(data.get("error") or f"status {response.status}")
+                return data
+        except Exception as e:
+            if attempt == attempts - 1:
+                raise
+            print(f"Attempt {attempt + 1}/{attempts} failed for SerpAPI page: {str(e)}")
+            await asyncio.sleep(delay)
+            delay *= 2
+    return {}
+
+
+async def stream_google_jobs_pages(query: str, location: str, max_pages: int = None) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Search Google Jobs using SerpAPI and yield each page of enriched jobs as it arrives.
+    Follows next_page_token up to max_pages (GOOGLE_JOBS_MAX_PAGES by default). The next
+    page is requested as soon as its token is known, while the caller handles this one.
+    """
+    if not settings.SERPAPI_API_KEY:
+        print("Warning: SERPAPI_API_KEY not set, returning empty results")
+        return
+
+    max_pages = max_pages or settings.GOOGLE_JOBS_MAX_PAGES
+    params = {
+        "engine": "google_jobs",
+        "q": query,
+        "location": location,
+        "hl": "en",
+        "gl": "us",
+        "api_key": settings.SERPAPI_API_KEY,
+    }
+
+    total = 0
+    next_page = asyncio.ensure_future(_fetch_serpapi_page(params))
+    try:
+        for page_number in range(1, max_pages + 1):
+            try:
+                results = await next_page
+            except Exception as e:
+                print(f"Error in search_google_jobs_serpapi (page {page_number}): {str(e)}")
+                break
+            next_page = None
+
+            token = (results.get("serpapi_pagination") or {}).get("next_page_token")
+            if token and page_number < max_pages:
+                next_page = asyncio.ensure_future(_fetch_serpapi_page({**params, "next_page_token": token}))
+
+            jobs = [_enrich_google_job(job, location) for job in results.get("jobs_results", [])]
+            total += len(jobs)
+            if jobs:
+                yield jobs
+            if next_page is None:
+                break
+    finally:
+        if next_page is not None and not next_page.done():
+            next_page.cancel()
+
+    print(f"✓ SerpAPI found {total} jobs for '{query}' in '{location}'")
 
 
-@retry_async(max_attempts=2, delay=1.0)
 async def search_google_jobs_serpapi(query: str, location: str) -> List[Dict[str, Any]]:
     """
     Search Google Jobs using SerpAPI.
     Extracts: listing_url, apply_url, source_id, company_logo, salary, description.
     """
-    try:
-        if not settings.SERPAPI_API_KEY:
-            print("Warning: SERPAPI_API_KEY not set, returning empty results")
-            return []
-        
-        # Create SerpAPI client
-        client = Client(api_key=settings.SERPAPI_API_KEY)
-        
-        # Execute search
-        results = client.search({
-            "engine": "google_jobs",
-            "q": query,
-            "location": location,
-            "hl": "en",
-            "gl": "us"
-        })
-        
-        # Extract jobs from response
-        jobs = results.get("jobs_results", [])
-        
-        # Extract enriched job data
-        enriched_jobs = []
-        for job in jobs:
-            # Extract URLs
-            apply_options = job.get("apply_options", [])
-            apply_url = apply_options[0].get("link") if apply_options else None
-            listing_url = job.get("share_link") or job.get("link")
-            
-            # Extract salary from detected_extensions
-            extensions = job.get("detected_extensions", {})
-            salary_str = extensions.get("salary", "")
-            posted_at_str = extensions.get("posted_at", extensions.get("posted", ""))
-            employment_type = extensions.get("schedule_type", "")
+    jobs = []
+    async for page in stream_google_jobs_pages(query, location):
+        jobs.extend(page)
+    return jobs
+
+
+YC_JOBS_URL = "https://www.ycombinator.com/jobs"
+
+
+def _parse_yc_listings(html: str) -> List[Dict[str, Any]]:
+    """Job listings on the YC jobs page, independent of the search query."""
+    soup = BeautifulSoup(html, 'lxml')
+    listings = []
+    
+    # Find job listings  (YC page structure may vary, this is a simplified approach)
+    # Note: YC's actual site structure would need to be inspected and updated
+    job_elements = soup.find_all('div', class_='job-listing')  # Placeholder selector
+    
+    for job_elem in job_elements[:10]:  # Limit to 10 jobs
+        try:
+            # Extract job details (these selectors are placeholders)
+            title_elem = job_elem.find('h3')
+            company_elem = job_elem.find('span', class_='company')
+            location_elem = job_elem.find('span', class_='location')
             
-            enriched_job = {
-                "id": job.get("job_id", ""),
-                "title": job.get("title", ""),
-                "company": job.get("company_name", ""),
-                "company_logo": job.get("thumbnail", ""),
-                "location": job.get("location", location),
-                "description": job.get("description", ""),
-                "via": "Google Jobs",
-                "listing_url": listing_url,
-                "apply_url": apply_url,
-                "salary": salary_str,
-                "posted_at": posted_at_str,
-                "employment_type": employment_type,
-                "extensions": job.get("extensions", [])
-            }
-            enriched_jobs.append(enriched_job)
-        
-        print(f"✓ SerpAPI found {len(enriched_jobs)} jobs for '{query}' in '{location}'")
-        return enriched_jobs
-        
-    except Exception as e:
-        print(f"Error in search_google_jobs_serpapi: {str(e)}")
-        return []
+            listings.append({
+                "title": title_elem.text.strip() if title_elem else "Unknown Title",
+                "company": company_elem.text.strip() if company_elem else "YC Startup",
+                "location": location_elem.text.strip() if location_elem else "San Francisco",
+                "url": f"https://www.ycombinator.com/jobs/{job_elem.get('id', '')}"
+            })
+        except Exception as e:
+            continue
+    return listings
 
 
 @retry_async(max_attempts=2, delay=1.0)
 async def fetch_yc_jobs(query: str) -> List[Dict[str, Any]]:
     """
     Scrape Y Combinator's Work at a Startup page.
+    The page is fetched with a conditional GET, so an unchanged page is not re-parsed.
     """
     try:
-        url = "https://www.ycombinator.com/jobs"
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    print(f"Failed to fetch YC jobs: status {response.status}")
-                    return []
-                
-                html = await response.text()
-        
-        soup = BeautifulSoup(html, 'lxml')
-        jobs = []
-        
-        # Find job listings  (YC page structure may vary, this is a simplified approach)
-        # Note: YC's actual site structure would need to be inspected and updated
-        job_elements = soup.find_all('div', class_='job-listing')  # Placeholder selector
-        
-        for job_elem in job_elements[:10]:  # Limit to 10 jobs
-            try:
-                # Extract job details (these selectors are placeholders)
-                title_elem = job_elem.find('h3')
-                company_elem = job_elem.find('span', class_='company')
-                location_elem = job_elem.find('span', class_='location')
-                
-                job = {
-                    "title": title_elem.text.strip() if title_elem else "Unknown Title",
-                    "company": company_elem.text.strip() if company_elem else "YC Startup",
-                    "location": location_elem.text.strip() if location_elem else "San Francisco",
-                    "description": f"Y Combinator startup looking for: {query}",
-                    "url": f"https://www.ycombinator.com/jobs/{job_elem.get('id', '')}"
-                }
-                jobs.append(job)
-            except Exception as e:
-                continue
-        
-        print(f"✓ YC Jobs found {len(jobs)} jobs")
-        return jobs
-        
+        listings = await fetch_parsed(YC_JOBS_URL, _parse_yc_listings)
     except Exception as e:
         print(f"Error in fetch_yc_jobs: {str(e)}")
         return []
 
+    jobs = [
+        {**listing, "description": f"Y Combinator startup looking for: {query}"}
+        for listing in listings
+    ]
+    print(f"✓ YC Jobs found {len(jobs)} jobs")
+    return jobs
+
 
 @retry_async(max_attempts=2, delay=1.0)
 async def fetch_wellfound_jobs(query: str) -> List[Dict[str, Any]]:
@@ -142,12 +190,8 @@ async def search_linkedin_playwright(query: str) -> List[Dict[str, Any]]:
     Extracts: job URL, company logo, description, posted date.
     """
     try:
-        from playwright.async_api import async_playwright
-        
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            
+        # Lease a page from the shared browser instead of launching Chromium per call
+        async with browser_pool.page() as page:
             # Build LinkedIn jobs search URL
             search_url = f"https://www.linkedin.com/jobs/search/?keywords={query.replace(' ', '%20')}"
             
@@ -193,8 +237,6 @@ async def search_linkedin_playwright(query: str) -> List[Dict[str, Any]]:
                 except Exception:
                     continue
             
-            await browser.close()
-            
             print(f"✓ LinkedIn found {len(jobs)} jobs")
             return jobs
             
@@ -210,12 +252,8 @@ async def search_indeed_playwright(query: str) -> List[Dict[str, Any]]:
     Extracts: job URL, job ID, company, salary if available.
     """
     try:
-        from playwright.async_api import async_playwright
-        
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            
+        # Lease a page from the shared browser instead of launching Chromium per call
+        async with browser_pool.page() as page:
             # Build Indeed search URL
             search_url = f"https://www.indeed.com/jobs?q={query.replace(' ', '+')}"
             
@@ -257,8 +295,6 @@ async def search_indeed_playwright(query: str) -> List[Dict[str, Any]]:
                 except Exception:
                     continue
             
-            await browser.close()
-            
             print(f"✓ Indeed found {len(jobs)} jobs")
             return jobs
             
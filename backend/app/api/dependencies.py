@@ -0,0 +1,18 @@
+from typing import Any, Dict
+from fastapi import Depends, HTTPException
+from backend.app.db.mongo import get_database
+from backend.app.services.user_service import UserService
+
+async def require_user(db, clerk_user_id: str) -> Dict[str, Any]:
+    """Resolve a clerk id to the cached slim user document or raise 404"""
+    user = await UserService(db).resolve_user(clerk_user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+async def get_current_user(
+    clerk_user_id: str,
+    db = Depends(get_database)
+) -> Dict[str, Any]:
+    """Dependency for routes that take clerk_user_id as a query parameter"""
+    return await require_user(db, clerk_user_id)
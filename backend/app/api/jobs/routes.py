@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List
 from backend.app.db.mongo import get_database
 from backend.app.services.job_service import JobService
 from backend.app.services.user_service import UserService
 from backend.app.services.run_service import RunService
+from backend.app.services.scan_queue_service import ScanQueueService
+from backend.app.api.dependencies import require_user, get_current_user
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
@@ -18,18 +20,12 @@ class ScanRequest(BaseModel):
 @router.post("/scan")
 async def trigger_scan(
     request: ScanRequest,
-    background_tasks: BackgroundTasks,
     db = Depends(get_database)
 ):
-    user_service = UserService(db)
     run_service = RunService(db)
-    job_service = JobService(db)
+    queue_service = ScanQueueService(db)
 
-    user = await user_service.get_user_by_clerk_id(request.clerk_user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    user_profile = user.get("profile", {})
+    user = await require_user(db, request.clerk_user_id)
     user_id = str(user.get("_id"))
 
     try:
@@ -37,22 +33,21 @@ async def trigger_scan(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    background_tasks.add_task(
-        job_service.run_job_scan,
+    # A scan worker picks it up (python -m backend.app.worker) and loads the full profile
+    await queue_service.enqueue_scan(
+        scan_run_id,
         user_id,
-        user_profile,
         request.sources,
         request.match_threshold,
         request.keywords,
         request.location,
-        scan_run_id
     )
     
-    return {"message": "Job scan started", "status": "processing", "scan_run_id": scan_run_id}
+    return {"message": "Job scan queued", "status": "processing", "scan_run_id": scan_run_id}
 
 @router.get("")
 async def list_jobs(
-    clerk_user_id: str,
+    user = Depends(get_current_user),
     limit: int = 50,
     status: Optional[str] = None,
     scan_run_id: Optional[str] = None,
@@ -62,15 +57,12 @@ async def list_jobs(
     min_match_score: Optional[float] = None,
     sort_by: Optional[str] = "created_at",
     sort_order: Optional[str] = "desc",
+    cursor: Optional[str] = None,
     db = Depends(get_database)
 ):
     job_service = JobService(db)
     run_service = RunService(db)
-    user_service = UserService(db)
 
-    user = await user_service.get_user_by_clerk_id(clerk_user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
     user_id = str(user.get("_id"))
 
     filters = {
@@ -82,12 +74,16 @@ async def list_jobs(
         "min_match_score": min_match_score
     }
 
-    jobs = await job_service.list_jobs(user_id, filters, limit, sort_by, sort_order)
+    try:
+        page = await job_service.list_jobs(user_id, filters, limit, sort_by, sort_order, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     recent_runs = await run_service.history_repo.list_scans(user_id=user_id, limit=20)
     
     return {
-        "jobs": jobs,
-        "total": len(jobs),
+        "jobs": page["jobs"],
+        "total": page["total"],
+        "next_cursor": page["next_cursor"],
         "scan_runs": recent_runs
     }
 
@@ -105,17 +101,16 @@ async def get_job(
 @router.post("/{job_id}/outreach")
 async def generate_outreach(
     job_id: str,
-    clerk_user_id: str,
+    regenerate: bool = False,
+    user = Depends(get_current_user),
     db = Depends(get_database)
 ):
+    """Stored messages are returned as they are; pass regenerate=true for new ones"""
     user_service = UserService(db)
     job_service = JobService(db)
     
-    user = await user_service.get_user_by_clerk_id(clerk_user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    result = await job_service.generate_outreach(job_id, user.get("profile", {}))
+    user_profile = await user_service.get_profile(user["_id"])
+    result = await job_service.generate_outreach(job_id, user_profile, str(user["_id"]), regenerate=regenerate)
     if not result:
         raise HTTPException(status_code=404, detail="Job not found or generation failed")
         
@@ -3,7 +3,7 @@ from typing import List, Optional
 from pydantic import BaseModel
 from backend.app.db.mongo import get_database
 from backend.app.services.outreach_service import OutreachService
-from backend.app.services.user_service import UserService
+from backend.app.api.dependencies import require_user
 
 router = APIRouter(prefix="/api/outreach/templates", tags=["outreach"])
 
@@ -26,12 +26,9 @@ async def list_templates(
     clerk_user_id: str,
     db = Depends(get_database)
 ):
-    user_service = UserService(db)
     outreach_service = OutreachService(db)
     
-    user = await user_service.get_user_by_clerk_id(clerk_user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = await require_user(db, clerk_user_id)
         
     return await outreach_service.list_templates(user["_id"])
 
@@ -41,12 +38,9 @@ async def get_template(
     clerk_user_id: str,
     db = Depends(get_database)
 ):
-    user_service = UserService(db)
     outreach_service = OutreachService(db)
     
-    user = await user_service.get_user_by_clerk_id(clerk_user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = await require_user(db, clerk_user_id)
         
     template = await outreach_service.get_template(template_id, user["_id"])
     if not template:
@@ -59,12 +53,9 @@ async def create_template(
     request: TemplateCreateRequest,
     db = Depends(get_database)
 ):
-    user_service = UserService(db)
     outreach_service = OutreachService(db)
     
-    user = await user_service.get_user_by_clerk_id(request.clerk_user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = await require_user(db, request.clerk_user_id)
         
     template_id = await outreach_service.create_template(user["_id"], request.model_dump())
     return {"id": template_id, "message": "Template created"}
@@ -75,12 +66,9 @@ async def update_template(
     request: TemplateUpdateRequest,
     db = Depends(get_database)
 ):
-    user_service = UserService(db)
     outreach_service = OutreachService(db)
     
-    user = await user_service.get_user_by_clerk_id(request.clerk_user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = await require_user(db, request.clerk_user_id)
         
     success = await outreach_service.update_template(user["_id"], template_id, request.model_dump(exclude_unset=True))
     if not success:
@@ -94,12 +82,9 @@ async def duplicate_template(
     clerk_user_id: str = Body(..., embed=True),
     db = Depends(get_database)
 ):
-    user_service = UserService(db)
     outreach_service = OutreachService(db)
     
-    user = await user_service.get_user_by_clerk_id(clerk_user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = await require_user(db, clerk_user_id)
         
     new_id = await outreach_service.duplicate_template(user["_id"], template_id)
     if not new_id:
@@ -115,12 +100,9 @@ async def delete_template(
     # Given previous patterns, I'll accept it as query param here.
     db = Depends(get_database)
 ):
-    user_service = UserService(db)
     outreach_service = OutreachService(db)
     
-    user = await user_service.get_user_by_clerk_id(clerk_user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = await require_user(db, clerk_user_id)
         
     success = await outreach_service.delete_template(user["_id"], template_id)
     if not success:
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Body, Request
+from fastapi.responses import StreamingResponse
 from backend.app.db.mongo import get_database
 from backend.app.services.run_service import RunService
 from backend.app.services.user_service import UserService
+from backend.app.services.scheduler_service import SchedulerService
+from backend.app.api.dependencies import require_user, get_current_user
 
 router = APIRouter(prefix="/api/runs", tags=["runs"])
 
@@ -11,11 +15,11 @@ async def get_agent_status(db = Depends(get_database)):
     return await run_service.get_status()
 
 @router.get("/next-scan")
-async def get_next_scan():
-    from datetime import datetime, timedelta
-    now = datetime.utcnow()
-    next_scan = (now + timedelta(days=1)).replace(hour=6, minute=0, second=0, microsecond=0)
-    return {"next_scan": next_scan}
+async def get_next_scan(
+    user = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    return await SchedulerService(db).get_next_scan(user["_id"])
 
 @router.get("/last-scan")
 async def get_last_scan(db = Depends(get_database)):
@@ -34,28 +38,17 @@ async def toggle_auto_scan(
     clerk_user_id: str = Body(..., embed=True),
     db = Depends(get_database)
 ):
-    user_service = UserService(db)
-    user = await user_service.get_user_by_clerk_id(clerk_user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    profile = user.get("profile", {})
-    preferences = profile.get("preferences", {})
-    preferences["auto_scan_enabled"] = enabled
-    profile["preferences"] = preferences
-    
-    await user_service.update_profile(user["_id"], profile)
-    return {"auto_scan_enabled": enabled}
+    user = await require_user(db, clerk_user_id)
+    await UserService(db).set_preference(user["_id"], "auto_scan_enabled", enabled)
+    next_scan = await SchedulerService(db).set_auto_scan(user["_id"], enabled)
+    return {"auto_scan_enabled": enabled, "next_scan": next_scan}
 
 @router.post("/start")
 async def start_run(
     clerk_user_id: str = Body(..., embed=True),
     db = Depends(get_database)
 ):
-    user_service = UserService(db)
-    user = await user_service.get_user_by_clerk_id(clerk_user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = await require_user(db, clerk_user_id)
 
     run_service = RunService(db)
     try:
@@ -69,10 +62,7 @@ async def stop_run(
     clerk_user_id: str = Body(..., embed=True),
     db = Depends(get_database)
 ):
-    user_service = UserService(db)
-    user = await user_service.get_user_by_clerk_id(clerk_user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = await require_user(db, clerk_user_id)
 
     run_service = RunService(db)
     try:
@@ -83,14 +73,24 @@ async def stop_run(
 
 @router.get("/timeline")
 async def get_timeline(
-    clerk_user_id: str,
+    user = Depends(get_current_user),
     limit: int = 50,
     db = Depends(get_database)
 ):
-    user_service = UserService(db)
-    user = await user_service.get_user_by_clerk_id(clerk_user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
     run_service = RunService(db)
     return await run_service.get_timeline(user_id=user["_id"], limit=limit)
+
+@router.get("/stream")
+async def stream_run_events(
+    request: Request,
+    user = Depends(get_current_user),
+    run_id: Optional[str] = None,
+    db = Depends(get_database)
+):
+    """Live timeline steps, status changes and progress counts as Server-Sent Events"""
+    run_service = RunService(db)
+    return StreamingResponse(
+        run_service.stream_events(user["_id"], run_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
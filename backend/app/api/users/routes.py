@@ -16,7 +16,7 @@ async def create_or_update_profile(
     if not clerk_user_id or not email:
         raise HTTPException(status_code=400, detail="Missing clerk_user_id or email")
         
-    existing_user = await user_service.get_user_by_clerk_id(clerk_user_id)
+    existing_user = await user_service.resolve_user(clerk_user_id)
     
     if existing_user:
         # Update
@@ -0,0 +1,120 @@
+"""
+Index bootstrap for every Mongo collection.
+Each repository declares the indexes its queries rely on (BaseRepository.indexes);
+this module applies them idempotently and reports drift between the declarations
+and what exists in the database.
+
+Usage:
+    python -m backend.app.db.indexes check
+    python -m backend.app.db.indexes apply [--fix-changed] [--drop-extra]
+"""
+import argparse
+import asyncio
+from typing import Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from backend.app.db.mongo import db
+from backend.app.db.repositories.job_corpus_repository import JobCorpusRepository
+from backend.app.db.repositories.job_repository import JobRepository
+from backend.app.db.repositories.llm_cache_repository import LLMCacheRepository
+from backend.app.db.repositories.outreach_repository import OutreachRepository
+from backend.app.db.repositories.scan_history_repository import ScanHistoryRepository
+from backend.app.db.repositories.scan_queue_repository import ScanQueueRepository
+from backend.app.db.repositories.scan_schedule_repository import ScanScheduleRepository
+from backend.app.db.repositories.scan_state_repository import ScanStateRepository
+from backend.app.db.repositories.source_cache_repository import SourceCacheRepository
+from backend.app.db.repositories.timeline_repository import TimelineRepository
+from backend.app.db.repositories.user_repository import UserRepository
+
+# One repository per collection; RunRepository/RunLogRepository share these collections
+INDEXED_REPOSITORIES = [
+    JobRepository,
+    JobCorpusRepository,
+    ScanHistoryRepository,
+    ScanQueueRepository,
+    ScanScheduleRepository,
+    ScanStateRepository,
+    TimelineRepository,
+    UserRepository,
+    OutreachRepository,
+    LLMCacheRepository,
+    SourceCacheRepository,
+]
+
+
+async def check_index_drift(database: AsyncIOMotorDatabase) -> Dict[str, Dict[str, List[str]]]:
+    """Return {collection: {"missing", "changed", "extra"}} without changing anything"""
+    report = {}
+    for repository_class in INDEXED_REPOSITORIES:
+        repository = repository_class(database)
+        report[repository.collection.name] = await repository.index_drift()
+    return report
+
+
+async def apply_indexes(
+    database: AsyncIOMotorDatabase,
+    fix_changed: bool = False,
+    drop_extra: bool = False,
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Create missing indexes on every collection and return the drift found before applying.
+    Changed indexes are only rebuilt and undeclared ones only dropped when asked to.
+    A collection whose indexes fail to build (e.g. a unique index over duplicate data)
+    is reported under "errors" and the other collections are still applied.
+    """
+    report = {}
+    for repository_class in INDEXED_REPOSITORIES:
+        repository = repository_class(database)
+        name = repository.collection.name
+        try:
+            report[name] = await repository.ensure_indexes(fix_changed=fix_changed, drop_extra=drop_extra)
+        except Exception as e:
+            try:
+                drift = await repository.index_drift()
+            except Exception:
+                drift = {"missing": [], "changed": [], "extra": []}
+            report[name] = {**drift, "errors": [str(e)]}
+    return report
+
+
+def format_drift(report: Dict[str, Dict[str, List[str]]]) -> List[str]:
+    """Human readable lines for every collection with drift"""
+    lines = []
+    for collection, drift in report.items():
+        for kind in ("missing", "changed", "extra"):
+            if drift.get(kind):
+                lines.append(f"{collection}: {kind} indexes {', '.join(drift[kind])}")
+        for error in drift.get("errors", []):
+            lines.append(f"{collection}: index build failed: {error}")
+    return lines
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Apply or check MongoDB indexes")
+    parser.add_argument("command", choices=["check", "apply"])
+    parser.add_argument("--fix-changed", action="store_true", help="Drop and recreate indexes whose definition changed")
+    parser.add_argument("--drop-extra", action="store_true", help="Drop indexes that are not declared by any repository")
+    args = parser.parse_args()
+
+    db.connect()
+    try:
+        if args.command == "check":
+            report = await check_index_drift(db.get_db())
+        else:
+            report = await apply_indexes(db.get_db(), fix_changed=args.fix_changed, drop_extra=args.drop_extra)
+    finally:
+        db.close()
+
+    lines = format_drift(report)
+    for line in lines:
+        print(line)
+    if not lines:
+        print("Indexes match the declarations.")
+    elif args.command == "apply":
+        failed = [collection for collection, drift in report.items() if drift.get("errors")]
+        print(f"Missing indexes created{' except on ' + ', '.join(failed) if failed else ''}.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -49,8 +49,10 @@ class JobMetadata(BaseModel):
     collected_at: datetime = Field(default_factory=datetime.utcnow)
     scraped_from: Optional[str] = None
     fingerprint: str  # hash(title + company + source_id + location)
+    raw_key: Optional[str] = None  # hash of the scraped record, used to find it in jobs_corpus
     raw_payload: Dict[str, Any] = Field(default_factory=dict)
     scan_run_id: Optional[str] = None  # ID of the scan run that found this job
+    normalization_path: Optional[str] = None  # fast_path | llm | corpus
 
 class Job(BaseModel):
     """
@@ -86,6 +88,7 @@ class Job(BaseModel):
     skills_extracted: List[str] = Field(default_factory=list)
     
     # Matching
+    pre_score: Optional[float] = None  # Deterministic pre-filter score (0.0 - 1.0)
     match_score: Optional[float] = None
     match_reasoning: Optional[str] = None
     missing_skills: List[str] = Field(default_factory=list)
@@ -1,8 +1,52 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
 from uuid import uuid4
+from backend.core.config import settings
+
+# Index options compared when checking declared indexes against the database
+INDEX_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+# (collection, filter fields, sort fields) already explained by the COLLSCAN check
+_checked_query_shapes: Set[Tuple[str, Tuple[str, ...], Tuple[str, ...]]] = set()
+
+def _index_signature(spec: Dict[str, Any]) -> Dict[str, Any]:
+    key = spec.get("key", {})
+    key = list(key.items()) if isinstance(key, dict) else [tuple(item) for item in key]
+    signature = {"key": [(field, int(direction) if isinstance(direction, (int, float)) else direction) for field, direction in key]}
+    for option in INDEX_OPTIONS:
+        if spec.get(option) is not None:
+            signature[option] = spec[option]
+    return signature
+
+def diff_indexes(declared: List[IndexModel], existing: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Compare declared indexes with collection.index_information().
+    Returns names that are missing, changed (same name, different keys/options) or extra.
+    """
+    declared_by_name = {model.document["name"]: model.document for model in declared}
+    existing = {name: info for name, info in existing.items() if name != "_id_"}
+    return {
+        "missing": [name for name in declared_by_name if name not in existing],
+        "changed": [
+            name for name, spec in declared_by_name.items()
+            if name in existing and _index_signature(spec) != _index_signature(existing[name])
+        ],
+        "extra": [name for name in existing if name not in declared_by_name],
+    }
+
+def _has_collscan(plan: Dict[str, Any]) -> bool:
+    if plan.get("stage") == "COLLSCAN":
+        return True
+    children = plan.get("inputStages") or []
+    if plan.get("inputStage"):
+        children = children + [plan["inputStage"]]
+    return any(_has_collscan(child) for child in children)
 
 class BaseRepository:
+    # Indexes this repository's queries rely on; applied by backend.app.db.indexes
+    indexes: List[IndexModel] = []
+
     def __init__(self, db: AsyncIOMotorDatabase, collection_name: str):
         self.collection = db[collection_name]
 
@@ -12,6 +56,7 @@ class BaseRepository:
         sort: Optional[List[tuple]] = None,
         projection: Optional[Dict[str, int]] = None,
     ) -> Optional[Dict[str, Any]]:
+        await self._check_query_plan(query, sort)
         return await self.collection.find_one(query, sort=sort, projection=projection)
 
     async def find_all(
@@ -21,6 +66,7 @@ class BaseRepository:
         sort: Optional[List[tuple]] = None,
         projection: Optional[Dict[str, int]] = None,
     ) -> List[Dict[str, Any]]:
+        await self._check_query_plan(query, sort)
         cursor = self.collection.find(query, projection=projection)
         if sort:
             cursor = cursor.sort(sort)
@@ -38,3 +84,46 @@ class BaseRepository:
 
     async def delete(self, id: str):
         await self.collection.delete_one({"_id": id})
+
+    async def index_drift(self) -> Dict[str, List[str]]:
+        """Report declared indexes that are missing or changed, and undeclared extra ones"""
+        existing = await self.collection.index_information()
+        return diff_indexes(self.indexes, existing)
+
+    async def ensure_indexes(self, fix_changed: bool = False, drop_extra: bool = False) -> Dict[str, List[str]]:
+        """Create missing declared indexes (idempotent) and optionally rebuild changed or drop extra ones"""
+        drift = await self.index_drift()
+        to_create = set(drift["missing"])
+        if fix_changed:
+            for name in drift["changed"]:
+                await self.collection.drop_index(name)
+            to_create.update(drift["changed"])
+        if drop_extra:
+            for name in drift["extra"]:
+                await self.collection.drop_index(name)
+        models = [model for model in self.indexes if model.document["name"] in to_create]
+        if models:
+            await self.collection.create_indexes(models)
+        return drift
+
+    async def _check_query_plan(self, query: Dict[str, Any], sort: Optional[List[tuple]] = None):
+        """When MONGO_COLLSCAN_CHECK is on, explain each new query shape once and log collection scans"""
+        if not settings.MONGO_COLLSCAN_CHECK:
+            return
+        shape = (
+            self.collection.name,
+            tuple(sorted(query.keys())),
+            tuple(key for key, _ in sort or []),
+        )
+        if shape in _checked_query_shapes:
+            return
+        _checked_query_shapes.add(shape)
+        try:
+            cursor = self.collection.find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+            plan = await cursor.limit(1).explain()
+            if _has_collscan(plan.get("queryPlanner", {}).get("winningPlan", {})):
+                print(f"COLLSCAN on {self.collection.name}: filter={list(shape[1])} sort={list(shape[2])}")
+        except Exception as e:
+            print(f"Query plan check failed on {self.collection.name}: {e}")
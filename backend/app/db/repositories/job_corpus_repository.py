@@ -0,0 +1,106 @@
+from typing import List, Optional, Dict, Any, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
+from datetime import datetime
+from backend.app.db.repositories.base_repository import BaseRepository
+
+# Fields of a normalized posting, stored once per fingerprint in jobs_corpus
+POSTING_FIELDS = (
+    "source", "source_id", "title", "company", "company_logo", "location", "remote",
+    "job_type", "employment_type", "salary", "posted_at", "description",
+    "listing_url", "apply_url", "tags", "skills_extracted",
+)
+# Posting fields also kept on matched_jobs, for their indexes, filters and the dashboard
+MATCH_COPY_FIELDS = ("source", "title", "company", "posted_at")
+
+
+def split_job_document(doc: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Split a full job document into (posting for jobs_corpus, slim matched_jobs document).
+    The matched job references the posting through job_id (the posting fingerprint).
+    """
+    metadata = dict(doc.get("metadata") or {})
+    fingerprint = metadata["fingerprint"]
+    raw_payload = metadata.pop("raw_payload", None)
+    raw_key = metadata.pop("raw_key", None)
+
+    posting = {field: doc.get(field) for field in POSTING_FIELDS}
+    posting["_id"] = fingerprint
+    posting["raw_keys"] = [raw_key] if raw_key else []
+    # Jobs rebuilt from the corpus carry neither; keep what the corpus already has
+    if raw_payload:
+        posting["raw_payload"] = raw_payload
+    if metadata.get("normalization_path") not in (None, "corpus"):
+        posting["normalization_path"] = metadata["normalization_path"]
+
+    match = {
+        key: value for key, value in doc.items()
+        if key not in POSTING_FIELDS or key in MATCH_COPY_FIELDS
+    }
+    match["job_id"] = fingerprint
+    match["metadata"] = metadata
+    return posting, match
+
+
+def merge_job_document(match: Dict[str, Any], posting: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Full job document from a matched job and its posting (the matched job's fields win)"""
+    if not posting:
+        return match
+    merged = {field: posting[field] for field in POSTING_FIELDS if field in posting}
+    merged.update(match)
+    return merged
+
+
+class JobCorpusRepository(BaseRepository):
+    """Normalized postings shared by every user, keyed by fingerprint"""
+
+    indexes = [
+        IndexModel([("raw_keys", ASCENDING)], name="raw_keys"),
+        IndexModel([("last_seen_at", DESCENDING)], name="last_seen_at"),
+    ]
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        super().__init__(db, "jobs_corpus")
+
+    async def find_by_raw_keys(self, raw_keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Map each known raw key to its posting, in one query"""
+        if not raw_keys:
+            return {}
+        wanted = set(raw_keys)
+        cursor = self.collection.find(
+            {"raw_keys": {"$in": list(wanted)}}, projection={"raw_payload": 0}
+        )
+        found = {}
+        for doc in await cursor.to_list(length=None):
+            for raw_key in doc.get("raw_keys", []):
+                if raw_key in wanted:
+                    found[raw_key] = doc
+        return found
+
+    async def get_many(self, posting_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Postings by fingerprint, without their raw payloads"""
+        if not posting_ids:
+            return {}
+        cursor = self.collection.find(
+            {"_id": {"$in": list(set(posting_ids))}}, projection={"raw_payload": 0, "raw_keys": 0}
+        )
+        return {doc["_id"]: doc for doc in await cursor.to_list(length=None)}
+
+    async def upsert_postings(self, postings: List[Dict[str, Any]]):
+        """Insert or refresh postings in one unordered bulk write"""
+        if not postings:
+            return
+        now = datetime.utcnow()
+        requests = []
+        for posting in postings:
+            fields = {key: value for key, value in posting.items() if key not in ("_id", "raw_keys")}
+            requests.append(UpdateOne(
+                {"_id": posting["_id"]},
+                {
+                    "$set": {**fields, "last_seen_at": now},
+                    "$setOnInsert": {"first_seen_at": now},
+                    "$addToSet": {"raw_keys": {"$each": posting.get("raw_keys", [])}},
+                },
+                upsert=True,
+            ))
+        await self.collection.bulk_write(requests, ordered=False)
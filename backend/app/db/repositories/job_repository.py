@@ -1,18 +1,51 @@
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Set, Tuple
+from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import BulkWriteError
 from backend.app.db.models import Job
 from backend.app.db.repositories.base_repository import BaseRepository
+from backend.app.db.repositories.job_corpus_repository import JobCorpusRepository, merge_job_document
 
 class JobRepository(BaseRepository):
+    """
+    Per-user matched jobs. New documents are slim (score, reasoning, status, outreach)
+    and reference their posting in jobs_corpus through job_id; reads return the merged
+    document. Documents stored before the corpus existed are returned as they are.
+    """
+
+    indexes = [
+        IndexModel([("user_id", ASCENDING), ("status", ASCENDING)], name="user_status"),
+        # One per sortable job list column; _id breaks ties for keyset pagination
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="user_created_at_id"),
+        IndexModel([("user_id", ASCENDING), ("posted_at", DESCENDING), ("_id", DESCENDING)], name="user_posted_at_id"),
+        IndexModel([("user_id", ASCENDING), ("match_score", DESCENDING), ("_id", DESCENDING)], name="user_match_score_id"),
+        # Unique fingerprint per user, so concurrent scans cannot store the same job twice
+        IndexModel(
+            [("user_id", ASCENDING), ("metadata.fingerprint", ASCENDING)],
+            unique=True,
+            name="user_fingerprint_unique",
+        ),
+    ]
+
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, "matched_jobs")
+        self.corpus = JobCorpusRepository(db)
+
+    async def _hydrate(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Merge each matched job with its corpus posting (one $in query)"""
+        postings = await self.corpus.get_many([doc["job_id"] for doc in docs if doc.get("job_id")])
+        return [merge_job_document(doc, postings.get(doc.get("job_id"))) for doc in docs]
 
     async def find_by_id(self, job_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Find job by ID"""
         query = {"_id": job_id}
         if user_id:
             query["user_id"] = user_id
-        return await self.find_one(query)
+        doc = await self.find_one(query)
+        if doc is None:
+            return None
+        return (await self._hydrate([doc]))[0]
 
     async def find_by_fingerprint(self, fingerprint: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Find job by fingerprint to check for duplicates"""
@@ -21,13 +54,91 @@ class JobRepository(BaseRepository):
             query["user_id"] = user_id
         return await self.find_one(query)
     
+    async def find_existing_fingerprints(self, fingerprints: List[str], user_id: Optional[str] = None) -> Set[str]:
+        """Return which of the given fingerprints are already stored, in one query"""
+        if not fingerprints:
+            return set()
+        query: Dict[str, Any] = {"metadata.fingerprint": {"$in": fingerprints}}
+        if user_id:
+            query["user_id"] = user_id
+        cursor = self.collection.find(query, projection={"metadata.fingerprint": 1, "_id": 0})
+        docs = await cursor.to_list(length=None)
+        return {doc["metadata"]["fingerprint"] for doc in docs}
+
+    async def iter_fingerprints(self, user_id: str) -> AsyncIterator[str]:
+        """Every fingerprint the user has stored (covered by the user_fingerprint_unique index)"""
+        cursor = self.collection.find({"user_id": user_id}, projection={"metadata.fingerprint": 1, "_id": 0})
+        async for doc in cursor:
+            fingerprint = (doc.get("metadata") or {}).get("fingerprint")
+            if fingerprint:
+                yield fingerprint
+
+    async def insert_many_new(self, documents: List[Dict[str, Any]]) -> List[str]:
+        """
+        Insert documents in one unordered batch and return the ids that were inserted.
+        Duplicate-key errors (already stored jobs) are skipped, any other error is raised.
+        """
+        if not documents:
+            return []
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+            return [doc["_id"] for doc in documents]
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            other_errors = [err for err in write_errors if err.get("code") != 11000]
+            if other_errors:
+                raise
+            failed = {err["index"] for err in write_errors}
+            return [doc["_id"] for idx, doc in enumerate(documents) if idx not in failed]
+
     async def get_matched_jobs(self, limit: int = 50, user_id: Optional[str] = None) -> List[Job]:
         query: Dict[str, Any] = {}
         if user_id:
             query["user_id"] = user_id
-        data = await self.find_all(query, limit=limit)  # Return all jobs, not just matched
+        data = await self._hydrate(await self.find_all(query, limit=limit))  # Return all jobs, not just matched
         return [Job(**item) for item in data]
 
+    async def list_page(
+        self,
+        query: Dict[str, Any],
+        sort_by: str,
+        direction: int,
+        limit: int,
+        after: Optional[Tuple[Any, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        One page of jobs sorted by (sort_by, _id) in the given direction.
+        after is the (sort value, _id) of the last job on the previous page.
+        """
+        if after is not None:
+            query = {"$and": [query, self._keyset_filter(sort_by, direction, *after)]}
+        await self._check_query_plan(query, [(sort_by, direction), ("_id", direction)])
+        cursor = (
+            self.collection
+            .find(query)
+            .sort([(sort_by, direction), ("_id", direction)])
+            .limit(limit)
+        )
+        return await self._hydrate(await cursor.to_list(length=limit))
+
+    @staticmethod
+    def _keyset_filter(field: str, direction: int, value: Any, last_id: str) -> Dict[str, Any]:
+        """Jobs after (value, last_id); null/missing values sort lowest, as in Mongo"""
+        if value is None:
+            if direction == DESCENDING:
+                return {field: None, "_id": {"$lt": last_id}}
+            return {"$or": [{field: None, "_id": {"$gt": last_id}}, {field: {"$ne": None}}]}
+
+        op = "$lt" if direction == DESCENDING else "$gt"
+        conditions: List[Dict[str, Any]] = [{field: {op: value}}, {field: value, "_id": {op: last_id}}]
+        if direction == DESCENDING:
+            conditions.append({field: None})
+        return {"$or": conditions}
+
+    async def count_jobs(self, query: Dict[str, Any]) -> int:
+        """Count jobs matching a filter (served by the user_id prefixed indexes)"""
+        return await self.collection.count_documents(query)
+
     async def count_by_status(self, status: str, user_id: Optional[str] = None) -> int:
         """Count jobs by status"""
         query = {"status": status}
@@ -76,6 +187,76 @@ class JobRepository(BaseRepository):
             }
         return {"average": 0.0, "count": 0, "high_match_count": 0}
     
+    async def get_dashboard_facets(self, user_id: str, recent_limit: int = 5) -> Dict[str, Any]:
+        """
+        Status breakdown, match score stats, top sources and most recent jobs for a user,
+        computed from a single pass over the user's jobs with $facet.
+        """
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            {
+                "$facet": {
+                    "status_breakdown": [
+                        {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+                    ],
+                    "score_stats": [
+                        {"$match": {"match_score": {"$exists": True, "$ne": None}}},
+                        {
+                            "$group": {
+                                "_id": None,
+                                "average": {"$avg": "$match_score"},
+                                "count": {"$sum": 1},
+                                "high_match_count": {
+                                    "$sum": {"$cond": [{"$gte": ["$match_score", 0.8]}, 1, 0]}
+                                }
+                            }
+                        },
+                    ],
+                    "top_sources": [
+                        {"$group": {"_id": "$source", "count": {"$sum": 1}}},
+                        {"$sort": {"count": -1}},
+                        {"$limit": 10},
+                    ],
+                    "recent_jobs": [
+                        {"$sort": {"created_at": -1}},
+                        {"$limit": recent_limit},
+                        {"$project": {"title": 1, "company": 1, "match_score": 1, "created_at": 1}},
+                    ],
+                }
+            },
+        ]
+        result = await self.collection.aggregate(pipeline).to_list(length=1)
+        facets = result[0] if result else {}
+
+        score_stats = (facets.get("score_stats") or [{}])[0]
+        return {
+            "status_breakdown": {r["_id"]: r["count"] for r in facets.get("status_breakdown", [])},
+            "score_stats": {
+                "average": score_stats.get("average") or 0.0,
+                "count": score_stats.get("count", 0),
+                "high_match_count": score_stats.get("high_match_count", 0),
+            },
+            "top_sources": [{"source": r["_id"], "count": r["count"]} for r in facets.get("top_sources", [])],
+            "recent_jobs": facets.get("recent_jobs", []),
+        }
+
+    async def update_status(self, job_id: str, status: str) -> Optional[str]:
+        """Set a job's status and return its user_id, or None if the job does not exist"""
+        doc = await self.collection.find_one_and_update(
+            {"_id": job_id},
+            {"$set": {"status": status}},
+            projection={"user_id": 1},
+        )
+        return doc.get("user_id", "") if doc else None
+
+    async def set_outreach(self, job_id: str, outreach: Dict[str, Any]) -> bool:
+        """Store generated outreach messages on a job (kept on the per-user document)"""
+        result = await self.collection.update_one(
+            {"_id": job_id},
+            {"$set": {"outreach": outreach, "outreach_generated_at": datetime.utcnow()}},
+        )
+        return result.matched_count == 1
+
     async def count_by_source(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Count jobs grouped by source"""
         pipeline = []
@@ -0,0 +1,52 @@
+from typing import Optional, Dict, Any
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from datetime import datetime, timedelta
+from backend.app.db.repositories.base_repository import BaseRepository
+
+class LLMCacheRepository(BaseRepository):
+    indexes = [
+        # Let MongoDB expire entries itself; prune() only enforces the size cap
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+    ]
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        super().__init__(db, "llm_cache")
+
+    async def get_response(self, key: str) -> Optional[str]:
+        """Get a cached response if it has not expired"""
+        doc = await self.find_one(
+            {"_id": key, "expires_at": {"$gt": datetime.utcnow()}},
+            projection={"response": 1},
+        )
+        return doc.get("response") if doc else None
+
+    async def set_response(self, key: str, response: str, ttl_seconds: int, metadata: Dict[str, Any] = None):
+        """Insert or refresh a cached response"""
+        now = datetime.utcnow()
+        await self.collection.update_one(
+            {"_id": key},
+            {
+                "$set": {
+                    "response": response,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=ttl_seconds),
+                    "metadata": metadata or {},
+                }
+            },
+            upsert=True,
+        )
+
+    async def prune(self, max_entries: int) -> int:
+        """Delete expired entries and the oldest entries beyond max_entries"""
+        result = await self.collection.delete_many({"expires_at": {"$lte": datetime.utcnow()}})
+        deleted = result.deleted_count
+
+        cutoff = await self.collection.find(
+            {}, projection={"created_at": 1}
+        ).sort("created_at", -1).skip(max_entries).limit(1).to_list(length=1)
+        if cutoff:
+            result = await self.collection.delete_many({"created_at": {"$lte": cutoff[0]["created_at"]}})
+            deleted += result.deleted_count
+        return deleted
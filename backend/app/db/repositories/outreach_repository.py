@@ -1,9 +1,14 @@
 from typing import List, Optional, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from backend.app.db.models import OutreachTemplate
 from backend.app.db.repositories.base_repository import BaseRepository
 
 class OutreachRepository(BaseRepository):
+    indexes = [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created_at"),
+    ]
+
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, "outreach_templates")
 
@@ -1,9 +1,16 @@
 from typing import List, Optional, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from datetime import datetime
 from backend.app.db.repositories.base_repository import BaseRepository
 
 class ScanHistoryRepository(BaseRepository):
+    indexes = [
+        IndexModel([("user_id", ASCENDING), ("started_at", DESCENDING)], name="user_started_at"),
+        IndexModel([("user_id", ASCENDING), ("status", ASCENDING), ("started_at", DESCENDING)], name="user_status_started_at"),
+        IndexModel([("started_at", DESCENDING)], name="started_at"),
+    ]
+
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, "scan_history")
 
@@ -53,6 +60,31 @@ class ScanHistoryRepository(BaseRepository):
             return result[0].get("total", 0)
         return 0
 
+    async def get_dashboard_summary(self, user_id: str, recent_limit: int = 5) -> Dict[str, Any]:
+        """Total jobs scanned and the most recent scans for a user in one aggregation"""
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            {
+                "$facet": {
+                    "total": [
+                        {"$match": {"status": "completed"}},
+                        {"$group": {"_id": None, "total": {"$sum": "$jobs_found"}}},
+                    ],
+                    "recent_scans": [
+                        {"$sort": {"started_at": -1}},
+                        {"$limit": recent_limit},
+                    ],
+                }
+            },
+        ]
+        result = await self.collection.aggregate(pipeline).to_list(length=1)
+        facets = result[0] if result else {}
+        total = (facets.get("total") or [{}])[0]
+        return {
+            "total_scanned": total.get("total", 0),
+            "recent_scans": facets.get("recent_scans", []),
+        }
+
     async def get_last_completed_scan(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get the last successfully completed scan for a user"""
         return await self.find_one({"user_id": user_id, "status": "completed"}, sort=[("started_at", -1)])
@@ -0,0 +1,144 @@
+from typing import List, Optional, Dict, Any
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
+from datetime import datetime, timedelta
+from backend.app.db.repositories.base_repository import BaseRepository
+
+class ScanQueueRepository(BaseRepository):
+    """
+    Queued scans, keyed by scan run id. Workers claim a scan with a lease that they
+    renew while it runs; a scan whose lease expires (worker crashed or was killed)
+    can be claimed again, so every scan runs at least once.
+    Statuses: queued -> leased -> done | failed | cancelled
+    """
+
+    indexes = [
+        IndexModel(
+            [("status", ASCENDING), ("priority", DESCENDING), ("available_at", ASCENDING)],
+            name="status_priority_available_at",
+        ),
+        IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)], name="status_lease_expires_at"),
+        IndexModel([("user_id", ASCENDING), ("status", ASCENDING)], name="user_status"),
+    ]
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        super().__init__(db, "scan_queue")
+
+    async def enqueue(
+        self,
+        scan_run_id: str,
+        user_id: str,
+        payload: Dict[str, Any],
+        priority: int = 0,
+        available_at: Optional[datetime] = None,
+    ) -> str:
+        now = datetime.utcnow()
+        return await self.create({
+            "_id": scan_run_id,
+            "user_id": user_id,
+            "payload": payload,
+            "priority": priority,
+            "status": "queued",
+            "attempts": 0,
+            "enqueued_at": now,
+            "available_at": available_at or now,
+            "lease_owner": None,
+            "lease_expires_at": None,
+        })
+
+    async def claim(self, worker_id: str, lease_seconds: float, max_attempts: int) -> Optional[Dict[str, Any]]:
+        """Lease the highest priority scan that is due (or whose lease expired)"""
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "queued", "available_at": {"$lte": now}},
+                    {"status": "leased", "lease_expires_at": {"$lt": now}},
+                ],
+                "attempts": {"$lt": max_attempts},
+            },
+            {
+                "$set": {
+                    "status": "leased",
+                    "lease_owner": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "started_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("priority", DESCENDING), ("available_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def renew(self, scan_run_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend a lease; False if the scan was cancelled or claimed by another worker"""
+        result = await self.collection.update_one(
+            {"_id": scan_run_id, "status": "leased", "lease_owner": worker_id},
+            {"$set": {"lease_expires_at": datetime.utcnow() + timedelta(seconds=lease_seconds)}},
+        )
+        return result.matched_count == 1
+
+    async def complete(self, scan_run_id: str, worker_id: str, status: str = "done", error: Optional[str] = None):
+        await self.collection.update_one(
+            {"_id": scan_run_id, "lease_owner": worker_id, "status": "leased"},
+            {"$set": {"status": status, "completed_at": datetime.utcnow(), "error": error, "lease_expires_at": None}},
+        )
+
+    async def release(self, scan_run_id: str, worker_id: str):
+        """Put a leased scan back in the queue right away without using up an attempt (worker shutting down)"""
+        await self.collection.update_one(
+            {"_id": scan_run_id, "lease_owner": worker_id, "status": "leased"},
+            {
+                "$set": {"status": "queued", "available_at": datetime.utcnow(), "lease_owner": None, "lease_expires_at": None},
+                "$inc": {"attempts": -1},
+            },
+        )
+
+    async def retry_later(self, scan_run_id: str, worker_id: str, delay_seconds: float, error: str):
+        """Put a scan that failed in the worker back in the queue after a delay; the attempt still counts"""
+        await self.collection.update_one(
+            {"_id": scan_run_id, "lease_owner": worker_id, "status": "leased"},
+            {"$set": {
+                "status": "queued",
+                "available_at": datetime.utcnow() + timedelta(seconds=delay_seconds),
+                "lease_owner": None,
+                "lease_expires_at": None,
+                "error": error,
+            }},
+        )
+
+    async def has_active(self, user_id: str) -> bool:
+        """Whether the user has a scan waiting or running"""
+        doc = await self.find_one({"user_id": user_id, "status": {"$in": ["queued", "leased"]}}, projection={"_id": 1})
+        return doc is not None
+
+    async def cancel_for_user(self, user_id: str) -> int:
+        """Cancel a user's queued and running scans; running ones stop at their next lease renewal"""
+        result = await self.collection.update_many(
+            {"user_id": user_id, "status": {"$in": ["queued", "leased"]}},
+            {"$set": {"status": "cancelled", "completed_at": datetime.utcnow()}},
+        )
+        return result.modified_count
+
+    async def fail_exhausted(self, max_attempts: int) -> List[Dict[str, Any]]:
+        """Mark scans out of attempts (lease expired or requeued after the last one) as failed and return them"""
+        query = {
+            "$or": [
+                {"status": "leased", "lease_expires_at": {"$lt": datetime.utcnow()}},
+                {"status": "queued"},
+            ],
+            "attempts": {"$gte": max_attempts},
+        }
+        exhausted = await self.find_all(query, projection={"user_id": 1, "attempts": 1})
+        if exhausted:
+            await self.collection.update_many(
+                {"_id": {"$in": [doc["_id"] for doc in exhausted]}, **query},
+                {"$set": {"status": "failed", "completed_at": datetime.utcnow(), "error": "No attempts left"}},
+            )
+        return exhausted
+
+    async def count_by_status(self) -> Dict[str, int]:
+        results = await self.collection.aggregate([
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+        ]).to_list(length=10)
+        return {r["_id"]: r["count"] for r in results}
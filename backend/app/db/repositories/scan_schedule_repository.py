@@ -0,0 +1,64 @@
+from typing import List, Optional, Dict, Any
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from datetime import datetime
+from backend.app.db.repositories.base_repository import BaseRepository
+
+class ScanScheduleRepository(BaseRepository):
+    """Auto-scan schedule per user (_id is the user id)"""
+
+    indexes = [
+        IndexModel([("enabled", ASCENDING), ("next_run_at", ASCENDING)], name="enabled_next_run_at"),
+    ]
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        super().__init__(db, "scan_schedules")
+
+    async def get_schedule(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return await self.find_one({"_id": user_id})
+
+    async def set_schedule(self, user_id: str, enabled: bool, next_run_at: Optional[datetime]):
+        await self.collection.update_one(
+            {"_id": user_id},
+            {"$set": {"enabled": enabled, "next_run_at": next_run_at, "updated_at": datetime.utcnow()}},
+            upsert=True,
+        )
+
+    async def add_missing(self, schedules: Dict[str, datetime]) -> int:
+        """Create enabled schedules for users that have none yet"""
+        created = 0
+        for user_id, next_run_at in schedules.items():
+            result = await self.collection.update_one(
+                {"_id": user_id},
+                {"$setOnInsert": {"enabled": True, "next_run_at": next_run_at, "updated_at": datetime.utcnow()}},
+                upsert=True,
+            )
+            created += 1 if result.upserted_id is not None else 0
+        return created
+
+    async def find_due(self, now: datetime, limit: int) -> List[Dict[str, Any]]:
+        """Enabled schedules whose slot has passed, most overdue first"""
+        return await self.find_all(
+            {"enabled": True, "next_run_at": {"$lte": now}},
+            limit=limit,
+            sort=[("next_run_at", ASCENDING)],
+        )
+
+    async def advance(self, user_id: str, due_at: datetime, next_run_at: datetime) -> bool:
+        """
+        Move a schedule from due_at to next_run_at. Only one scheduler wins for a
+        given slot, so running several schedulers never enqueues a slot twice.
+        """
+        doc = await self.collection.find_one_and_update(
+            {"_id": user_id, "enabled": True, "next_run_at": due_at},
+            {"$set": {"next_run_at": next_run_at, "last_due_at": due_at, "updated_at": datetime.utcnow()}},
+            projection={"_id": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        return doc is not None
+
+    async def record_enqueued(self, user_id: str, scan_run_id: str):
+        await self.collection.update_one(
+            {"_id": user_id},
+            {"$set": {"last_scan_run_id": scan_run_id, "last_enqueued_at": datetime.utcnow()}},
+        )
@@ -0,0 +1,45 @@
+from typing import List, Optional, Dict, Any
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel, UpdateOne
+from datetime import datetime
+from backend.app.db.repositories.base_repository import BaseRepository
+
+class ScanStateRepository(BaseRepository):
+    """
+    Incremental scan state, one document per (user, source, search); _id is
+    "<user_id>:<search_key>". Holds the newest posted_at seen (posted_at_mark) and
+    the most recent seen source ids (seen_ids, oldest first).
+    """
+
+    indexes = [
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+    ]
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        super().__init__(db, "scan_state")
+
+    async def get_state(self, user_id: str, search_key: str) -> Optional[Dict[str, Any]]:
+        return await self.find_one({"_id": f"{user_id}:{search_key}"})
+
+    async def save_states(self, user_id: str, states: List[Dict[str, Any]], max_seen_ids: int):
+        """
+        Advance the state of several searches. Each entry has search_key, source,
+        seen_ids (new ids only) and an optional posted_at_mark; marks never move back.
+        """
+        now = datetime.utcnow()
+        requests = []
+        for state in states:
+            update: Dict[str, Any] = {
+                "$set": {"user_id": user_id, "source": state["source"], "updated_at": now},
+                "$push": {"seen_ids": {"$each": state["seen_ids"], "$slice": -max_seen_ids}},
+            }
+            if state.get("posted_at_mark") is not None:
+                update["$max"] = {"posted_at_mark": state["posted_at_mark"]}
+            requests.append(UpdateOne({"_id": f"{user_id}:{state['search_key']}"}, update, upsert=True))
+        if requests:
+            await self.collection.bulk_write(requests, ordered=False)
+
+    async def delete_for_user(self, user_id: str) -> int:
+        """Forget every mark of a user, so the next scan looks at everything again"""
+        result = await self.collection.delete_many({"user_id": user_id})
+        return result.deleted_count
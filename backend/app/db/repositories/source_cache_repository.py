@@ -0,0 +1,39 @@
+from typing import List, Dict, Any
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel, ReplaceOne
+from datetime import datetime
+from backend.app.db.repositories.base_repository import BaseRepository
+
+class SourceCacheRepository(BaseRepository):
+    """Raw scout results shared by every user, one document per result page"""
+
+    indexes = [
+        # expires_at is the end of the stale window; MongoDB removes the page after that
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+        IndexModel([("search_key", ASCENDING), ("page", ASCENDING)], name="search_key_page"),
+    ]
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        super().__init__(db, "source_cache")
+
+    async def get_pages(self, search_key: str) -> List[Dict[str, Any]]:
+        """Unexpired pages of a search, in page order"""
+        return await self.find_all(
+            {"search_key": search_key, "expires_at": {"$gt": datetime.utcnow()}},
+            limit=50,
+            sort=[("page", ASCENDING)],
+        )
+
+    async def set_pages(self, search_key: str, entry: Dict[str, Any], pages: List[List[Dict[str, Any]]]):
+        """Replace the cached pages of a search"""
+        requests = [
+            ReplaceOne(
+                {"_id": f"{search_key}:{number}"},
+                {**entry, "search_key": search_key, "page": number, "page_count": len(pages), "jobs": jobs},
+                upsert=True,
+            )
+            for number, jobs in enumerate(pages)
+        ]
+        await self.collection.bulk_write(requests, ordered=False)
+        # A refresh may come back with fewer pages than before
+        await self.collection.delete_many({"search_key": search_key, "page": {"$gte": len(pages)}})
@@ -1,11 +1,13 @@
 from pathlib import Path
 import sys
 from typing import Dict, List, Optional
-from unittest import IsolatedAsyncioTestCase
+from unittest import IsolatedAsyncioTestCase, TestCase
 
 sys.path.append(str(Path(__file__).resolve().parents[4]))
 
-from backend.app.db.repositories.base_repository import BaseRepository
+from pymongo import IndexModel
+
+from backend.app.db.repositories.base_repository import BaseRepository, diff_indexes, _has_collscan
 from backend.app.db.repositories.scan_history_repository import ScanHistoryRepository
 
 
@@ -123,3 +125,34 @@ class BaseRepositoryTest(IsolatedAsyncioTestCase):
         scans = await self.scan_repo.list_scans(user_id="user-1", limit=5)
         self.assertEqual([scan["_id"] for scan in scans], ["2", "3", "1"])
 
+
+class IndexDriftTest(TestCase):
+    def setUp(self):
+        self.declared = [
+            IndexModel([("user_id", 1), ("started_at", -1)], name="user_started_at"),
+            IndexModel([("clerk_user_id", 1)], name="clerk_user_id", unique=True),
+            IndexModel([("expires_at", 1)], name="ttl", expireAfterSeconds=0),
+        ]
+
+    def test_reports_missing_changed_and_extra_indexes(self):
+        existing = {
+            "_id_": {"key": [("_id", 1)], "v": 2},
+            "user_started_at": {"key": [("user_id", 1), ("started_at", -1)], "v": 2},
+            "clerk_user_id": {"key": [("clerk_user_id", 1)], "v": 2},
+            "legacy": {"key": [("status", 1)], "v": 2},
+        }
+        drift = diff_indexes(self.declared, existing)
+        self.assertEqual(drift, {"missing": ["ttl"], "changed": ["clerk_user_id"], "extra": ["legacy"]})
+
+    def test_matching_indexes_have_no_drift(self):
+        existing = {
+            "user_started_at": {"key": [("user_id", 1), ("started_at", -1.0)], "v": 2},
+            "clerk_user_id": {"key": [("clerk_user_id", 1)], "unique": True, "v": 2},
+            "ttl": {"key": [("expires_at", 1)], "expireAfterSeconds": 0, "v": 2},
+        }
+        self.assertEqual(diff_indexes(self.declared, existing), {"missing": [], "changed": [], "extra": []})
+
+    def test_detects_nested_collscan(self):
+        plan = {"stage": "LIMIT", "inputStage": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}}
+        self.assertTrue(_has_collscan(plan))
+        self.assertFalse(_has_collscan({"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}))
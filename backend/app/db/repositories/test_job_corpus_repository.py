@@ -0,0 +1,63 @@
+from pathlib import Path
+import sys
+from unittest import TestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[4]))
+
+from backend.app.db.repositories.job_corpus_repository import split_job_document, merge_job_document
+
+
+def job_document(**overrides):
+    doc = {
+        "_id": "u1:abc",
+        "user_id": "u1",
+        "source": "google_jobs",
+        "title": "Python Engineer",
+        "company": "Acme",
+        "description": "A long description",
+        "listing_url": "https://example.com/1",
+        "match_score": 0.9,
+        "status": "new",
+        "metadata": {
+            "fingerprint": "fp1",
+            "raw_key": "rk1",
+            "raw_payload": {"id": "abc"},
+            "normalization_path": "fast_path",
+        },
+    }
+    doc.update(overrides)
+    return doc
+
+
+class SplitJobDocumentTest(TestCase):
+    def test_posting_holds_the_content_and_the_match_references_it(self):
+        posting, match = split_job_document(job_document())
+
+        self.assertEqual(posting["_id"], "fp1")
+        self.assertEqual(posting["raw_keys"], ["rk1"])
+        self.assertEqual(posting["raw_payload"], {"id": "abc"})
+        self.assertEqual(posting["description"], "A long description")
+        self.assertEqual(match["job_id"], "fp1")
+        self.assertNotIn("description", match)
+        self.assertNotIn("raw_payload", match["metadata"])
+        self.assertEqual((match["title"], match["match_score"]), ("Python Engineer", 0.9))
+
+    def test_job_rebuilt_from_corpus_does_not_clear_stored_payload(self):
+        doc = job_document()
+        doc["metadata"] = {"fingerprint": "fp1", "raw_key": "rk2", "normalization_path": "corpus"}
+        posting, _ = split_job_document(doc)
+
+        self.assertNotIn("raw_payload", posting)
+        self.assertNotIn("normalization_path", posting)
+
+    def test_merge_restores_the_full_document(self):
+        posting, match = split_job_document(job_document())
+        merged = merge_job_document(match, posting)
+
+        self.assertEqual(merged["description"], "A long description")
+        self.assertEqual(merged["_id"], "u1:abc")
+        self.assertEqual(merged["match_score"], 0.9)
+
+    def test_legacy_document_without_posting_is_returned_as_is(self):
+        legacy = job_document()
+        self.assertIs(merge_job_document(legacy, None), legacy)
@@ -1,9 +1,14 @@
 from typing import List, Dict, Any, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from datetime import datetime
 from backend.app.db.repositories.base_repository import BaseRepository
 
 class TimelineRepository(BaseRepository):
+    indexes = [
+        IndexModel([("user_id", ASCENDING), ("timestamp", DESCENDING)], name="user_timestamp"),
+    ]
+
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, "run_logs")
     
@@ -30,3 +35,8 @@ class TimelineRepository(BaseRepository):
             "metadata": metadata or {}
         }
         await self.create(log)
+
+    async def add_steps(self, logs: List[Dict[str, Any]]):
+        """Insert several log entries in one round trip"""
+        if logs:
+            await self.collection.insert_many(logs, ordered=False)
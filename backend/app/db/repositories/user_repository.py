@@ -1,12 +1,56 @@
-from typing import Optional
+from typing import List, Optional, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel
 from backend.app.db.models import User
 from backend.app.db.repositories.base_repository import BaseRepository
 
+# What most routes need to authorize a request: ids plus the small profile fields,
+# without the resume text and work history
+SLIM_USER_PROJECTION = {
+    "clerk_user_id": 1,
+    "email": 1,
+    "profile.name": 1,
+    "profile.skills": 1,
+    "profile.keywords": 1,
+    "profile.experience_years": 1,
+    "profile.preferences": 1,
+}
+
 class UserRepository(BaseRepository):
+    indexes = [
+        IndexModel([("clerk_user_id", ASCENDING)], name="clerk_user_id"),
+        IndexModel([("email", ASCENDING)], name="email"),
+    ]
+
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, "users")
 
     async def get_by_email(self, email: str) -> Optional[User]:
         data = await self.find_one({"email": email})
         return User(**data) if data else None
+
+    async def get_by_clerk_id(self, clerk_user_id: str, projection: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+        return await self.find_one({"clerk_user_id": clerk_user_id}, projection=projection)
+
+    async def get_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Full profile of a user, including resume text"""
+        data = await self.find_one({"_id": user_id}, projection={"profile": 1})
+        return data.get("profile", {}) if data else None
+
+    async def get_preferences(self, user_id: str) -> Optional[Dict[str, Any]]:
+        data = await self.find_one({"_id": user_id}, projection={"profile.preferences": 1})
+        return data.get("profile", {}).get("preferences", {}) if data else None
+
+    async def find_ids_with_preference(self, key: str, value: Any) -> List[str]:
+        """Ids of users whose profile preference key equals value"""
+        cursor = self.collection.find({f"profile.preferences.{key}": value}, projection={"_id": 1})
+        return [doc["_id"] for doc in await cursor.to_list(length=None)]
+
+    async def update_fields(self, user_id: str, fields: Dict[str, Any]) -> Optional[str]:
+        """$set fields on a user and return its clerk_user_id, or None if the user does not exist"""
+        data = await self.collection.find_one_and_update(
+            {"_id": user_id},
+            {"$set": fields},
+            projection={"clerk_user_id": 1},
+        )
+        return data.get("clerk_user_id", "") if data else None
@@ -0,0 +1,52 @@
+from pathlib import Path
+import sys
+from typing import Dict, List
+from unittest import IsolatedAsyncioTestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from pymongo.errors import OperationFailure
+
+from backend.app.db.indexes import INDEXED_REPOSITORIES, apply_indexes, format_drift
+from backend.app.db.repositories.job_repository import JobRepository
+
+
+class IndexedCollection:
+    def __init__(self, name: str, fail: bool = False):
+        self.name = name
+        self.fail = fail
+        self.created: List[str] = []
+
+    async def index_information(self) -> Dict[str, Dict]:
+        return {"_id_": {"key": [("_id", 1)], "v": 2}}
+
+    async def create_indexes(self, models):
+        if self.fail:
+            raise OperationFailure("E11000 duplicate key error")
+        self.created.extend(model.document["name"] for model in models)
+
+
+class IndexedDatabase:
+    def __init__(self, failing: str):
+        self.failing = failing
+        self.collections: Dict[str, IndexedCollection] = {}
+
+    def __getitem__(self, name: str) -> IndexedCollection:
+        return self.collections.setdefault(name, IndexedCollection(name, fail=name == self.failing))
+
+
+class ApplyIndexesTest(IsolatedAsyncioTestCase):
+    async def test_failing_collection_does_not_skip_the_others(self):
+        failing = JobRepository(IndexedDatabase("")).collection.name
+        database = IndexedDatabase(failing)
+
+        report = await apply_indexes(database)
+
+        self.assertEqual(len(report), len(INDEXED_REPOSITORIES))
+        self.assertIn("duplicate key", report[failing]["errors"][0])
+        self.assertTrue(report[failing]["missing"])
+        for name, collection in database.collections.items():
+            if name != failing:
+                self.assertNotIn("errors", report[name])
+                self.assertEqual(sorted(collection.created), sorted(report[name]["missing"]))
+        self.assertTrue(any("index build failed" in line for line in format_drift(report)))
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from backend.core.config import settings
@@ -9,16 +10,56 @@ from backend.app.api.outreach import templates as outreach_templates
 from backend.app.api.agents import timeline as agents_timeline
 from backend.app.api.agents import history as agents_history
 from backend.app.db.mongo import db
+from backend.app.db.indexes import apply_indexes, format_drift
+from backend.app.utils.timeline import timeline_writer
+from backend.app.utils.event_relay import ensure_event_collection, relay_events_to_subscribers
+from backend.app.agents.browser_pool import browser_pool
+from backend.app.agents.http_client import close_http_session
+from backend.app.agents.prompt_registry import prompt_registry
 
 app = FastAPI(title="Auto Job Hunter API", version="1.0.0")
 
+# Republishes run events from the scan workers to this process's SSE subscribers
+_event_relay_task = None
+# Reloads edited prompt files (PROMPT_RELOAD, development only)
+_prompt_watch_task = None
+
 # Database lifecycle events
 @app.on_event("startup")
 async def startup_event():
+    global _event_relay_task, _prompt_watch_task
+    # A missing or broken prompt file fails startup instead of a scan
+    prompt_registry.load()
+    if settings.PROMPT_RELOAD:
+        _prompt_watch_task = asyncio.create_task(prompt_registry.watch())
     db.connect()
+    if settings.MONGO_APPLY_INDEXES_ON_STARTUP:
+        try:
+            report = await apply_indexes(db.get_db())
+            for line in format_drift(report):
+                print(f"Index drift: {line}")
+        except Exception as e:
+            print(f"Failed to apply indexes: {e}")
+    try:
+        await ensure_event_collection(db.get_db())
+        _event_relay_task = asyncio.create_task(relay_events_to_subscribers(db.get_db()))
+    except Exception as e:
+        print(f"Failed to start run event relay: {e}")
+    if settings.BROWSER_WARM_ON_STARTUP:
+        try:
+            await browser_pool.start()
+        except Exception as e:
+            print(f"Failed to start browser pool: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    for task in (_event_relay_task, _prompt_watch_task):
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    await timeline_writer.close()
+    await browser_pool.close()
+    await close_http_session()
     db.close()
 
 # CORS Configuration
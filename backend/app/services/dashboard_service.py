@@ -1,8 +1,24 @@
+import asyncio
 from typing import Dict, Any, List
 from datetime import datetime
 from backend.app.db.repositories.job_repository import JobRepository
 from backend.app.db.repositories.scan_history_repository import ScanHistoryRepository
 from backend.app.db.models import JobStatus
+from backend.app.utils.ttl_cache import TTLCache
+from backend.app.utils.events import invalidate, register_invalidation
+from backend.core.config import settings
+
+# Per-user dashboard snapshots, dropped whenever the user's jobs or scans change
+dashboard_snapshots = TTLCache(settings.DASHBOARD_CACHE_TTL_SECONDS, settings.DASHBOARD_CACHE_MAX_USERS)
+
+register_invalidation("dashboard", dashboard_snapshots.invalidate)
+
+def invalidate_dashboard_stats(user_id: str):
+    """
+    Call after inserting jobs, changing a job's status or finishing a scan for user_id.
+    From a scan worker the invalidation also reaches the API processes (event_relay).
+    """
+    invalidate(user_id, "dashboard")
 
 class DashboardService:
     def __init__(self, db):
@@ -35,27 +51,36 @@ class DashboardService:
             return "Just now"
 
     async def get_stats(self, user_id: str) -> Dict[str, Any]:
-        # Get basic counts
-        matched_count = await self.job_repo.count_by_status(JobStatus.MATCHED.value, user_id)
-        applied_count = await self.job_repo.count_by_status(JobStatus.APPLIED.value, user_id)
-        new_count = await self.job_repo.count_by_status(JobStatus.NEW.value, user_id)
-        pending_reviews = matched_count + new_count
-
-        # Get total jobs scanned from scan runs
-        total_scanned = await self.history_repo.get_total_scanned(user_id)
+        snapshot = dashboard_snapshots.get(user_id)
+        if snapshot is not None:
+            # Relative times move on even when the data has not changed
+            for item in snapshot["recent_activity"]:
+                item["relative_time"] = self.format_relative_time(item.get("timestamp"))
+            return snapshot
 
-        # Get match score statistics
-        score_stats = await self.job_repo.get_match_score_stats(user_id)
+        version = dashboard_snapshots.version(user_id)
+        stats = await self._compute_stats(user_id)
+        dashboard_snapshots.set(user_id, stats, version=version)
+        return stats
 
-        # Get status breakdown
-        status_breakdown = await self.job_repo.get_status_breakdown(user_id)
+    async def _compute_stats(self, user_id: str) -> Dict[str, Any]:
+        # All job-derived stats in one $facet aggregation, scan history alongside it
+        job_facets, scan_summary = await asyncio.gather(
+            self.job_repo.get_dashboard_facets(user_id, recent_limit=5),
+            self.history_repo.get_dashboard_summary(user_id, recent_limit=5),
+        )
 
-        # Get top sources
-        top_sources = await self.job_repo.count_by_source(user_id)
+        status_breakdown = job_facets["status_breakdown"]
+        matched_count = status_breakdown.get(JobStatus.MATCHED.value, 0)
+        applied_count = status_breakdown.get(JobStatus.APPLIED.value, 0)
+        new_count = status_breakdown.get(JobStatus.NEW.value, 0)
+        pending_reviews = matched_count + new_count
 
-        # Get recent activity
-        recent_runs = await self.history_repo.list_scans(user_id=user_id, limit=5)
-        recent_jobs = await self.job_repo.get_recent_jobs(limit=5, user_id=user_id)
+        total_scanned = scan_summary["total_scanned"]
+        score_stats = job_facets["score_stats"]
+        top_sources = job_facets["top_sources"]
+        recent_runs = scan_summary["recent_scans"]
+        recent_jobs = job_facets["recent_jobs"]
         
         # Build activity feed
         activity = []
@@ -1,9 +1,18 @@
+import asyncio
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from backend.app.db.repositories.job_repository import JobRepository
 from backend.app.db.repositories.run_repository import RunRepository
 from backend.app.db.repositories.scan_history_repository import ScanHistoryRepository
 from backend.app.db.models import Job
+from backend.app.services.dashboard_service import invalidate_dashboard_stats
+from backend.app.utils.pagination import encode_cursor, decode_cursor
+from backend.app.utils.timeline import flush_timeline
+from backend.app.utils.events import publish_event
+from backend.core.config import settings
+
+# Sort keys the job list supports; each has a matching index in JobRepository.indexes
+JOB_SORT_FIELDS = {"created_at", "posted_at", "match_score"}
 
 class JobService:
     def __init__(self, db):
@@ -18,10 +27,12 @@ class JobService:
         from backend.app.agents.supervisor import supervisor_node
         from backend.app.agents.scout import scout_node
         from backend.app.agents.normalizer import normalizer_node
+        from backend.app.agents.dedup import dedup_node
         from backend.app.agents.profiler import profiler_node
         from backend.app.agents.matcher import matcher_node
         from backend.app.agents.outreach import outreach_node
         from backend.app.agents.reviewer import reviewer_node
+        from backend.app.agents.pipeline import run_scan_pipeline
         
         # Build search query from keywords and profile
         search_keywords = keywords or []
@@ -62,23 +73,30 @@ class JobService:
             if "run_meta" in state:
                 state["run_meta"]["scan_run_id"] = state["run_meta"].get("scan_run_id") or scan_run_id
             
-            scout_result = await scout_node(state)
-            state.update(scout_result)
-            
-            norm_result = await normalizer_node(state)
-            state.update(norm_result)
-            
-            prof_result = await profiler_node(state)
-            state.update(prof_result)
-            
-            match_result = await matcher_node(state)
-            state.update(match_result)
-            
-            out_result = await outreach_node(state)
-            state.update(out_result)
-            
-            rev_result = await reviewer_node(state)
-            state.update(rev_result)
+            if settings.SCAN_PIPELINE_STREAMING:
+                pipeline_result = await run_scan_pipeline(state)
+                state.update(pipeline_result)
+            else:
+                scout_result = await scout_node(state)
+                state.update(scout_result)
+
+                norm_result = await normalizer_node(state)
+                state.update(norm_result)
+
+                dedup_result = await dedup_node(state)
+                state.update(dedup_result)
+
+                prof_result = await profiler_node(state)
+                state.update(prof_result)
+
+                match_result = await matcher_node(state)
+                state.update(match_result)
+
+                out_result = await outreach_node(state)
+                state.update(out_result)
+
+                rev_result = await reviewer_node(state)
+                state.update(rev_result)
             
             # Update scan run with results
             if self.db and scan_run_id:
@@ -90,6 +108,12 @@ class JobService:
                 }
                 await self.run_repo.update(scan_run_id, update_data)
                 await self.history_repo.update(scan_run_id, update_data)
+                invalidate_dashboard_stats(user_id)
+            publish_event(user_id, "status", {
+                "status": "completed",
+                "jobs_found": len(state.get("raw_jobs", [])),
+                "jobs_matched": len(state.get("matched_jobs", [])),
+            }, run_id=scan_run_id)
             
             print(f"Scan completed. Matched {len(state['matched_jobs'])} jobs.")
             
@@ -106,9 +130,38 @@ class JobService:
                 }
                 await self.run_repo.update(scan_run_id, update_data)
                 await self.history_repo.update(scan_run_id, update_data)
+                invalidate_dashboard_stats(user_id)
+            publish_event(user_id, "status", {"status": "failed", "error": str(e)}, run_id=scan_run_id)
+        finally:
+            # The run's progress should be readable as soon as the run is
+            await flush_timeline()
+
+    async def list_jobs(
+        self,
+        user_id: str,
+        filters: Dict[str, Any],
+        limit: int = 50,
+        sort_by: str = "created_at",
+        sort_order: str = "desc",
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        One page of matched jobs with filtering and sorting done in Mongo.
+        Returns jobs, the total matching the filters and next_cursor for the following page.
+        Raises ValueError for an unsupported sort key or a cursor from a different sort.
+        """
+        if sort_by not in JOB_SORT_FIELDS:
+            raise ValueError(f"Unsupported sort_by: {sort_by}")
+        sort_order = "asc" if sort_order == "asc" else "desc"
+        direction = 1 if sort_order == "asc" else -1
+
+        after = None
+        if cursor:
+            position = decode_cursor(cursor)
+            if position["sort_by"] != sort_by or position["sort_order"] != sort_order:
+                raise ValueError("Cursor does not match the requested sort")
+            after = (position["value"], position["last_id"])
 
-    async def list_jobs(self, user_id: str, filters: Dict[str, Any], limit: int = 50, sort_by: str = "created_at", sort_order: str = "desc"):
-        """List matched jobs with filtering and sorting"""
         query = {"user_id": user_id}
         
         if filters.get("status"):
@@ -144,55 +197,47 @@ class JobService:
             if date_query:
                 query["posted_at"] = date_query
         
-        # Get jobs
-        jobs = await self.job_repo.find_all(query, limit=limit)
-        
-        # Convert to dicts if needed
-        if jobs and not isinstance(jobs[0], dict):
-            jobs = [job.model_dump(by_alias=True) if hasattr(job, 'model_dump') else job for job in jobs]
-        
-        # Sort jobs
-        if sort_by == "posted_at":
-            jobs.sort(key=lambda x: x.get("posted_at") or datetime.min, reverse=(sort_order == "desc"))
-        elif sort_by == "match_score":
-            jobs.sort(key=lambda x: x.get("match_score") or 0, reverse=(sort_order == "desc"))
-        elif sort_by == "created_at":
-            jobs.sort(key=lambda x: x.get("created_at") or x.get("metadata", {}).get("collected_at") or datetime.min, reverse=(sort_order == "desc"))
-        
-        return jobs
+        # Fetch one extra job to know whether another page exists
+        jobs, total = await asyncio.gather(
+            self.job_repo.list_page(query, sort_by, direction, limit + 1, after=after),
+            self.job_repo.count_jobs(query),
+        )
+
+        next_cursor = None
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            last = jobs[-1]
+            next_cursor = encode_cursor(sort_by, sort_order, last.get(sort_by), last["_id"])
+
+        return {"jobs": jobs, "total": total, "next_cursor": next_cursor}
 
     async def get_job(self, job_id: str):
         return await self.job_repo.find_by_id(job_id)
 
-    async def update_status(self, job_id: str, status: str):
-        return await self.job_repo.update(job_id, {"status": status})
+    async def update_status(self, job_id: str, status: str) -> bool:
+        user_id = await self.job_repo.update_status(job_id, status)
+        if user_id is None:
+            return False
+        invalidate_dashboard_stats(user_id)
+        return True
 
-    async def generate_outreach(self, job_id: str, user_profile: dict):
-        from backend.app.agents.outreach import generate_outreach as gen_outreach
-        
-        job_data = await self.job_repo.find_by_id(job_id)
+    async def generate_outreach(self, job_id: str, user_profile: dict, user_id: Optional[str] = None, regenerate: bool = False):
+        """
+        Outreach messages for a job. Messages stored on the job are returned as they are;
+        new ones (or regenerate=True) are generated and stored on the job's outreach field.
+        """
+        from backend.app.agents.outreach import generate_outreach as gen_outreach, has_outreach, outreach_payload
+        
+        job_data = await self.job_repo.find_by_id(job_id, user_id)
         if not job_data:
             return None
         
         job = Job(**job_data)
+        if has_outreach(job) and not regenerate:
+            return outreach_payload(job)
         
-        # Load prompt
-        import os
-        # Adjust path for new location
-        prompt_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "app", "agents", "prompts", "outreach.txt"
-        )
-        
-        # Fallback if file not found (during refactor)
-        if not os.path.exists(prompt_path):
-             prompt_path = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
-                "agents", "prompts", "outreach.txt"
-            )
-
-        with open(prompt_path, "r") as f:
-            system_prompt_template = f.read()
-        
-        result = await gen_outreach(job, user_profile, system_prompt_template)
+        # A regeneration must not be answered from the LLM response cache
+        result = await gen_outreach(job, user_profile, use_cache=not regenerate)
+        if result and has_outreach(job):
+            await self.job_repo.set_outreach(job.id, job.outreach.model_dump())
         return result
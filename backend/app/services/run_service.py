@@ -1,8 +1,13 @@
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Optional
 from datetime import datetime, timedelta
 from backend.app.db.repositories.run_repository import RunRepository
 from backend.app.db.repositories.timeline_repository import TimelineRepository
 from backend.app.db.repositories.scan_history_repository import ScanHistoryRepository
+from backend.app.db.repositories.scan_queue_repository import ScanQueueRepository
+from backend.app.utils.events import run_events, publish_event, format_sse
+from backend.app.utils.timeline import log_step
+from backend.core.config import settings
 
 
 class RunService:
@@ -10,6 +15,7 @@ class RunService:
         self.run_repo = RunRepository(db)
         self.timeline_repo = TimelineRepository(db)
         self.history_repo = ScanHistoryRepository(db)
+        self.queue_repo = ScanQueueRepository(db)
 
     async def get_status(self) -> Dict[str, Any]:
         # Check history_repo for running scans
@@ -64,8 +70,9 @@ class RunService:
         # Assuming clerk_user_id passed here is actually the mongo ID for now, or we need to look it up.
         # Given the route passes "manual_trigger", we might have an issue. 
         # But let's just log it.
-        await self.timeline_repo.add_step(user_id, "Agent started manually", run_id=run_id)
-        await self.timeline_repo.add_step(user_id, "Initializing search parameters...", run_id=run_id)
+        publish_event(user_id, "status", {"status": "running"}, run_id=run_id)
+        await log_step(user_id, "Agent started manually", run_id=run_id)
+        await log_step(user_id, "Initializing search parameters...", run_id=run_id)
 
         return run_id
 
@@ -80,6 +87,9 @@ class RunService:
         if not last_run:
             raise ValueError("No active run to stop")
 
+        # Queued scans are dropped; a running one stops when its worker renews the lease
+        await self.queue_repo.cancel_for_user(user_id)
+
         await self.history_repo.end_scan(
             last_run["_id"],
             {
@@ -90,7 +100,8 @@ class RunService:
             },
         )
 
-        await self.timeline_repo.add_step(user_id, "Agent stopped by user", run_id=last_run["_id"])
+        publish_event(user_id, "status", {"status": "stopped"}, run_id=last_run["_id"])
+        await log_step(user_id, "Agent stopped by user", run_id=last_run["_id"])
 
     async def get_timeline(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         logs = await self.timeline_repo.get_recent_logs(user_id=user_id, limit=limit)
@@ -106,6 +117,33 @@ class RunService:
             )
         return timeline
 
+    async def stream_events(
+        self,
+        user_id: str,
+        run_id: Optional[str] = None,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Server-Sent Events for a user's runs (optionally a single run): timeline steps,
+        status changes and pipeline progress as they are published, plus heartbeats.
+        """
+        queue = run_events.subscribe(user_id)
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if is_disconnected and await is_disconnected():
+                        return
+                    yield ": heartbeat\n\n"
+                    continue
+                if run_id and event.get("run_id") != run_id:
+                    continue
+                yield format_sse(event)
+        finally:
+            run_events.unsubscribe(user_id, queue)
+
     async def get_last_completed_run(self):
         # We need user_id. Assuming we can get it or just return the global last for now (since we don't have user_id context here easily without changing signature).
         # But wait, get_last_completed_run is called by route which has db dependency but not user_id passed to service method?
@@ -0,0 +1,197 @@
+import asyncio
+import os
+import socket
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+from uuid import uuid4
+from backend.app.db.repositories.scan_queue_repository import ScanQueueRepository
+from backend.app.db.repositories.scan_history_repository import ScanHistoryRepository
+from backend.app.services.dashboard_service import invalidate_dashboard_stats
+from backend.app.utils.events import publish_event
+from backend.core.config import settings
+
+
+class ScanQueueService:
+    """Enqueues scans for the scan workers; the API never runs a scan itself"""
+
+    def __init__(self, db):
+        self.queue_repo = ScanQueueRepository(db)
+
+    async def enqueue_scan(
+        self,
+        scan_run_id: str,
+        user_id: str,
+        sources: Optional[List[str]] = None,
+        match_threshold: float = 0.7,
+        keywords: Optional[List[str]] = None,
+        location: Optional[str] = None,
+        priority: int = 0,
+        available_at: Optional[datetime] = None,
+    ) -> str:
+        payload = {
+            "sources": sources,
+            "match_threshold": match_threshold,
+            "keywords": keywords,
+            "location": location,
+        }
+        return await self.queue_repo.enqueue(scan_run_id, user_id, payload, priority, available_at)
+
+    async def cancel_user_scans(self, user_id: str) -> int:
+        return await self.queue_repo.cancel_for_user(user_id)
+
+    async def get_stats(self) -> Dict[str, int]:
+        return await self.queue_repo.count_by_status()
+
+
+class ScanWorker:
+    """
+    Runs queued scans, up to concurrency at a time.
+    Each claimed scan holds a lease that a heartbeat renews every lease/3 seconds.
+    If the renewal fails (the scan was cancelled or its lease was taken over) the
+    scan is cancelled here; if this process dies the lease expires and another
+    worker runs the scan again.
+    """
+
+    def __init__(
+        self,
+        db,
+        concurrency: int = settings.SCAN_WORKER_CONCURRENCY,
+        lease_seconds: float = settings.SCAN_LEASE_SECONDS,
+        poll_interval: float = settings.SCAN_QUEUE_POLL_SECONDS,
+        max_attempts: int = settings.SCAN_MAX_ATTEMPTS,
+        retry_backoff: float = settings.SCAN_RETRY_BACKOFF_SECONDS,
+    ):
+        self.db = db
+        self.queue_repo = ScanQueueRepository(db)
+        self.history_repo = ScanHistoryRepository(db)
+        self.concurrency = max(1, concurrency)
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._stopping: Optional[asyncio.Event] = None
+        self._running: Set[str] = set()
+
+    async def run(self):
+        """Claim and run scans until stop() is called"""
+        self._stopping = asyncio.Event()
+        print(f"Scan worker {self.worker_id} started with concurrency {self.concurrency}")
+        await asyncio.gather(*[self._slot() for _ in range(self.concurrency)])
+        print(f"Scan worker {self.worker_id} stopped")
+
+    def stop(self):
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def _slot(self):
+        while not self._stopping.is_set():
+            try:
+                scan = await self.queue_repo.claim(self.worker_id, self.lease_seconds, self.max_attempts)
+            except Exception as e:
+                print(f"Failed to claim a scan: {e}")
+                scan = None
+            if scan is None:
+                await self._fail_exhausted()
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._execute(scan)
+            except Exception as e:
+                # Keep the slot alive; the scan is retried later instead of waiting for its lease
+                print(f"Scan {scan['_id']} failed in the worker: {e}")
+                await self._retry_later(scan, e)
+
+    async def _execute(self, scan: Dict[str, Any]):
+        from backend.app.services.job_service import JobService
+        from backend.app.services.user_service import UserService
+
+        scan_run_id = scan["_id"]
+        user_id = scan["user_id"]
+        payload = scan.get("payload", {})
+        print(f"Running scan {scan_run_id} for user {user_id} (attempt {scan.get('attempts', 1)})")
+        self._running.add(scan_run_id)
+        heartbeat = stop_wait = None
+        try:
+            # The profile is read when the scan runs, not when it was queued
+            user_profile = await UserService(self.db).get_profile(user_id) or {}
+            task = asyncio.create_task(JobService(self.db).run_job_scan(
+                user_id,
+                user_profile,
+                payload.get("sources"),
+                payload.get("match_threshold", 0.7),
+                payload.get("keywords"),
+                payload.get("location"),
+                scan_run_id,
+            ))
+            heartbeat = asyncio.create_task(self._heartbeat(scan_run_id, task))
+            stop_wait = asyncio.create_task(self._stopping.wait())
+            await asyncio.wait({task, stop_wait}, return_when=asyncio.FIRST_COMPLETED)
+            if not task.done():
+                # Shutting down: hand the scan back so another worker picks it up now
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                await self.queue_repo.release(scan_run_id, self.worker_id)
+                return
+            if task.cancelled():
+                await self.queue_repo.complete(scan_run_id, self.worker_id, status="cancelled")
+            else:
+                error = task.exception()
+                await self.queue_repo.complete(
+                    scan_run_id, self.worker_id,
+                    status="failed" if error else "done",
+                    error=str(error) if error else None,
+                )
+        finally:
+            for pending in (heartbeat, stop_wait):
+                if pending is not None:
+                    pending.cancel()
+            self._running.discard(scan_run_id)
+
+    async def _retry_later(self, scan: Dict[str, Any], error: Exception):
+        """Requeue a scan that failed outside the job service, backing off exponentially per attempt"""
+        attempts = scan.get("attempts", 1)
+        delay = min(self.retry_backoff * 2 ** (attempts - 1), settings.SCAN_RETRY_BACKOFF_MAX_SECONDS)
+        try:
+            await self.queue_repo.retry_later(scan["_id"], self.worker_id, delay, str(error))
+        except Exception as e:
+            print(f"Failed to requeue scan {scan['_id']}: {e}")
+            return
+        if attempts >= self.max_attempts:
+            await self._fail_exhausted()
+
+    async def _heartbeat(self, scan_run_id: str, task: asyncio.Task):
+        while not task.done():
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                renewed = await self.queue_repo.renew(scan_run_id, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                # Keep running; the next renewal may succeed before the lease runs out
+                print(f"Failed to renew lease for scan {scan_run_id}: {e}")
+                continue
+            if not renewed:
+                print(f"Scan {scan_run_id} was cancelled or taken over, stopping it")
+                task.cancel()
+                return
+
+    async def _fail_exhausted(self):
+        try:
+            exhausted = await self.queue_repo.fail_exhausted(self.max_attempts)
+        except Exception as e:
+            print(f"Failed to check for exhausted scans: {e}")
+            return
+        for scan in exhausted:
+            error = f"Scan did not finish after {scan.get('attempts')} attempts"
+            try:
+                await self.history_repo.update(scan["_id"], {
+                    "status": "failed",
+                    "completed_at": datetime.utcnow(),
+                    "error": error,
+                })
+            except Exception as e:
+                print(f"Failed to mark scan {scan['_id']} as failed: {e}")
+            invalidate_dashboard_stats(scan.get("user_id", ""))
+            publish_event(scan.get("user_id", ""), "status", {"status": "failed", "error": error}, run_id=scan["_id"])
@@ -0,0 +1,132 @@
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from backend.app.db.repositories.scan_schedule_repository import ScanScheduleRepository
+from backend.app.db.repositories.scan_queue_repository import ScanQueueRepository
+from backend.app.db.repositories.scan_history_repository import ScanHistoryRepository
+from backend.app.db.repositories.user_repository import UserRepository
+from backend.app.services.scan_queue_service import ScanQueueService
+from backend.app.utils.timeline import log_step
+from backend.core.config import settings
+
+
+def slot_offset(user_id: str, window_seconds: int) -> int:
+    """A user's stable position inside the daily scan window"""
+    digest = hashlib.sha256(user_id.encode("utf-8")).hexdigest()
+    return int(digest[:12], 16) % max(1, window_seconds)
+
+
+def next_slot(user_id: str, after: datetime) -> datetime:
+    """
+    The user's first scan slot strictly after `after`.
+    Slots repeat every AUTO_SCAN_INTERVAL_HOURS from AUTO_SCAN_WINDOW_START_HOUR (UTC)
+    plus the user's offset, which spreads users evenly over AUTO_SCAN_WINDOW_HOURS.
+    """
+    interval = timedelta(hours=settings.AUTO_SCAN_INTERVAL_HOURS)
+    window_seconds = int(settings.AUTO_SCAN_WINDOW_HOURS * 3600)
+    slot = after.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(
+        hours=settings.AUTO_SCAN_WINDOW_START_HOUR,
+        seconds=slot_offset(user_id, window_seconds),
+    )
+    while slot - interval > after:
+        slot -= interval
+    while slot <= after:
+        slot += interval
+    return slot
+
+
+class SchedulerService:
+    def __init__(self, db):
+        self.schedule_repo = ScanScheduleRepository(db)
+        self.queue_repo = ScanQueueRepository(db)
+        self.history_repo = ScanHistoryRepository(db)
+        self.user_repo = UserRepository(db)
+        self.queue_service = ScanQueueService(db)
+
+    async def set_auto_scan(self, user_id: str, enabled: bool) -> Optional[datetime]:
+        """Turn a user's auto-scan on or off and return the next slot"""
+        next_run_at = next_slot(user_id, datetime.utcnow()) if enabled else None
+        await self.schedule_repo.set_schedule(user_id, enabled, next_run_at)
+        return next_run_at
+
+    async def get_next_scan(self, user_id: str) -> Dict[str, Any]:
+        schedule = await self.schedule_repo.get_schedule(user_id)
+        if not schedule or not schedule.get("enabled"):
+            return {"next_scan": None, "auto_scan_enabled": False}
+        return {"next_scan": schedule.get("next_run_at"), "auto_scan_enabled": True}
+
+    async def add_missing_schedules(self) -> int:
+        """Schedule users that enabled auto-scan before schedules were stored"""
+        now = datetime.utcnow()
+        user_ids = await self.user_repo.find_ids_with_preference("auto_scan_enabled", True)
+        return await self.schedule_repo.add_missing({user_id: next_slot(user_id, now) for user_id in user_ids})
+
+    async def enqueue_due(self, limit: int = settings.AUTO_SCAN_MAX_PER_TICK) -> int:
+        """
+        Enqueue scans for up to limit due schedules, most overdue first. Slots missed
+        while no scheduler was running are caught up with one scan per user; anything
+        beyond limit stays due for the next tick, so a backlog is spread out too.
+        """
+        now = datetime.utcnow()
+        enqueued = 0
+        for schedule in await self.schedule_repo.find_due(now, limit):
+            user_id = schedule["_id"]
+            due_at = schedule["next_run_at"]
+            if not await self.schedule_repo.advance(user_id, due_at, next_slot(user_id, now)):
+                continue  # Another scheduler took this slot
+
+            preferences = await self.user_repo.get_preferences(user_id)
+            if not preferences or not preferences.get("auto_scan_enabled"):
+                await self.schedule_repo.set_schedule(user_id, False, None)
+                continue
+            if await self.queue_repo.has_active(user_id):
+                print(f"Auto-scan for {user_id} skipped, a scan is already queued or running")
+                continue
+
+            scan_run_id = await self.history_repo.start_scan(user_id)
+            # Oldest slot first among auto-scans; manual scans (priority 0) go ahead of them
+            await self.queue_service.enqueue_scan(
+                scan_run_id,
+                user_id,
+                priority=settings.AUTO_SCAN_PRIORITY,
+                available_at=due_at,
+            )
+            await self.schedule_repo.record_enqueued(user_id, scan_run_id)
+            await log_step(user_id, "Auto-scan queued", run_id=scan_run_id)
+            enqueued += 1
+        return enqueued
+
+
+class AutoScanScheduler:
+    """Runs SchedulerService.enqueue_due every AUTO_SCAN_TICK_SECONDS until stopped"""
+
+    def __init__(self, db, tick_seconds: float = settings.AUTO_SCAN_TICK_SECONDS):
+        self.service = SchedulerService(db)
+        self.tick_seconds = tick_seconds
+        self._stopping: Optional[asyncio.Event] = None
+
+    async def run(self):
+        self._stopping = asyncio.Event()
+        try:
+            created = await self.service.add_missing_schedules()
+            if created:
+                print(f"Scheduled auto-scan for {created} users")
+        except Exception as e:
+            print(f"Failed to add missing auto-scan schedules: {e}")
+
+        while not self._stopping.is_set():
+            try:
+                enqueued = await self.service.enqueue_due()
+                if enqueued:
+                    print(f"Auto-scan scheduler queued {enqueued} scans")
+            except Exception as e:
+                print(f"Auto-scan scheduler tick failed: {e}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.tick_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        if self._stopping is not None:
+            self._stopping.set()
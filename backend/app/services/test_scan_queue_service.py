@@ -0,0 +1,84 @@
+from pathlib import Path
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.services.job_service import JobService
+from backend.app.services.scan_queue_service import ScanWorker
+from backend.app.services.user_service import UserService
+
+
+class FakeScanQueueRepository:
+    """One queued scan, with the claim/complete/retry rules of ScanQueueRepository"""
+
+    def __init__(self, worker: ScanWorker):
+        self.worker = worker
+        self.scan = {
+            "_id": "scan-1", "user_id": "user-1", "payload": {}, "status": "queued",
+            "attempts": 0, "available_at": datetime.utcnow(), "lease_owner": None,
+        }
+
+    async def claim(self, worker_id, lease_seconds, max_attempts):
+        scan = self.scan
+        if scan["status"] == "queued" and scan["available_at"] <= datetime.utcnow() and scan["attempts"] < max_attempts:
+            scan.update(status="leased", lease_owner=worker_id, attempts=scan["attempts"] + 1)
+            return dict(scan)
+        # Nothing claimable: stop after this poll
+        self.worker.stop()
+        return None
+
+    async def renew(self, scan_run_id, worker_id, lease_seconds):
+        return True
+
+    async def complete(self, scan_run_id, worker_id, status="done", error=None):
+        raise RuntimeError("connection reset")
+
+    async def retry_later(self, scan_run_id, worker_id, delay_seconds, error):
+        self.scan.update(
+            status="queued", lease_owner=None, error=error,
+            available_at=datetime.utcnow() + timedelta(seconds=delay_seconds),
+        )
+
+    async def fail_exhausted(self, max_attempts):
+        if self.scan["status"] == "queued" and self.scan["attempts"] >= max_attempts:
+            self.scan["status"] = "failed"
+            return [dict(self.scan)]
+        return []
+
+
+class ScanWorkerRetryTest(TestCase):
+    def run_worker(self, max_attempts: int) -> FakeScanQueueRepository:
+        worker = ScanWorker(MagicMock(), concurrency=1, poll_interval=0, max_attempts=max_attempts, retry_backoff=30)
+        repo = worker.queue_repo = FakeScanQueueRepository(worker)
+        worker.history_repo = MagicMock()
+
+        async def get_profile(self, user_id):
+            return {}
+
+        async def run_job_scan(self, *args):
+            return None
+
+        async def update(scan_run_id, data):
+            return None
+
+        worker.history_repo.update = update
+        with patch.object(UserService, "get_profile", get_profile), patch.object(JobService, "run_job_scan", run_job_scan):
+            asyncio.run(worker.run())
+        return repo
+
+    def test_failed_complete_is_retried_later_and_keeps_the_attempt(self):
+        repo = self.run_worker(max_attempts=3)
+
+        self.assertEqual(repo.scan["status"], "queued")
+        self.assertEqual(repo.scan["attempts"], 1)
+        self.assertGreater(repo.scan["available_at"], datetime.utcnow() + timedelta(seconds=20))
+
+    def test_scan_fails_once_out_of_attempts(self):
+        repo = self.run_worker(max_attempts=1)
+
+        self.assertEqual(repo.scan["status"], "failed")
+        self.assertEqual(repo.scan["attempts"], 1)
@@ -0,0 +1,35 @@
+from pathlib import Path
+import sys
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.services.scheduler_service import next_slot
+from backend.core.config import settings
+
+
+class NextSlotTest(TestCase):
+    def test_slots_fall_inside_the_window_and_spread_users(self):
+        after = datetime(2025, 1, 1, 0, 0)
+        window_start = after + timedelta(hours=settings.AUTO_SCAN_WINDOW_START_HOUR)
+        window_end = window_start + timedelta(hours=settings.AUTO_SCAN_WINDOW_HOURS)
+
+        slots = [next_slot(f"user-{idx}", after) for idx in range(200)]
+
+        self.assertTrue(all(window_start <= slot < window_end for slot in slots))
+        # No single minute holds more than a few users
+        per_minute = {}
+        for slot in slots:
+            key = slot.replace(second=0)
+            per_minute[key] = per_minute.get(key, 0) + 1
+        self.assertLessEqual(max(per_minute.values()), 5)
+
+    def test_slot_is_stable_and_strictly_after(self):
+        after = datetime(2025, 1, 1, 12, 0)
+        slot = next_slot("user-1", after)
+
+        self.assertGreater(slot, after)
+        self.assertLessEqual(slot - after, timedelta(hours=settings.AUTO_SCAN_INTERVAL_HOURS))
+        self.assertEqual(next_slot("user-1", slot), slot + timedelta(hours=settings.AUTO_SCAN_INTERVAL_HOURS))
+        self.assertEqual(next_slot("user-1", slot - timedelta(seconds=1)), slot)
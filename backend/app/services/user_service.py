@@ -1,20 +1,66 @@
 from typing import Optional, Dict, Any
-from backend.app.db.repositories.user_repository import UserRepository
+from backend.app.db.repositories.user_repository import UserRepository, SLIM_USER_PROJECTION
+from backend.app.db.repositories.scan_state_repository import ScanStateRepository
 from backend.app.db.models import User
+from backend.app.utils.ttl_cache import TTLCache
+from backend.core.config import settings
+
+# clerk_user_id -> slim user document, shared by every request in the process
+user_resolution_cache = TTLCache(settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MAX_ENTRIES)
+
+# Preferences that change neither what a scan searches for nor how jobs are scored
+SCAN_NEUTRAL_PREFERENCES = {"auto_scan_enabled"}
 
 class UserService:
     def __init__(self, db):
         self.db = db
         self.user_repo = UserRepository(db)
+        self.scan_state_repo = ScanStateRepository(db)
 
     async def get_user_by_clerk_id(self, clerk_user_id: str) -> Optional[Dict[str, Any]]:
-        return await self.user_repo.find_one({"clerk_user_id": clerk_user_id})
+        """Full user document; use resolve_user when only the id or slim profile is needed"""
+        return await self.user_repo.get_by_clerk_id(clerk_user_id)
+
+    async def resolve_user(self, clerk_user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        User _id, email and slim profile (no resume or work history) for a clerk id.
+        Served from an in-process TTL cache; unknown users are not cached.
+        """
+        user = user_resolution_cache.get(clerk_user_id)
+        if user is not None:
+            return user
+
+        version = user_resolution_cache.version(clerk_user_id)
+        user = await self.user_repo.get_by_clerk_id(clerk_user_id, projection=SLIM_USER_PROJECTION)
+        if user:
+            user_resolution_cache.set(clerk_user_id, user, version=version)
+        return user
+
+    async def get_profile(self, user_id: str) -> Dict[str, Any]:
+        """Full profile for routes that send it to the agents"""
+        return await self.user_repo.get_profile(user_id) or {}
 
     async def update_profile(self, user_id: str, profile_data: Dict[str, Any]):
-        return await self.user_repo.update(user_id, {"profile": profile_data})
+        clerk_user_id = await self.user_repo.update_fields(user_id, {"profile": profile_data})
+        if clerk_user_id:
+            user_resolution_cache.invalidate(clerk_user_id)
+            # Jobs skipped as already seen were scored against the old profile
+            await self.scan_state_repo.delete_for_user(user_id)
+        return clerk_user_id is not None
+
+    async def set_preference(self, user_id: str, key: str, value: Any):
+        """Update one profile preference without rewriting the rest of the profile"""
+        clerk_user_id = await self.user_repo.update_fields(user_id, {f"profile.preferences.{key}": value})
+        if clerk_user_id:
+            user_resolution_cache.invalidate(clerk_user_id)
+            if key not in SCAN_NEUTRAL_PREFERENCES:
+                await self.scan_state_repo.delete_for_user(user_id)
+        return clerk_user_id is not None
     
     async def create_user(self, user_data: Dict[str, Any]):
         user_id = await self.user_repo.create(user_data)
+        if user_data.get("clerk_user_id"):
+            user_resolution_cache.invalidate(user_data["clerk_user_id"])
         
         # Seed default templates
         from backend.app.services.outreach_service import OutreachService
@@ -0,0 +1,81 @@
+"""
+Carries run events from scan worker processes to the API processes that hold the
+SSE subscribers. Workers append events in batches to a capped Mongo collection and
+every API process follows it with a tailable cursor, republishing each event to
+its local subscribers and applying cache invalidations (e.g. dashboard snapshots).
+"""
+import asyncio
+from typing import Any, Dict
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
+
+from backend.app.utils.events import apply_invalidation, run_events, set_event_relay
+from backend.app.utils.timeline import TimelineWriter
+from backend.core.config import settings
+
+RUN_EVENTS_COLLECTION = "run_events"
+
+
+async def ensure_event_collection(database: AsyncIOMotorDatabase):
+    """Create the capped collection on first use"""
+    if RUN_EVENTS_COLLECTION in await database.list_collection_names():
+        return
+    try:
+        await database.create_collection(
+            RUN_EVENTS_COLLECTION, capped=True, size=settings.RUN_EVENTS_CAPPED_BYTES
+        )
+    except CollectionInvalid:
+        # Another process created it first
+        pass
+
+
+def install_event_forwarder(database: AsyncIOMotorDatabase) -> TimelineWriter:
+    """
+    Send this process's run events to the relay collection instead of local subscribers.
+    Returns the buffered writer; close it at shutdown to send what is left.
+    """
+    collection = database[RUN_EVENTS_COLLECTION]
+
+    async def insert_events(entries):
+        await collection.insert_many(entries, ordered=False)
+
+    writer = TimelineWriter(
+        batch_size=settings.TIMELINE_BATCH_SIZE,
+        flush_interval=settings.RUN_EVENTS_FLUSH_SECONDS,
+        max_buffer=settings.TIMELINE_MAX_BUFFER,
+        sink=insert_events,
+    )
+    set_event_relay(lambda user_id, event: writer.enqueue({"user_id": user_id, "event": event}))
+    return writer
+
+
+def _republish(doc: Dict[str, Any]):
+    user_id = doc.get("user_id", "")
+    event = doc["event"]
+    if event.get("type") == "invalidate":
+        # Cache invalidations apply whether or not anyone is subscribed
+        apply_invalidation(user_id, event)
+    elif run_events.subscriber_count(user_id):
+        run_events.publish(user_id, event)
+
+
+async def relay_events_to_subscribers(database: AsyncIOMotorDatabase):
+    """Follow the relay collection forever, starting after the newest event"""
+    collection = database[RUN_EVENTS_COLLECTION]
+    newest = await collection.find_one({}, sort=[("$natural", -1)], projection={"_id": 1})
+    query: Dict[str, Any] = {"_id": {"$gt": newest["_id"]}} if newest else {}
+    while True:
+        try:
+            cursor = collection.find(query, cursor_type=CursorType.TAILABLE_AWAIT)
+            while cursor.alive:
+                async for doc in cursor:
+                    query = {"_id": {"$gt": doc["_id"]}}
+                    _republish(doc)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Run event relay interrupted: {e}")
+        # Tailable cursors die when the collection is empty; wait and open a new one
+        await asyncio.sleep(1.0)
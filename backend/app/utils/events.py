@@ -0,0 +1,87 @@
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from fastapi.encoders import jsonable_encoder
+from backend.core.config import settings
+
+class RunEventBus:
+    """
+    In-process pub/sub for run progress, keyed by user.
+    Each subscriber gets a bounded queue; a slow subscriber loses its oldest events
+    instead of slowing down the agents that publish.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, []).append(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(user_id, [])
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            self._subscribers.pop(user_id, None)
+
+    def publish(self, user_id: str, event: Dict[str, Any]):
+        for queue in self._subscribers.get(user_id, []):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def subscriber_count(self, user_id: str) -> int:
+        return len(self._subscribers.get(user_id, []))
+
+run_events = RunEventBus(settings.SSE_SUBSCRIBER_QUEUE_SIZE)
+
+# Set in scan worker processes, which have no subscribers of their own: events go to
+# the relay and reach the API processes' subscribers through event_relay.py
+_relay: Optional[Callable[[str, Dict[str, Any]], None]] = None
+
+def set_event_relay(relay: Optional[Callable[[str, Dict[str, Any]], None]]):
+    global _relay
+    _relay = relay
+
+# Per-process caches a scan worker can invalidate in the API processes (name -> invalidate(user_id))
+_invalidation_handlers: Dict[str, Callable[[str], None]] = {}
+
+def register_invalidation(name: str, handler: Callable[[str], None]):
+    _invalidation_handlers[name] = handler
+
+def invalidate(user_id: str, name: str):
+    """Drop a user's entry from a per-process cache here and, from a scan worker, in every API process"""
+    handler = _invalidation_handlers.get(name)
+    if handler is not None:
+        handler(user_id)
+    if _relay is not None:
+        _relay(user_id, {"type": "invalidate", "cache": name, "timestamp": datetime.utcnow()})
+
+def apply_invalidation(user_id: str, event: Dict[str, Any]):
+    """Apply an invalidation relayed from another process"""
+    handler = _invalidation_handlers.get(event.get("cache"))
+    if handler is not None:
+        handler(user_id)
+
+def publish_event(user_id: str, event_type: str, data: Dict[str, Any], run_id: Optional[str] = None):
+    """Publish a run event (step, status or progress) to the user's live subscribers"""
+    if _relay is None and not run_events.subscriber_count(user_id):
+        return
+    event = {
+        "type": event_type,
+        "run_id": run_id,
+        "timestamp": datetime.utcnow(),
+        **data,
+    }
+    if _relay is not None:
+        _relay(user_id, event)
+    else:
+        run_events.publish(user_id, event)
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Encode an event as a Server-Sent Events message"""
+    return f"event: {event['type']}\ndata: {json.dumps(jsonable_encoder(event))}\n\n"
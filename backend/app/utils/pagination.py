@@ -0,0 +1,38 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "$date" in value:
+        return datetime.fromisoformat(value["$date"])
+    return value
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, last_id: str) -> str:
+    """Opaque keyset cursor: the sort key and the last item's (sort value, _id)"""
+    payload = {"s": sort_by, "o": sort_order, "v": _encode_value(value), "id": last_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor from encode_cursor; raises ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        return {
+            "sort_by": payload["s"],
+            "sort_order": payload["o"],
+            "value": _decode_value(payload["v"]),
+            "last_id": payload["id"],
+        }
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
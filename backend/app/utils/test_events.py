@@ -0,0 +1,56 @@
+from pathlib import Path
+import sys
+from unittest import IsolatedAsyncioTestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.utils.events import RunEventBus, format_sse, publish_event, set_event_relay
+
+
+class RunEventBusTest(IsolatedAsyncioTestCase):
+    async def test_slow_subscriber_keeps_newest_events(self):
+        bus = RunEventBus(queue_size=2)
+        queue = bus.subscribe("user-1")
+        other = bus.subscribe("user-2")
+        for idx in range(3):
+            bus.publish("user-1", {"type": "step", "step": str(idx)})
+
+        self.assertEqual([queue.get_nowait()["step"] for _ in range(2)], ["1", "2"])
+        self.assertTrue(other.empty())
+
+        bus.unsubscribe("user-1", queue)
+        self.assertEqual(bus.subscriber_count("user-1"), 0)
+
+    def test_formats_named_sse_message(self):
+        message = format_sse({"type": "status", "status": "running"})
+        self.assertEqual(message, 'event: status\ndata: {"type": "status", "status": "running"}\n\n')
+
+    def test_relay_receives_events_without_local_subscribers(self):
+        relayed = []
+        set_event_relay(lambda user_id, event: relayed.append((user_id, event)))
+        try:
+            publish_event("user-1", "status", {"status": "running"}, run_id="run-1")
+        finally:
+            set_event_relay(None)
+
+        self.assertEqual(len(relayed), 1)
+        user_id, event = relayed[0]
+        self.assertEqual((user_id, event["type"], event["run_id"], event["status"]), ("user-1", "status", "run-1", "running"))
+
+    def test_relayed_invalidation_applies_without_subscribers(self):
+        from backend.app.services.dashboard_service import dashboard_snapshots, invalidate_dashboard_stats
+        from backend.app.utils.event_relay import _republish
+
+        relayed = []
+        set_event_relay(lambda user_id, event: relayed.append((user_id, event)))
+        try:
+            invalidate_dashboard_stats("user-1")
+        finally:
+            set_event_relay(None)
+        self.assertEqual(len(relayed), 1)
+
+        # The API process holds its own snapshot; the relayed event drops it
+        dashboard_snapshots.set("user-1", {"total_jobs": 1})
+        user_id, event = relayed[0]
+        _republish({"user_id": user_id, "event": event})
+        self.assertIsNone(dashboard_snapshots.get("user-1"))
@@ -0,0 +1,23 @@
+from datetime import datetime
+from pathlib import Path
+import sys
+from unittest import TestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.utils.pagination import encode_cursor, decode_cursor
+
+
+class CursorTest(TestCase):
+    def test_round_trips_sort_value_and_id(self):
+        created_at = datetime(2025, 11, 20, 20, 0, 0, 123000)
+        cursor = encode_cursor("created_at", "desc", created_at, "job-1")
+        self.assertEqual(
+            decode_cursor(cursor),
+            {"sort_by": "created_at", "sort_order": "desc", "value": created_at, "last_id": "job-1"},
+        )
+        self.assertEqual(decode_cursor(encode_cursor("match_score", "asc", None, "job-2"))["value"], None)
+
+    def test_rejects_malformed_cursor(self):
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor")
@@ -0,0 +1,43 @@
+from pathlib import Path
+import asyncio
+import sys
+from unittest import IsolatedAsyncioTestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.utils.timeline import TimelineWriter
+
+
+class TimelineWriterTest(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.batches = []
+
+        async def sink(entries):
+            self.batches.append([entry["step"] for entry in entries])
+
+        self.writer = TimelineWriter(batch_size=3, flush_interval=60, max_buffer=5, sink=sink)
+
+    async def asyncTearDown(self):
+        await self.writer.close()
+
+    async def test_flushes_when_batch_is_full(self):
+        for step in ("a", "b", "c"):
+            self.writer.enqueue({"step": step})
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.batches, [["a", "b", "c"]])
+
+    async def test_close_drains_partial_batch(self):
+        self.writer.enqueue({"step": "a"})
+        await self.writer.close()
+        self.assertEqual(self.batches, [["a"]])
+
+    async def test_drops_oldest_when_buffer_is_full(self):
+        async def failing_sink(entries):
+            raise ConnectionError("mongo down")
+
+        self.writer.sink = failing_sink
+        self.writer.batch_size = 100
+        for idx in range(7):
+            self.writer.enqueue({"step": str(idx)})
+        self.assertEqual(self.writer.dropped, 2)
+        self.assertEqual([entry["step"] for entry in self.writer._buffer], ["2", "3", "4", "5", "6"])
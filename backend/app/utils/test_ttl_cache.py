@@ -0,0 +1,33 @@
+from pathlib import Path
+import sys
+from unittest import TestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.utils.ttl_cache import TTLCache
+
+
+class TTLCacheTest(TestCase):
+    def test_invalidate_rejects_value_computed_before_it(self):
+        cache = TTLCache(ttl_seconds=60)
+        version = cache.version("user-1")
+        cache.invalidate("user-1")
+        cache.set("user-1", {"stale": True}, version=version)
+        self.assertIsNone(cache.get("user-1"))
+
+        cache.set("user-1", {"fresh": True}, version=cache.version("user-1"))
+        self.assertEqual(cache.get("user-1"), {"fresh": True})
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(ttl_seconds=60, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+
+    def test_zero_ttl_disables_cache(self):
+        cache = TTLCache(ttl_seconds=0)
+        cache.set("a", 1)
+        self.assertIsNone(cache.get("a"))
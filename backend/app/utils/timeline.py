@@ -1,12 +1,119 @@
-from typing import Optional, Dict, Any
+import asyncio
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
 from backend.app.db.mongo import get_database
 from backend.app.db.repositories.timeline_repository import TimelineRepository
+from backend.app.utils.events import publish_event
+from backend.core.config import settings
 
-async def log_step(user_id: str, step: str, run_id: Optional[str] = None, metadata: Dict[str, Any] = None):
+async def _insert_steps(entries: List[Dict[str, Any]]):
+    db = await get_database()
+    await TimelineRepository(db).add_steps(entries)
+
+class TimelineWriter:
+    """
+    Buffers timeline entries in memory and writes them with insert_many once
+    batch_size entries are waiting or every flush_interval seconds, so agents
+    never wait on Mongo to record progress.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        max_buffer: int,
+        sink: Callable[[List[Dict[str, Any]]], Awaitable[None]] = _insert_steps,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.sink = sink
+        self.dropped = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+    def enqueue(self, entry: Dict[str, Any]):
+        """Add an entry without waiting; the background task writes it"""
+        self._ensure_running()
+        if len(self._buffer) >= self.max_buffer:
+            # Mongo is unreachable or far behind; keep the newest progress
+            self._buffer.pop(0)
+            self.dropped += 1
+        self._buffer.append(entry)
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self):
+        """Write everything buffered so far"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            while self._buffer:
+                batch, self._buffer = self._buffer[:self.batch_size], self._buffer[self.batch_size:]
+                try:
+                    await self.sink(batch)
+                except Exception as e:
+                    print(f"Failed to write {len(batch)} timeline steps: {e}")
+
+    async def close(self):
+        """Stop the background task and drain the buffer (called at shutdown)"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+timeline_writer = TimelineWriter(
+    batch_size=settings.TIMELINE_BATCH_SIZE,
+    flush_interval=settings.TIMELINE_FLUSH_INTERVAL_SECONDS,
+    max_buffer=settings.TIMELINE_MAX_BUFFER,
+)
+
+async def log_step(
+    user_id: str,
+    step: str,
+    run_id: Optional[str] = None,
+    metadata: Dict[str, Any] = None,
+    verbose: bool = False,
+):
     """
     Log a step to the timeline.
-    This helper gets the database connection and uses the TimelineRepository.
+    The step is published to live subscribers right away, then buffered and written
+    in the background by timeline_writer. Verbose steps are only persisted when
+    TIMELINE_PERSIST_VERBOSE is set.
     """
-    db = await get_database()
-    repo = TimelineRepository(db)
-    await repo.add_step(user_id, step, run_id, metadata)
+    entry = {
+        "_id": str(uuid4()),
+        "user_id": user_id,
+        "step": step,
+        "run_id": run_id,
+        "timestamp": datetime.utcnow(),
+        "metadata": metadata or {}
+    }
+    publish_event(user_id, "step", {"step": step, "metadata": entry["metadata"]}, run_id=run_id)
+    if verbose and not settings.TIMELINE_PERSIST_VERBOSE:
+        return
+    timeline_writer.enqueue(entry)
+
+async def flush_timeline():
+    """Write buffered steps now, e.g. when a run finishes"""
+    await timeline_writer.flush()
@@ -0,0 +1,60 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Small in-process LRU cache with a per-entry time to live.
+    Each key has a version that invalidate() bumps, so a value computed before an
+    invalidation can be rejected by set(..., version=...) instead of overwriting it.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._versions: Dict[Hashable, int] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def version(self, key: Hashable) -> Tuple[int, int]:
+        """Current version of key; pass it to set() when the value is computed asynchronously"""
+        return self._generation, self._versions.get(key, 0)
+
+    def set(self, key: Hashable, value: Any, version: Optional[Tuple[int, int]] = None):
+        if self.ttl_seconds <= 0 or (version is not None and version != self.version(key)):
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+        self._versions[key] = self._versions.get(key, 0) + 1
+
+    def clear(self):
+        self._entries.clear()
+        self._generation += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,69 @@
+"""
+Scan worker process. Claims scans the API queued in scan_queue and runs them,
+SCAN_WORKER_CONCURRENCY at a time. Start as many worker processes as needed.
+Each worker also runs the auto-scan scheduler; schedulers in several workers
+never queue the same slot twice.
+
+Usage:
+    python -m backend.app.worker [--concurrency N] [--no-scheduler]
+"""
+import argparse
+import asyncio
+import signal
+
+from backend.app.db.mongo import db
+from backend.app.services.scan_queue_service import ScanWorker
+from backend.app.services.scheduler_service import AutoScanScheduler
+from backend.app.utils.event_relay import ensure_event_collection, install_event_forwarder
+from backend.app.utils.timeline import timeline_writer
+from backend.app.agents.browser_pool import browser_pool
+from backend.app.agents.http_client import close_http_session
+from backend.app.agents.prompt_registry import prompt_registry
+from backend.core.config import settings
+
+
+async def run_worker(concurrency: int, scheduler_enabled: bool = True):
+    prompt_registry.load()
+    prompt_watch = asyncio.create_task(prompt_registry.watch()) if settings.PROMPT_RELOAD else None
+    db.connect()
+    database = db.get_db()
+    await ensure_event_collection(database)
+    event_forwarder = install_event_forwarder(database)
+
+    worker = ScanWorker(database, concurrency=concurrency)
+    scheduler = AutoScanScheduler(database) if scheduler_enabled else None
+
+    def stop():
+        worker.stop()
+        if scheduler is not None:
+            scheduler.stop()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop)
+
+    try:
+        if scheduler is not None:
+            await asyncio.gather(worker.run(), scheduler.run())
+        else:
+            await worker.run()
+    finally:
+        if prompt_watch is not None:
+            prompt_watch.cancel()
+        await timeline_writer.close()
+        await event_forwarder.close()
+        await browser_pool.close()
+        await close_http_session()
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued job scans")
+    parser.add_argument("--concurrency", type=int, default=settings.SCAN_WORKER_CONCURRENCY)
+    parser.add_argument("--no-scheduler", action="store_true", help="do not queue auto-scans from this worker")
+    args = parser.parse_args()
+    asyncio.run(run_worker(args.concurrency, scheduler_enabled=not args.no_scheduler))
+
+
+if __name__ == "__main__":
+    main()
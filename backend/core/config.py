@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -17,13 +17,127 @@ class Settings(BaseSettings):
     # Database
     MONGODB_URL: str = "mongodb://localhost:27017"
     DATABASE_NAME: str = "auto_job_hunter"
+    MONGO_APPLY_INDEXES_ON_STARTUP: bool = True
+    MONGO_COLLSCAN_CHECK: bool = False  # Explain each repository query shape once and log collection scans
 
     # LLM
     GROQ_API_KEY: str = ""
     OPENAI_API_KEY: str = ""
 
+    # LLM response cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_MEMORY_MAX_ENTRIES: int = 1024
+    LLM_CACHE_PERSIST: bool = True
+    LLM_CACHE_PERSISTENT_MAX_ENTRIES: int = 50000
+
+    # LLM rate limits (shared by all agents in the process)
+    LLM_RATE_LIMIT_RPM: int = 30
+    LLM_RATE_LIMIT_TPM: int = 12000
+    LLM_RATE_LIMIT_JITTER_SECONDS: float = 0.25
+    LLM_OUTPUT_TOKENS_ESTIMATE: int = 512
+
+    # Prompt templates (agents/prompts, loaded once at startup)
+    PROMPT_RELOAD: bool = False  # Development: pick up edited prompt files without a restart
+    PROMPT_RELOAD_INTERVAL_SECONDS: float = 1.0
+
+    # Normalization
+    NORMALIZER_CORPUS_LOOKUP: bool = True  # Reuse postings any user's scan already normalized (jobs_corpus)
+    NORMALIZER_FAST_PATH_ENABLED: bool = True  # Map structured source records without the LLM
+    NORMALIZER_CONCURRENCY: int = 4  # LLM normalization batches in flight per call
+    NORMALIZER_MAX_BATCH_SIZE: int = 6
+    NORMALIZER_BATCH_TOKEN_BUDGET: int = 1500  # Prompt tokens of raw job data per batch
+
+    # Matching
+    MATCHER_BATCH_SIZE: int = 5  # Jobs scored per LLM request; 1 scores each job separately
+    PREFILTER_ENABLED: bool = True
+    PREFILTER_MIN_SCORE: float = 0.1  # Jobs below this pre-score never reach the LLM
+    PREFILTER_TOP_K: int = 50  # Max jobs sent to the LLM per scan; 0 = no cap
+    PREFILTER_WINDOW_SIZE: int = 200  # Streamed jobs pre-scored together (IDF and the top-K cut span the window)
+    PREFILTER_WINDOW_LINGER_SECONDS: float = 2.0  # Max wait to fill a window once its first job arrived
+
+    # Outreach
+    OUTREACH_EAGER_TOP_N: int = 0  # Best new matches per scan that get messages right away; the rest on demand
+
+    # Scan pipeline
+    SCAN_PIPELINE_STREAMING: bool = True  # False runs the agent nodes one stage at a time
+    SCAN_PIPELINE_QUEUE_SIZE: int = 100
+    SCAN_PIPELINE_BATCH_LINGER_SECONDS: float = 0.2
+    SCAN_NORMALIZE_CONCURRENCY: int = 4
+    SCAN_MATCH_CONCURRENCY: int = 4
+    SCAN_PERSIST_BATCH_SIZE: int = 20
+    SCAN_EARLY_DEDUP_ENABLED: bool = True  # Drop jobs the user already has right after normalization
+    SCAN_DEDUP_BLOOM_ERROR_RATE: float = 0.01  # False positives only cost an exact lookup
+
+    # Incremental scans (per user, source and query high-water marks)
+    SCAN_INCREMENTAL_ENABLED: bool = True
+    SCAN_STATE_MAX_SEEN_IDS: int = 2000  # Most recent source ids remembered per search
+    SCAN_STATE_POSTED_AT_SLACK_HOURS: float = 24  # Relative dates ("2 days ago") are only accurate to about a day
+
+    # Timeline
+    TIMELINE_BATCH_SIZE: int = 50  # Buffered steps written per insert_many
+    TIMELINE_FLUSH_INTERVAL_SECONDS: float = 1.0
+    TIMELINE_MAX_BUFFER: int = 10000  # Oldest unwritten steps are dropped beyond this
+    TIMELINE_PERSIST_VERBOSE: bool = False  # Store per-source and other verbose steps
+
+    # Live run events (Server-Sent Events)
+    SSE_SUBSCRIBER_QUEUE_SIZE: int = 500
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+
+    # Scan workers (python -m backend.app.worker)
+    SCAN_WORKER_CONCURRENCY: int = 2  # Scans run at once per worker process
+    SCAN_LEASE_SECONDS: float = 120.0  # Renewed every third of this while a scan runs
+    SCAN_QUEUE_POLL_SECONDS: float = 2.0
+    SCAN_MAX_ATTEMPTS: int = 3  # Claims before a scan whose workers keep dying is failed
+    SCAN_RETRY_BACKOFF_SECONDS: float = 30.0  # Delay before retrying a scan that failed in the worker, doubled per attempt
+    SCAN_RETRY_BACKOFF_MAX_SECONDS: float = 900.0
+    RUN_EVENTS_CAPPED_BYTES: int = 16 * 1024 * 1024  # Capped collection relaying worker events to the API
+    RUN_EVENTS_FLUSH_SECONDS: float = 0.25
+
+    # Auto-scan scheduler (runs inside the scan workers)
+    AUTO_SCAN_INTERVAL_HOURS: float = 24
+    AUTO_SCAN_WINDOW_START_HOUR: int = 6  # UTC
+    AUTO_SCAN_WINDOW_HOURS: float = 6  # Users are spread evenly over this window
+    AUTO_SCAN_TICK_SECONDS: float = 30.0
+    AUTO_SCAN_MAX_PER_TICK: int = 20  # Due scans queued per tick; the rest wait for the next one
+    AUTO_SCAN_PRIORITY: int = -10  # Queue priority; manual scans use 0
+
+    # Users
+    USER_CACHE_TTL_SECONDS: int = 60  # clerk_user_id -> user lookups; 0 disables the cache
+    USER_CACHE_MAX_ENTRIES: int = 5000
+
+    # Dashboard
+    DASHBOARD_CACHE_TTL_SECONDS: int = 300  # 0 disables the per-user stats snapshot
+    DASHBOARD_CACHE_MAX_USERS: int = 1000
+
     # Job Scraping
     SERPAPI_API_KEY: str = ""
+    GOOGLE_JOBS_MAX_PAGES: int = 3  # SerpAPI pages followed via next_page_token per search
+    HTTP_MAX_CONNECTIONS: int = 100  # Shared aiohttp session for HTTP sources
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 10
+    HTTP_DNS_CACHE_SECONDS: int = 300
+    HTTP_TIMEOUT_SECONDS: float = 20.0
+    HTTP_CONDITIONAL_CACHE_MAX_URLS: int = 500  # Listing pages kept for ETag/Last-Modified revalidation
+
+    # Source result cache (raw scout results shared by all users)
+    SOURCE_CACHE_ENABLED: bool = True
+    SOURCE_CACHE_TTL_SECONDS: Dict[str, int] = {
+        "google_jobs": 6 * 3600,
+        "linkedin": 2 * 3600,
+        "indeed": 2 * 3600,
+        "yc": 12 * 3600,
+        "wellfound": 12 * 3600,
+    }
+    SOURCE_CACHE_DEFAULT_TTL_SECONDS: int = 3600
+    SOURCE_CACHE_STALE_SECONDS: int = 6 * 3600  # Past the TTL, serve results this long while refreshing in the background
+    SOURCE_CACHE_MEMORY_MAX_ENTRIES: int = 256
+    SOURCE_CACHE_PERSIST: bool = True
+
+    # Shared Playwright browser for LinkedIn/Indeed
+    BROWSER_POOL_SIZE: int = 3  # Concurrent browser contexts (and pages) across all scans
+    BROWSER_CONTEXT_MAX_PAGES: int = 50  # Recycle a context after this many pages
+    BROWSER_WARM_ON_STARTUP: bool = False  # Launch Chromium at app startup instead of on first use
+    BROWSER_USER_AGENT: str = ""
 
     # Security
     SECRET_KEY: str = "changethis"
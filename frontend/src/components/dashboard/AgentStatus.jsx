@@ -9,7 +9,7 @@ import { formatDistanceToNow } from 'date-fns'
 export default function AgentStatus() {
   const { user } = useUser()
   const { data: statusData } = useAgentStatus()
-  const { data: nextScanData } = useNextScan()
+  const { data: nextScanData } = useNextScan(user?.id)
   const { data: lastScanData } = useLastScan()
   const { mutate: toggleAutoScan } = useToggleAutoScan()
   const { mutate: startRun, isPending: isStarting } = useStartRun()
@@ -20,8 +20,7 @@ export default function AgentStatus() {
   const lastScan = lastScanData?.last_scan
   const jobsScanned = lastScanData?.jobs_scanned || 0
   
-  // TODO: Get actual auto-scan status from user profile
-  const autoScanEnabled = true 
+  const autoScanEnabled = nextScanData?.auto_scan_enabled ?? false
 
   const handleToggleAutoScan = () => {
     if (user?.id) {
@@ -63,7 +62,7 @@ export default function AgentStatus() {
           </div>
           <p className="text-gray-500 mt-1 flex items-center gap-2">
             <Clock className="w-4 h-4" />
-            Next scan: {nextScan ? new Date(nextScan).toLocaleString() : 'Tomorrow at 6:00 AM'}
+            Next scan: {nextScan ? new Date(nextScan).toLocaleString() : 'Auto-scan off'}
           </p>
         </div>
 
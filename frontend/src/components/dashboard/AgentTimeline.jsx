@@ -1,11 +1,12 @@
-import { useAgentTimeline, useAgentStatus } from '../../services/runService'
+import { useAgentTimeline, useAgentStatus, useRunEvents } from '../../services/runService'
 import { useUser } from '@clerk/clerk-react'
 import { formatDistanceToNow } from 'date-fns'
 
 export default function AgentTimeline() {
   const { user } = useUser()
-  const { data: timeline } = useAgentTimeline(user?.id)
-  const { data: statusData } = useAgentStatus()
+  const live = useRunEvents(user?.id)
+  const { data: timeline } = useAgentTimeline(user?.id, { live })
+  const { data: statusData } = useAgentStatus({ live })
   const isRunning = statusData?.status === 'running'
 
   if (!isRunning && (!timeline || timeline.length === 0)) {
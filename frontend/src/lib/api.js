@@ -71,6 +71,7 @@ export const jobsApi = {
       ...(filters.min_match_score && { min_match_score: filters.min_match_score }),
       ...(filters.sort_by && { sort_by: filters.sort_by }),
       ...(filters.sort_order && { sort_order: filters.sort_order }),
+      ...(filters.cursor && { cursor: filters.cursor }),
     }
     const response = await api.get('/api/jobs', { params })
     return response.data
@@ -81,9 +82,10 @@ export const jobsApi = {
     return response.data
   },
   
-  generateOutreach: async (jobId, clerkUserId) => {
+  // Returns the stored draft if there is one, unless regenerate is true
+  generateOutreach: async (jobId, clerkUserId, regenerate = false) => {
     const response = await api.post(`/api/jobs/${jobId}/outreach`, null, {
-      params: { clerk_user_id: clerkUserId }
+      params: { clerk_user_id: clerkUserId, regenerate }
     })
     return response.data
   },
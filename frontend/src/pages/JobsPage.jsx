@@ -40,6 +40,9 @@ export default function JobsPage() {
   const [selectedJob, setSelectedJob] = useState(null)
   const [showFilters, setShowFilters] = useState(false)
   const [activeId, setActiveId] = useState(null)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [totalJobs, setTotalJobs] = useState(0)
+  const [loadingMore, setLoadingMore] = useState(false)
   
   const [filters, setFilters] = useState({
     scan_run_id: 'all',
@@ -69,23 +72,25 @@ export default function JobsPage() {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [user, filters])
 
+  const buildFilterParams = () => ({
+    limit: 200,
+    ...(filters.scan_run_id !== 'all' && { scan_run_id: filters.scan_run_id }),
+    ...(filters.date_from && { date_from: filters.date_from }),
+    ...(filters.date_to && { date_to: filters.date_to }),
+    ...(filters.source !== 'all' && { source: filters.source }),
+    ...(filters.min_match_score && { min_match_score: parseFloat(filters.min_match_score) }),
+    sort_by: filters.sort_by,
+    sort_order: filters.sort_order,
+  })
+
   const loadJobs = async () => {
     if (!user?.id) return
     setLoading(true)
     try {
-      const filterParams = {
-        limit: 200,
-        ...(filters.scan_run_id !== 'all' && { scan_run_id: filters.scan_run_id }),
-        ...(filters.date_from && { date_from: filters.date_from }),
-        ...(filters.date_to && { date_to: filters.date_to }),
-        ...(filters.source !== 'all' && { source: filters.source }),
-        ...(filters.min_match_score && { min_match_score: parseFloat(filters.min_match_score) }),
-        sort_by: filters.sort_by,
-        sort_order: filters.sort_order,
-      }
-      
-      const data = await jobsApi.listJobs(user.id, filterParams)
+      const data = await jobsApi.listJobs(user.id, buildFilterParams())
       setJobs(data.jobs || [])
+      setNextCursor(data.next_cursor || null)
+      setTotalJobs(data.total || 0)
     } catch (error) {
       console.error('Error loading jobs:', error)
     } finally {
@@ -93,11 +98,27 @@ export default function JobsPage() {
     }
   }
 
-  const handleGenerateOutreach = async (job) => {
+  const loadMoreJobs = async () => {
+    if (!user?.id || !nextCursor) return
+    setLoadingMore(true)
+    try {
+      // The cursor is only valid with the same filters and sort it was issued for
+      const data = await jobsApi.listJobs(user.id, { ...buildFilterParams(), cursor: nextCursor })
+      setJobs([...jobs, ...(data.jobs || [])])
+      setNextCursor(data.next_cursor || null)
+      setTotalJobs(data.total || 0)
+    } catch (error) {
+      console.error('Error loading more jobs:', error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
+  const handleGenerateOutreach = async (job, regenerate = false) => {
     if (!user?.id) return
     setGeneratingOutreach(job._id)
     try {
-      const result = await jobsApi.generateOutreach(job._id, user.id)
+      const result = await jobsApi.generateOutreach(job._id, user.id, regenerate)
       setJobs(prev => prev.map(j => 
         j._id === job._id ? { ...j, status: 'draft', outreach: result } : j
       ))
@@ -238,18 +259,30 @@ export default function JobsPage() {
         <div>
           <h1 className="text-3xl font-bold text-gray-900">Job Pipeline</h1>
           <p className="text-gray-600 mt-1">
-            {jobs.length} jobs in your pipeline
+            {nextCursor ? `${jobs.length} of ${totalJobs}` : jobs.length} jobs in your pipeline
           </p>
         </div>
-        <button
-          onClick={() => setShowFilters(!showFilters)}
-          className={`flex items-center gap-2 px-4 py-2 rounded-lg font-medium transition-colors ${
-            showFilters ? 'bg-blue-600 text-white' : 'bg-gray-100 text-gray-700 hover:bg-gray-200'
-          }`}
-        >
-          <Filter className="w-4 h-4" />
-          Filters
-        </button>
+        <div className="flex items-center gap-2">
+          {nextCursor && (
+            <button
+              onClick={loadMoreJobs}
+              disabled={loadingMore}
+              className="flex items-center gap-2 px-4 py-2 rounded-lg font-medium bg-gray-100 text-gray-700 hover:bg-gray-200 disabled:opacity-50 transition-colors"
+            >
+              {loadingMore ? <Loader2 className="w-4 h-4 animate-spin" /> : <ChevronDown className="w-4 h-4" />}
+              Load more
+            </button>
+          )}
+          <button
+            onClick={() => setShowFilters(!showFilters)}
+            className={`flex items-center gap-2 px-4 py-2 rounded-lg font-medium transition-colors ${
+              showFilters ? 'bg-blue-600 text-white' : 'bg-gray-100 text-gray-700 hover:bg-gray-200'
+            }`}
+          >
+            <Filter className="w-4 h-4" />
+            Filters
+          </button>
+        </div>
       </div>
 
       {/* Filters Panel */}
@@ -373,7 +406,7 @@ export default function JobsPage() {
         <JobDetailModal 
           job={selectedJob} 
           onClose={() => setSelectedJob(null)}
-          onGenerateOutreach={() => handleGenerateOutreach(selectedJob)}
+          onGenerateOutreach={(regenerate) => handleGenerateOutreach(selectedJob, regenerate)}
           onMove={handleMoveJob}
         />
       )}
@@ -619,11 +652,11 @@ function JobDetailModal({ job, onClose, onGenerateOutreach, onMove }) {
               </button>
 
               <button 
-                onClick={onGenerateOutreach}
+                onClick={() => onGenerateOutreach(Boolean(job.outreach?.email_subject))}
                 className="w-full py-3 px-4 bg-purple-600 text-white rounded-xl font-semibold hover:bg-purple-700 transition-colors flex items-center justify-center gap-2 shadow-sm"
               >
                 <Mail className="w-5 h-5" />
-                Generate Outreach
+                {job.outreach?.email_subject ? 'Regenerate Outreach' : 'Generate Outreach'}
               </button>
 
               <button 
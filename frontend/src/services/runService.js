@@ -1,32 +1,36 @@
+import { useEffect, useState } from 'react'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { api } from '../lib/api'
 
 export const runKeys = {
   all: ['runs'],
   status: () => [...runKeys.all, 'status'],
-  nextScan: () => [...runKeys.all, 'next-scan'],
+  nextScan: (clerkUserId) => [...runKeys.all, 'next-scan', clerkUserId],
   lastScan: () => [...runKeys.all, 'last-scan'],
   timeline: (clerkUserId) => [...runKeys.all, 'timeline', clerkUserId],
 }
 
-export const useAgentStatus = () => {
+export const useAgentStatus = ({ live = false } = {}) => {
   return useQuery({
     queryKey: runKeys.status(),
     queryFn: async () => {
       const { data } = await api.get('/api/runs/status')
       return data
     },
-    refetchInterval: 5000, // Poll every 5 seconds
+    refetchInterval: live ? false : 5000, // Poll every 5 seconds unless events are streamed
   })
 }
 
-export const useNextScan = () => {
+export const useNextScan = (clerkUserId) => {
   return useQuery({
-    queryKey: runKeys.nextScan(),
+    queryKey: runKeys.nextScan(clerkUserId),
     queryFn: async () => {
-      const { data } = await api.get('/api/runs/next-scan')
+      const { data } = await api.get('/api/runs/next-scan', {
+        params: { clerk_user_id: clerkUserId }
+      })
       return data
     },
+    enabled: !!clerkUserId,
   })
 }
 
@@ -40,7 +44,7 @@ export const useLastScan = () => {
   })
 }
 
-export const useAgentTimeline = (clerkUserId) => {
+export const useAgentTimeline = (clerkUserId, { live = false } = {}) => {
   return useQuery({
     queryKey: runKeys.timeline(clerkUserId),
     queryFn: async () => {
@@ -50,10 +54,49 @@ export const useAgentTimeline = (clerkUserId) => {
       return data
     },
     enabled: !!clerkUserId,
-    refetchInterval: 2000, // Poll every 2 seconds for live updates
+    refetchInterval: live ? false : 2000, // Poll every 2 seconds unless events are streamed
   })
 }
 
+// Subscribe to live run events (Server-Sent Events) and apply them to the cached
+// timeline and status. Returns true while the stream is connected.
+export const useRunEvents = (clerkUserId) => {
+  const queryClient = useQueryClient()
+  const [connected, setConnected] = useState(false)
+
+  useEffect(() => {
+    if (!clerkUserId || typeof EventSource === 'undefined') return undefined
+
+    const url = `${api.defaults.baseURL}/api/runs/stream?clerk_user_id=${encodeURIComponent(clerkUserId)}`
+    const source = new EventSource(url)
+
+    source.onopen = () => setConnected(true)
+    source.onerror = () => setConnected(false)
+
+    source.addEventListener('step', (event) => {
+      const { step, timestamp, metadata } = JSON.parse(event.data)
+      queryClient.setQueryData(runKeys.timeline(clerkUserId), (timeline = []) =>
+        [{ step, timestamp, metadata }, ...timeline].slice(0, 50)
+      )
+    })
+
+    source.addEventListener('status', (event) => {
+      const { status } = JSON.parse(event.data)
+      queryClient.setQueryData(runKeys.status(), { status: status === 'running' ? 'running' : 'idle' })
+      if (status !== 'running') {
+        queryClient.invalidateQueries(runKeys.lastScan())
+      }
+    })
+
+    return () => {
+      source.close()
+      setConnected(false)
+    }
+  }, [clerkUserId, queryClient])
+
+  return connected
+}
+
 export const useToggleAutoScan = () => {
   const queryClient = useQueryClient()
   
@@ -65,8 +108,9 @@ export const useToggleAutoScan = () => {
       })
       return data
     },
-    onSuccess: () => {
+    onSuccess: (_, { clerkUserId }) => {
       queryClient.invalidateQueries(runKeys.status())
+      queryClient.invalidateQueries(runKeys.nextScan(clerkUserId))
     },
   })
 }